@@ -0,0 +1,165 @@
+from PySide6.QtWidgets import QFrame, QVBoxLayout, QPlainTextEdit
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QTextCursor
+from collections import deque
+from pathlib import Path
+import logging
+import logging.handlers
+
+# Số dòng giữ trong bộ nhớ (dùng khi sao chép log)
+DEFAULT_MAX_LINES = 20_000
+# Số dòng hiển thị trên widget: QPlainTextEdit tự bỏ dòng cũ khi vượt quá
+DEFAULT_MAX_VISIBLE_LINES = 2_000
+# Gom các dòng log đến trong khoảng này rồi mới vẽ 1 lần
+FLUSH_INTERVAL_MS = 100
+# File log xoay vòng: mỗi file tối đa 2MB, giữ 3 file cũ
+LOG_FILE_MAX_BYTES = 2 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 3
+
+
+class LogView(QFrame):
+    """
+    Khung hiển thị log dạng append-only:
+    - Ring buffer trong bộ nhớ giới hạn max_lines dòng (dùng để sao chép, nên chỉ
+      sao chép được max_lines dòng gần nhất)
+    - Dòng mới được gom lại và vẽ theo timer, không vẽ lại mỗi lần append
+    - QPlainTextEdit với maximumBlockCount nên số dòng trên UI luôn có giới hạn
+    - Tuỳ chọn ghi toàn bộ log ra file xoay vòng (log_file_path), mỗi dòng 1 record
+      có timestamp riêng
+    """
+
+    def __init__(
+        self,
+        placeholder_text: str = "",
+        fixed_height: int = 120,
+        max_lines: int = DEFAULT_MAX_LINES,
+        max_visible_lines: int = DEFAULT_MAX_VISIBLE_LINES,
+        log_file_path: Path | None = None,
+        parent=None,
+    ):
+        super().__init__(parent)
+
+        root = QVBoxLayout(self)
+        self.setObjectName("LogViewRoot")
+        root.setContentsMargins(0, 0, 0, 0)
+        root.setSpacing(0)
+
+        self._text_edit = QPlainTextEdit()
+        self._text_edit.setObjectName("LogViewText")
+        self._text_edit.setReadOnly(True)
+        self._text_edit.setUndoRedoEnabled(False)
+        self._text_edit.setMaximumBlockCount(max_visible_lines)
+        self._text_edit.setPlaceholderText(placeholder_text)
+        root.addWidget(self._text_edit)
+
+        self.setFixedHeight(fixed_height)
+
+        self._lines: deque[str] = deque(maxlen=max_lines)
+        self._pending: list[str] = []
+        # Số dòng cũ đã bị đẩy ra khỏi ring buffer (không sao chép được nữa)
+        self._dropped_count = 0
+        self._log_file_path = log_file_path
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush)
+
+        self._file_logger: logging.Logger | None = None
+        if log_file_path is not None:
+            self._file_logger = self._create_file_logger(log_file_path)
+
+    def _create_file_logger(self, log_file_path: Path) -> logging.Logger | None:
+        try:
+            log_file_path.parent.mkdir(parents=True, exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                log_file_path,
+                maxBytes=LOG_FILE_MAX_BYTES,
+                backupCount=LOG_FILE_BACKUP_COUNT,
+                encoding="utf-8",
+                delay=True,  # Chỉ tạo file khi có log đầu tiên
+            )
+        except OSError as e:
+            print(f">>> Error opening log file '{log_file_path}': {e}")
+            return None
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger = logging.getLogger(f"synrive.log_view.{id(self)}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(handler)
+        self.destroyed.connect(lambda: self._close_file_logger(logger))
+        return logger
+
+    @staticmethod
+    def _close_file_logger(logger: logging.Logger) -> None:
+        for handler in list(logger.handlers):
+            handler.close()
+            logger.removeHandler(handler)
+
+    def append_line(self, text: str) -> None:
+        """Thêm 1 dòng log (có thể gọi dồn dập, UI chỉ cập nhật theo timer)."""
+        self._pending.append(text)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        overflow = len(self._lines) + len(pending) - self._lines.maxlen
+        if overflow > 0:
+            self._dropped_count += overflow
+        self._lines.extend(pending)
+        if self._file_logger is not None:
+            # Mỗi dòng 1 record để dòng nào trong file cũng có timestamp
+            for text in pending:
+                for line in text.split("\n"):
+                    self._file_logger.info(line)
+
+        # Chỉ tự cuộn xuống cuối nếu người dùng đang xem cuối log
+        scroll_bar = self._text_edit.verticalScrollBar()
+        is_at_bottom = scroll_bar.value() >= scroll_bar.maximum() - 2
+        # Chỉ cần vẽ phần cuối: phần đầu sẽ bị maximumBlockCount bỏ đi ngay
+        visible = pending[-self._text_edit.maximumBlockCount() :]
+        cursor = QTextCursor(self._text_edit.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if not self._text_edit.document().isEmpty():
+            cursor.insertBlock()
+        cursor.insertText("\n".join(visible))
+        if is_at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
+
+    @property
+    def max_lines(self) -> int:
+        """Số dòng gần nhất mà get_text() trả về được."""
+        return self._lines.maxlen
+
+    def get_text(self) -> str:
+        """
+        max_lines dòng log gần nhất (kể cả các dòng chưa kịp vẽ). Nếu đã có dòng cũ
+        bị bỏ thì dòng đầu tiên ghi rõ số dòng bị thiếu và file chứa log đầy đủ.
+        """
+        self._flush()
+        if not self._dropped_count:
+            return "\n".join(self._lines)
+        notice = f"... ({self._dropped_count} dòng log cũ hơn không được sao chép"
+        if self._file_logger is not None:
+            notice += f", xem đầy đủ trong {self._log_file_path}"
+        return "\n".join([notice + ")", *self._lines])
+
+    def clear_text(self) -> None:
+        self._flush_timer.stop()
+        self._pending.clear()
+        self._lines.clear()
+        self._dropped_count = 0
+        self._text_edit.clear()
+
+    def set_font_size(self, size: int) -> None:
+        font = self._text_edit.font()
+        font.setPointSize(size)
+        self._text_edit.setFont(font)
+
+    def set_contents_margins(
+        self, left: int, top: int, right: int, bottom: int
+    ) -> None:
+        self._text_edit.setViewportMargins(left, top, right, bottom)
@@ -20,6 +20,8 @@ class FileInfoBox(QFrame):
         parent=None,
     ):
         super().__init__(parent)
+        self._svg_fill_color = svg_fill_color
+        self._svg_stroke_color = svg_stroke_color
 
         self.setObjectName("FileInfoBox")
         self.setSizePolicy(QSizePolicy.Policy.Maximum, QSizePolicy.Policy.Fixed)
@@ -29,22 +31,18 @@ class FileInfoBox(QFrame):
         layout.setContentsMargins(12, 4, 12, 6)
         layout.setSpacing(8)
 
-        icon = QLabel()
-        icon.setPixmap(
-            get_svg_as_icon(
-                svg_name, 18, fill_color=svg_fill_color, stroke_color=svg_stroke_color
-            )
-        )
-        icon.setFixedSize(18, 18)
+        self._icon = QLabel()
+        self._icon.setFixedSize(18, 18)
 
-        label = QLabel(text)
-        label.setObjectName("FileInfoLabel")
-        font = label.font()
+        self._label = QLabel()
+        self._label.setObjectName("FileInfoLabel")
+        font = self._label.font()
         font.setPointSize(12)
-        label.setFont(font)
+        self._label.setFont(font)
+        self.set_content(text, svg_name)
 
-        layout.addWidget(icon)
-        layout.addWidget(label)
+        layout.addWidget(self._icon)
+        layout.addWidget(self._label)
 
         self.setStyleSheet(
             """
@@ -62,6 +60,19 @@ class FileInfoBox(QFrame):
             """
         )
 
+    def set_content(self, text: str, svg_name: str):
+        """Đổi text + icon (dùng lại box cho path khác thay vì tạo box mới)."""
+        self._icon.setPixmap(
+            get_svg_as_icon(
+                svg_name,
+                18,
+                fill_color=self._svg_fill_color,
+                stroke_color=self._svg_stroke_color,
+                device_pixel_ratio=self.devicePixelRatioF(),
+            )
+        )
+        self._label.setText(text)
+
     # --- CÁC HÀM XỬ LÝ SỰ KIỆN (OVERRIDES) ---
     def mousePressEvent(self, event):
         """Chạy khi Widget bị click"""
@@ -0,0 +1,308 @@
+from PySide6.QtWidgets import QFrame, QVBoxLayout, QHBoxLayout, QScrollArea, QLabel
+from PySide6.QtCore import Qt, Signal, QTimer, QEvent, QRect
+from PySide6.QtGui import QFontMetrics
+from ..configs.configs import PathType
+from ..utils.helpers import extract_filename_with_ext
+from .selected_file_box import FileInfoBox
+from .label import CustomLabel
+from .overlay import OverlayPosition, PositionedOverlay
+from .tooltip import CollisionConstraint, ToolTipBinder, ToolTipConfig
+
+# Lề trên vùng box + khoảng cách ngang/dọc giữa các box
+BOXES_TOP_MARGIN = 4
+BOX_SPACING = 8
+# Số dòng box được dựng thêm phía trên/dưới vùng nhìn thấy (cuộn không bị trống)
+OVERSCAN_ROWS = 2
+# Từ số mục này trở lên thì hiện dòng tóm tắt số lượng
+LARGE_SELECTION_THRESHOLD = 20
+
+
+def _format_count(count: int) -> str:
+    """Số có dấu chấm phân cách hàng nghìn: 12345 -> '12.345'."""
+    return f"{count:,}".replace(",", ".")
+
+
+class SelectedItemsPreview(QFrame):
+    """
+    Preview các tệp/thư mục đã chọn dạng các box xếp theo dòng (flow).
+    - Loại của từng path (file/folder) được phân loại ở worker rồi đưa vào qua
+      append_path_infos(), theo đúng thứ tự đã chọn
+    - Các dòng được tính từ độ rộng chữ (không cần widget); chỉ các dòng đang nhìn
+      thấy mới có box: 1 pool FileInfoBox (kèm ToolTipBinder) được gán lại nội dung
+      khi cuộn -> chọn hàng nghìn file vẫn chỉ có vài chục widget
+    - Chọn nhiều thì hiện dòng tóm tắt: tổng số mục, số tệp, số thư mục
+    """
+
+    # Signal phát khi click vào 1 box: path tương ứng
+    path_clicked = Signal(str)
+
+    def __init__(self, title: str, parent=None):
+        super().__init__(parent)
+        self._total_count: int = 0
+        # [(path, PathType, content_type), ...] đã phân loại xong
+        self._path_infos: list[tuple[str, PathType, str]] = []
+        self._files_count: int = 0
+        self._folders_count: int = 0
+
+        # Độ rộng box của từng path + index box đầu mỗi dòng (box cao bằng nhau).
+        # Các dòng được xếp cho chiều rộng _rows_width, tới box _laid_out_count
+        self._box_widths: list[int] = []
+        self._row_starts: list[int] = []
+        self._row_x: int = 0
+        self._rows_width: int = -1
+        self._laid_out_count: int = 0
+        # Phần khung của box (icon, lề, viền) + font chữ, đo từ 1 box thật
+        self._box_chrome_width: int = 0
+        self._box_height: int = 0
+        self._font_metrics: QFontMetrics | None = None
+
+        # Pool box dùng lại + index path đang gán cho từng box (-1 = chưa gán)
+        self._boxes: list[FileInfoBox] = []
+        self._box_binders: list[ToolTipBinder] = []
+        self._box_indices: list[int] = []
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+
+        header_layout = QHBoxLayout()
+        header_layout.setContentsMargins(6, 0, 6, 0)
+        title_label = CustomLabel(title, is_bold=True)
+        self._summary_label = CustomLabel(font_size=11)
+        self._summary_label.setStyleSheet("color: #aaa;")
+        self._summary_label.hide()
+        header_layout.addWidget(title_label)
+        header_layout.addStretch()
+        header_layout.addWidget(self._summary_label)
+
+        self._inner_frame = QFrame()
+        self._inner_frame.installEventFilter(self)
+
+        empty_label = CustomLabel(
+            "Chưa có tệp hoặc thư mục nào được chọn.", font_size=12
+        )
+        self._empty_overlay = PositionedOverlay(
+            container=self._inner_frame,
+            overlay=empty_label,
+            position=OverlayPosition.TOP_LEFT,
+            margin=0,
+        )
+
+        self._scroll = QScrollArea()
+        self._scroll.setWidgetResizable(True)
+        self._scroll.setFrameShape(QScrollArea.Shape.NoFrame)
+        self._scroll.setHorizontalScrollBarPolicy(
+            Qt.ScrollBarPolicy.ScrollBarAlwaysOff
+        )
+        self._scroll.setMinimumHeight(100)
+        self._scroll.setMaximumHeight(160)
+        self._scroll.setWidget(self._inner_frame)
+        self._scroll.verticalScrollBar().valueChanged.connect(
+            self._update_visible_boxes
+        )
+
+        # Gom nhiều lô kết quả đến liên tiếp -> chỉ xếp dòng + gán box 1 lần
+        self._layout_timer = QTimer(self)
+        self._layout_timer.setSingleShot(True)
+        self._layout_timer.setInterval(0)
+        self._layout_timer.timeout.connect(self._relayout)
+
+        layout.addLayout(header_layout)
+        layout.addWidget(self._scroll)
+
+    def reset(self, total_count: int) -> None:
+        """Xoá các box cũ, chuẩn bị nhận total_count path mới."""
+        self._layout_timer.stop()
+        self._total_count = total_count
+        self._path_infos = []
+        self._files_count = 0
+        self._folders_count = 0
+        self._box_widths = []
+        self._row_starts = []
+        self._row_x = 0
+        self._laid_out_count = 0
+        self._scroll.verticalScrollBar().setValue(0)
+        self._inner_frame.setMinimumHeight(0)
+        self._update_visible_boxes()
+        if total_count > 0:
+            self._empty_overlay.hide()
+        else:
+            self._empty_overlay.show()
+        self._update_summary()
+
+    def append_path_infos(self, infos: list[tuple[str, PathType, str]]) -> None:
+        """Thêm 1 lô path đã phân loại (theo thứ tự đã chọn)."""
+        self._ensure_box_metrics()
+        for path, path_type, _ in infos:
+            if path_type == PathType.FILE:
+                self._files_count += 1
+            elif path_type == PathType.FOLDER:
+                self._folders_count += 1
+            text_width = self._text_width(extract_filename_with_ext(path))
+            self._box_widths.append(self._box_chrome_width + text_width)
+        self._path_infos.extend(infos)
+        self._update_summary()
+        if not self._layout_timer.isActive():
+            self._layout_timer.start()
+
+    def eventFilter(self, watched, event):
+        if watched is self._inner_frame and event.type() == QEvent.Type.Resize:
+            # Đổi chiều rộng -> xếp lại dòng; đổi chiều cao -> vùng nhìn thấy đổi
+            self._relayout()
+        return super().eventFilter(watched, event)
+
+    def _text_width(self, text: str) -> int:
+        # Cùng cách QLabel tính sizeHint cho text 1 dòng
+        return self._font_metrics.boundingRect(
+            QRect(0, 0, 100000, 1000),
+            Qt.AlignmentFlag.AlignLeft | Qt.TextFlag.TextExpandTabs,
+            text,
+        ).width()
+
+    def _ensure_box_metrics(self) -> None:
+        """Đo phần khung (icon, lề, viền) + chiều cao từ 1 box thật của pool."""
+        if self._font_metrics is not None:
+            return
+        box = self._acquire_box(0)
+        box.ensurePolished()
+        box.set_content("x", "file_icon")
+        label = box.findChild(QLabel, "FileInfoLabel")
+        self._font_metrics = QFontMetrics(label.font())
+        size_hint = box.sizeHint()
+        self._box_chrome_width = size_hint.width() - self._text_width("x")
+        self._box_height = size_hint.height()
+
+    def _relayout(self) -> None:
+        """Xếp dòng cho các box chưa xếp rồi cập nhật chiều cao + box nhìn thấy."""
+        width = self._inner_frame.width()
+        if width != self._rows_width:
+            # Đổi chiều rộng -> xếp lại toàn bộ (chỉ là phép cộng, không có widget)
+            self._rows_width = width
+            self._row_starts = []
+            self._row_x = 0
+            self._laid_out_count = 0
+
+        row_starts = self._row_starts
+        x = self._row_x
+        for index in range(self._laid_out_count, len(self._box_widths)):
+            box_width = self._box_widths[index]
+            # Tràn ra ngoài biên phải -> xuống dòng (giống CustomFlowLayout)
+            if not row_starts or (x + box_width > width - 1 and x > 0):
+                row_starts.append(index)
+                x = 0
+            x += box_width + BOX_SPACING
+        self._row_x = x
+        self._laid_out_count = len(self._box_widths)
+
+        rows_count = len(self._row_starts)
+        content_height = 0
+        if rows_count:
+            row_height = self._box_height + BOX_SPACING
+            content_height = BOXES_TOP_MARGIN + rows_count * row_height - BOX_SPACING
+        if self._inner_frame.minimumHeight() != content_height:
+            self._inner_frame.setMinimumHeight(content_height)
+        self._update_visible_boxes()
+
+    def _update_visible_boxes(self, *_) -> None:
+        """Gán các box trong pool cho các dòng đang nhìn thấy, ẩn box còn thừa."""
+        used = 0
+        row_starts = self._row_starts
+        if row_starts:
+            row_height = self._box_height + BOX_SPACING
+            top = self._scroll.verticalScrollBar().value() - BOXES_TOP_MARGIN
+            bottom = top + self._scroll.viewport().height()
+            first_row = max(0, top // row_height - OVERSCAN_ROWS)
+            last_row = min(len(row_starts) - 1, bottom // row_height + OVERSCAN_ROWS)
+
+            for row in range(first_row, last_row + 1):
+                start = row_starts[row]
+                end = (
+                    row_starts[row + 1]
+                    if row + 1 < len(row_starts)
+                    else self._laid_out_count
+                )
+                x = 0
+                y = BOXES_TOP_MARGIN + row * row_height
+                for index in range(start, end):
+                    box_width = self._box_widths[index]
+                    self._bind_box(
+                        used, index, QRect(x, y, box_width, self._box_height)
+                    )
+                    x += box_width + BOX_SPACING
+                    used += 1
+
+        for slot in range(used, len(self._boxes)):
+            if self._box_indices[slot] != -1:
+                self._box_binders[slot].hide_tooltip()
+                self._box_indices[slot] = -1
+            self._boxes[slot].hide()
+
+    def _acquire_box(self, slot: int) -> FileInfoBox:
+        """Box thứ slot trong pool (tạo thêm nếu pool chưa đủ)."""
+        while len(self._boxes) <= slot:
+            new_slot = len(self._boxes)
+            box = FileInfoBox(
+                text="",
+                svg_name="file_icon",
+                svg_fill_color=None,
+                svg_stroke_color="#ffffff",
+                parent=self._inner_frame,
+            )
+            box.hide()
+            box.on_clicked(lambda s=new_slot: self._on_box_clicked(s))
+            binder = ToolTipBinder(
+                box,
+                ToolTipConfig(
+                    text="",
+                    show_delay_ms=100,
+                    constrain_to=CollisionConstraint.WINDOW,
+                ),
+            )
+            self._boxes.append(box)
+            self._box_binders.append(binder)
+            self._box_indices.append(-1)
+        return self._boxes[slot]
+
+    def _bind_box(self, slot: int, index: int, rect: QRect) -> None:
+        box = self._acquire_box(slot)
+        if self._box_indices[slot] != index:
+            path, path_type, content_type = self._path_infos[index]
+            binder = self._box_binders[slot]
+            binder.hide_tooltip()
+            box.set_content(extract_filename_with_ext(path), f"{content_type}_icon")
+            type_label = "Thư mục" if path_type == PathType.FOLDER else "Tệp"
+            binder.config = ToolTipConfig(
+                text=f"<b>{type_label}</b>: {path}",
+                show_delay_ms=100,
+                constrain_to=CollisionConstraint.WINDOW,
+            )
+            self._box_indices[slot] = index
+        if box.geometry() != rect:
+            box.setGeometry(rect)
+        if box.isHidden():
+            box.show()
+
+    def _on_box_clicked(self, slot: int) -> None:
+        index = self._box_indices[slot]
+        if 0 <= index < len(self._path_infos):
+            self.path_clicked.emit(self._path_infos[index][0])
+
+    def _update_summary(self) -> None:
+        if self._total_count < LARGE_SELECTION_THRESHOLD:
+            self._summary_label.hide()
+            return
+        total = _format_count(self._total_count)
+        detected_count = len(self._path_infos)
+        if detected_count < self._total_count:
+            checked = _format_count(detected_count)
+            summary = f"{total} mục · đang kiểm tra {checked}/{total}..."
+        else:
+            summary = (
+                f"{total} mục: {_format_count(self._files_count)} tệp, "
+                f"{_format_count(self._folders_count)} thư mục"
+            )
+            missing_count = detected_count - self._files_count - self._folders_count
+            if missing_count:
+                summary += f", {_format_count(missing_count)} không tồn tại"
+        self._summary_label.setText(summary)
+        self._summary_label.show()
@@ -75,6 +75,21 @@ class CustomToolTip(QFrame):
         bubble_layout.addWidget(self.label)
         root.addWidget(self.bubble)
 
+        self._style_key: tuple | None = None
+        self._apply_style(config)
+
+    def apply_config(self, config: ToolTipConfig) -> None:
+        """Dùng lại tooltip cho binder khác: đổi nội dung, chỉ set lại style khi cần."""
+        self.config = config
+        self.label.setText(config.text)
+        self.label.setMaximumWidth(config.max_width)
+        self._apply_style(config)
+
+    def _apply_style(self, config: ToolTipConfig) -> None:
+        style_key = (config.font_size, config.background_color, config.text_color)
+        if style_key == self._style_key:
+            return
+        self._style_key = style_key
         # Style apply lên bubble + label
         self.setStyleSheet(
             f"""
@@ -90,86 +105,112 @@ class CustomToolTip(QFrame):
             """
         )
 
-        # Shadow apply lên bubble (ổn hơn apply lên root translucent)
-        shadow = QGraphicsDropShadowEffect(self.bubble)
-        shadow.setBlurRadius(18)
-        shadow.setColor(QColor(0, 0, 0, 70))
-        shadow.setOffset(0, 4)
-        self.bubble.setGraphicsEffect(shadow)
-
-
-# --- 4. The Logic Binder ---
-class ToolTipBinder(QObject):
-    def __init__(self, widget: QWidget, config: ToolTipConfig):
-        super().__init__(widget)
-        self.widget = widget
-        self.config = config
-        self.tooltip_window: CustomToolTip | None = None
+    def showEvent(self, event):
+        # Shadow chỉ tạo khi tooltip hiện lần đầu (vẽ shadow offscreen khá tốn)
+        if self.bubble.graphicsEffect() is None:
+            # Shadow apply lên bubble (ổn hơn apply lên root translucent)
+            shadow = QGraphicsDropShadowEffect(self.bubble)
+            shadow.setBlurRadius(18)
+            shadow.setColor(QColor(0, 0, 0, 70))
+            shadow.setOffset(0, 4)
+            self.bubble.setGraphicsEffect(shadow)
+        super().showEvent(event)
+
+
+# --- 4. Shared Tooltip Pool (1 tooltip / window) ---
+class _ToolTipPool(QObject):
+    """
+    Tooltip dùng chung cho mọi binder trong cùng 1 window: 1 timer delay + 1
+    CustomToolTip được tạo lần đầu cần hiện rồi dùng lại. Binder "mượn" tooltip khi
+    chuột vào widget và trả lại khi chuột ra, nên số binder không ảnh hưởng bộ nhớ.
+    """
+
+    OBJECT_NAME = "SharedToolTipPool"
+
+    def __init__(self, window: QWidget):
+        super().__init__(window)
+        self.setObjectName(self.OBJECT_NAME)
+        self._window = window
+        self._tooltip_window: CustomToolTip | None = None
+        # Binder đang mượn tooltip (đang chờ delay hoặc đang hiện)
+        self._owner: ToolTipBinder | None = None
 
         # Timer cho delay hiển thị
-        self.timer = QTimer(self)
-        self.timer.setSingleShot(True)
-        self.timer.timeout.connect(self.show_tooltip)
-
-        # Cài đặt Event Filter
-        self.widget.installEventFilter(self)
-
-    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
-        if watched == self.widget:
-            if event.type() == QEvent.Type.Enter:
-                self.timer.start(self.config.show_delay_ms)
-
-            elif event.type() == QEvent.Type.Leave:
-                self.timer.stop()
-                self.hide_tooltip()
-
-            elif event.type() == QEvent.Type.MouseButtonPress:
-                self.timer.stop()
-                self.hide_tooltip()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.show_now)
+
+    @classmethod
+    def for_widget(cls, widget: QWidget) -> "_ToolTipPool":
+        window = widget.window()
+        pool = window.findChild(
+            _ToolTipPool, cls.OBJECT_NAME, Qt.FindChildOption.FindDirectChildrenOnly
+        )
+        return pool if pool is not None else cls(window)
 
-            elif event.type() == QEvent.Type.MouseMove:
-                if (
-                    self.config.follow_mouse
-                    and self.tooltip_window
-                    and self.tooltip_window.isVisible()
-                ):
-                    self.update_position(QCursor.pos())
+    def is_owned_by(self, binder: "ToolTipBinder") -> bool:
+        return self._owner is binder
 
-        return super().eventFilter(watched, event)
+    def request(self, binder: "ToolTipBinder") -> None:
+        """Binder muốn hiện tooltip: chờ show_delay_ms rồi hiện."""
+        self.release(self._owner)
+        self._owner = binder
+        binder.widget.destroyed.connect(self._on_owner_destroyed)
+        self._timer.start(binder.config.show_delay_ms)
 
-    def show_tooltip(self):
-        if not self.tooltip_window:
-            self.tooltip_window = CustomToolTip(self.config)
-
-        # Cập nhật nội dung (nếu config thay đổi động)
-        self.tooltip_window.label.setText(self.config.text)
-        self.tooltip_window.adjustSize()
+    def release(self, binder: "ToolTipBinder | None") -> None:
+        """Binder trả lại tooltip (chuột ra / click)."""
+        if binder is None or binder is not self._owner:
+            return
+        self._owner = None
+        self._timer.stop()
+        try:
+            binder.widget.destroyed.disconnect(self._on_owner_destroyed)
+        except (RuntimeError, TypeError):
+            pass  # Widget đã bị huỷ
+        if self._tooltip_window:
+            self._tooltip_window.hide()
+
+    def _on_owner_destroyed(self, *_):
+        # Widget bị xoá khi đang hover (VD: danh sách được dựng lại)
+        self._owner = None
+        self._timer.stop()
+        if self._tooltip_window:
+            self._tooltip_window.hide()
+
+    def show_now(self):
+        """Hiện tooltip cho binder đang mượn (bỏ qua delay)."""
+        binder = self._owner
+        if binder is None:
+            return
+        config = binder.config
+        if not self._tooltip_window:
+            # Không đặt parent: tránh kế thừa stylesheet của window
+            self._tooltip_window = CustomToolTip(config)
+            self.destroyed.connect(self._tooltip_window.deleteLater)
+        else:
+            # Cập nhật nội dung (nếu config thay đổi động / binder khác)
+            self._tooltip_window.apply_config(config)
+        self._tooltip_window.adjustSize()
 
         self.update_position(QCursor.pos())
-        self.tooltip_window.show()
-
-    def hide_tooltip(self):
-        if self.tooltip_window:
-            self.tooltip_window.hide()
-            self.tooltip_window.deleteLater()
-            self.tooltip_window = None
+        self._tooltip_window.show()
 
     def update_position(self, cursor_pos: QPoint):
-        if not self.tooltip_window:
+        if not self._tooltip_window or not self._owner:
             return
 
         # Khoảng cách từ chuột đến tooltip
         offset_y = 20
         pos = cursor_pos + QPoint(0, offset_y)
 
-        tip_w = self.tooltip_window.width()
-        tip_h = self.tooltip_window.height()
+        tip_w = self._tooltip_window.width()
+        tip_h = self._tooltip_window.height()
 
         # Xác định vùng giới hạn (Screen hoặc Window cha)
         boundary: QRect
-        if self.config.constrain_to == CollisionConstraint.WINDOW:
-            window = self.widget.window()
-            boundary = window.geometry()
+        if self._owner.config.constrain_to == CollisionConstraint.WINDOW:
+            boundary = self._window.geometry()
         else:
             # Mặc định lấy màn hình chứa con chuột
             screen = QApplication.screenAt(cursor_pos)
@@ -195,4 +236,48 @@ class ToolTipBinder(QObject):
         if pos.y() < boundary.top():
             pos.setY(boundary.top())
 
-        self.tooltip_window.move(pos)
+        self._tooltip_window.move(pos)
+
+
+# --- 5. The Logic Binder ---
+class ToolTipBinder(QObject):
+    """
+    Gắn tooltip cho 1 widget. Binder chỉ là event filter nhẹ, tooltip thật (và timer
+    delay) nằm trong pool dùng chung của window chứa widget.
+    """
+
+    def __init__(self, widget: QWidget, config: ToolTipConfig):
+        super().__init__(widget)
+        self.widget = widget
+        self.config = config
+
+        # Cài đặt Event Filter
+        self.widget.installEventFilter(self)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if watched == self.widget:
+            if event.type() == QEvent.Type.Enter:
+                # Lấy pool lúc hover: widget có thể được gắn vào window sau khi bind
+                _ToolTipPool.for_widget(self.widget).request(self)
+
+            elif event.type() in (
+                QEvent.Type.Leave,
+                QEvent.Type.MouseButtonPress,
+            ):
+                self.hide_tooltip()
+
+            elif event.type() == QEvent.Type.MouseMove:
+                if self.config.follow_mouse:
+                    pool = _ToolTipPool.for_widget(self.widget)
+                    if pool.is_owned_by(self):
+                        pool.update_position(QCursor.pos())
+
+        return super().eventFilter(watched, event)
+
+    def show_tooltip(self):
+        pool = _ToolTipPool.for_widget(self.widget)
+        pool.request(self)
+        pool.show_now()
+
+    def hide_tooltip(self):
+        _ToolTipPool.for_widget(self.widget).release(self)
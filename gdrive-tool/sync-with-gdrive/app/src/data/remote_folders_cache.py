@@ -0,0 +1,268 @@
+import heapq
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from ..utils.helpers import app_data_dir, normalize_search_text
+
+# Số kết quả tìm kiếm tối đa trả về cho UI
+SEARCH_RESULTS_LIMIT = 100
+# Tỉ lệ trigram tối thiểu phải khớp để coi là kết quả "gần đúng" (fuzzy)
+FUZZY_MIN_GRAM_RATIO = 0.6
+
+
+def create_folders_cache_dir() -> Path:
+    return app_data_dir() / "cache" / "folders"
+
+
+def join_remote_path(parent_path: str, name: str) -> str:
+    return f"{parent_path}/{name}" if parent_path else name
+
+
+class RemoteFoldersCache:
+    """
+    Cache danh sách thư mục con đã tải từ rclone cho 1 remote, kèm dung lượng
+    (bytes, số file) của các thư mục đã tính.
+    Lưu ở %AppData%/SynRive/cache/folders/<remote>.json dạng:
+        {"remote": "...", "saved_at": "...", "listings": {"": [...], "A/B": [...]},
+         "sizes": {"A/B": [bytes, count]}}
+    """
+
+    def __init__(self, remote_name: str):
+        self._remote_name = remote_name
+        safe_name = re.sub(r"[^\w\-. ]", "_", remote_name)
+        self._cache_path: Path = create_folders_cache_dir() / f"{safe_name}.json"
+        self._listings: dict[str, list[str]] = {}
+        self._sizes: dict[str, tuple[int, int]] = {}
+        self._is_dirty: bool = False
+        # Đã gộp dữ liệu trên disk chưa (nếu chưa, save() phải gộp trước khi ghi đè)
+        self._has_disk_listings: bool = False
+
+    @property
+    def remote_name(self) -> str:
+        return self._remote_name
+
+    def load_from_disk(self) -> dict[str, dict]:
+        """
+        Đọc dữ liệu đã lưu (không đổi state -> gọi được từ worker thread).
+        Trả về {"listings": {...}, "sizes": {...}}.
+        """
+        empty = {"listings": {}, "sizes": {}}
+        try:
+            if not self._cache_path.exists():
+                return empty
+            with open(self._cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            listings = data.get("listings")
+            if data.get("remote") != self._remote_name or not isinstance(
+                listings, dict
+            ):
+                return empty
+            sizes = data.get("sizes")
+            if not isinstance(sizes, dict):
+                sizes = {}
+            return {"listings": listings, "sizes": sizes}
+        except Exception as e:
+            print(f">>> Error loading folders cache '{self._cache_path}': {e}")
+            return empty
+
+    def merge_disk_data(self, disk_data: dict[str, dict]) -> None:
+        """Gộp dữ liệu đọc từ disk, ưu tiên dữ liệu vừa tải trong phiên hiện tại."""
+        for path, names in disk_data["listings"].items():
+            self._listings.setdefault(path, names)
+        for path, size in disk_data["sizes"].items():
+            if isinstance(size, list) and len(size) == 2:
+                self._sizes.setdefault(path, (int(size[0]), int(size[1])))
+        self._has_disk_listings = True
+
+    def get_listing(self, path: str) -> list[str] | None:
+        return self._listings.get(path)
+
+    def put_listing(self, path: str, names: list[str]) -> None:
+        self._listings[path] = list(names)
+        self._is_dirty = True
+
+    def get_size(self, path: str) -> tuple[int, int] | None:
+        return self._sizes.get(path)
+
+    def put_size(self, path: str, size: tuple[int, int]) -> None:
+        self._sizes[path] = size
+        self._is_dirty = True
+
+    def known_child_sizes(
+        self, parent_path: str, names: list[str]
+    ) -> dict[str, tuple[int, int]]:
+        """Dung lượng đã biết của các folder con (tên -> (bytes, count))."""
+        sizes = self._sizes
+        result = {}
+        for name in names:
+            size = sizes.get(join_remote_path(parent_path, name))
+            if size is not None:
+                result[name] = size
+        return result
+
+    def clear(self) -> None:
+        self._listings.clear()
+        self._sizes.clear()
+        self._is_dirty = True
+        self._has_disk_listings = True  # Bỏ hẳn dữ liệu cũ trên disk
+
+    def save(self) -> None:
+        """Ghi cache ra disk nếu có thay đổi."""
+        if not self._is_dirty:
+            return
+        if not self._has_disk_listings:
+            # Dialog đóng khi chỉ mục chưa dựng xong -> không làm mất cache cũ
+            self.merge_disk_data(self.load_from_disk())
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._cache_path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "remote": self._remote_name,
+                        "saved_at": datetime.now().isoformat(timespec="seconds"),
+                        "listings": self._listings,
+                        "sizes": self._sizes,
+                    },
+                    f,
+                    ensure_ascii=False,
+                )
+            tmp_path.replace(self._cache_path)
+            self._is_dirty = False
+        except Exception as e:
+            print(f">>> Error saving folders cache '{self._cache_path}': {e}")
+
+
+class FolderSearchIndex:
+    """
+    Chỉ mục tìm kiếm trong bộ nhớ trên toàn bộ thư mục đã cache của 1 remote.
+
+    - Mỗi folder có 1 id; trigram của tên folder (đã bỏ dấu) -> danh sách id.
+    - Tìm chính xác: trigram chỉ đánh trên tên folder nên từ khoá tra trigram lấy
+      từ đoạn cuối của query (sau dấu "/" cuối cùng); với mỗi từ khoá, giao các
+      danh sách trigram rồi kiểm tra mọi từ khoá có nằm trong full path không.
+      VD: "du an/src" -> tra "src" trong tên, "du an" trong path.
+    - Tìm gần đúng (khi chưa đủ kết quả): đếm số trigram khớp với đoạn cuối,
+      lấy các folder khớp >= FUZZY_MIN_GRAM_RATIO.
+    """
+
+    def __init__(self):
+        self._paths: list[str] = []
+        self._norm_names: list[str] = []
+        self._norm_paths: list[str] = []
+        self._grams: dict[str, list[int]] = {}
+        self._known_paths: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    @staticmethod
+    def _trigrams(text: str) -> set[str]:
+        return {text[i : i + 3] for i in range(len(text) - 2)}
+
+    def add_listing(self, parent_path: str, names: list[str]) -> None:
+        """Thêm các folder con của parent_path vào chỉ mục (bỏ qua folder đã có)."""
+        grams = self._grams
+        known_paths = self._known_paths
+        norm_parent = normalize_search_text(parent_path)
+
+        for name in names:
+            full_path = join_remote_path(parent_path, name)
+            if full_path in known_paths:
+                continue
+            known_paths.add(full_path)
+
+            folder_id = len(self._paths)
+            norm_name = normalize_search_text(name)
+            self._paths.append(full_path)
+            self._norm_names.append(norm_name)
+            self._norm_paths.append(join_remote_path(norm_parent, norm_name))
+
+            for gram in self._trigrams(norm_name):
+                ids = grams.get(gram)
+                if ids is None:
+                    grams[gram] = [folder_id]
+                else:
+                    ids.append(folder_id)
+
+    def search(self, query: str, limit: int = SEARCH_RESULTS_LIMIT) -> list[str]:
+        """Trả về danh sách full path khớp với query, tốt nhất đứng trước."""
+        norm_query = normalize_search_text(query).strip()
+        tokens = norm_query.replace("/", " ").split()
+        if not tokens:
+            return []
+
+        # Đoạn cuối của query là phần phải nằm trong tên folder
+        # (VD: "folder 1/ab" -> "ab"; "du an/" -> "du an")
+        leaf = next(s.strip() for s in reversed(norm_query.split("/")) if s.strip())
+        # Từ khoá tra trigram: các từ >= 3 ký tự của đoạn cuối, hoặc cả đoạn nếu
+        # các từ đều ngắn (VD: "du an 12" -> tra cả cụm trong tên folder)
+        keys = [t for t in leaf.split() if len(t) >= 3] or [leaf]
+
+        candidates: set[int] = set()
+        for key in keys:
+            candidates.update(self._name_candidates(key))
+
+        norm_paths = self._norm_paths
+        matched = [i for i in candidates if all(t in norm_paths[i] for t in tokens)]
+        # Chỉ cần limit kết quả tốt nhất -> không sort toàn bộ
+        results = heapq.nsmallest(limit, matched, key=lambda i: self._rank(i, leaf))
+
+        if len(results) < limit and len(leaf) >= 3:
+            seen = set(results)
+            for folder_id in self._fuzzy_candidates(leaf):
+                if folder_id not in seen:
+                    results.append(folder_id)
+                    if len(results) >= limit:
+                        break
+
+        return [self._paths[i] for i in results]
+
+    def _name_candidates(self, key: str) -> list[int]:
+        """Id các folder có tên chứa key."""
+        norm_names = self._norm_names
+        if len(key) < 3:
+            # Quá ngắn để dùng trigram -> quét tên folder (vẫn chỉ vài ms)
+            return [i for i, name in enumerate(norm_names) if key in name]
+        candidates = self._intersect_grams(self._trigrams(key))
+        return [i for i in candidates if key in norm_names[i]]
+
+    def _rank(self, folder_id: int, leaf: str) -> tuple[int, int]:
+        name = self._norm_names[folder_id]
+        if name == leaf:
+            score = 0
+        elif name.startswith(leaf):
+            score = 1
+        elif leaf in name:
+            score = 2
+        else:
+            score = 3
+        return score, len(self._norm_paths[folder_id])
+
+    def _intersect_grams(self, query_grams: set[str]) -> set[int]:
+        postings = [self._grams.get(g) for g in query_grams]
+        if not postings or any(p is None for p in postings):
+            return set()
+        postings.sort(key=len)  # Giao từ danh sách ngắn nhất cho nhanh
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result.intersection_update(ids)
+            if not result:
+                break
+        return result
+
+    def _fuzzy_candidates(self, norm_query: str) -> list[int]:
+        query_grams = self._trigrams(norm_query)
+        if not query_grams:
+            return []
+        min_hits = max(1, int(len(query_grams) * FUZZY_MIN_GRAM_RATIO + 0.5))
+
+        hits: dict[int, int] = {}
+        for gram in query_grams:
+            for folder_id in self._grams.get(gram, ()):
+                hits[folder_id] = hits.get(folder_id, 0) + 1
+
+        matched = [i for i, count in hits.items() if count >= min_hits]
+        matched.sort(key=lambda i: (-hits[i], len(self._norm_paths[i])))
+        return matched
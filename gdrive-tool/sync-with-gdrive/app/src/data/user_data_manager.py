@@ -1,7 +1,11 @@
-from typing import TypedDict
+from typing import Any, TypedDict
+import atexit
+import copy
 import json
+import os
+import threading
+import time
 from pathlib import Path
-from ..utils.helpers import get_json_field_value, set_json_field_value
 from ..utils.helpers import app_data_dir
 
 
@@ -9,6 +13,12 @@ def create_data_config_path() -> Path:
     return app_data_dir() / "data" / "sync-with-gdrive.json"
 
 
+# Gom các lần ghi liên tiếp: chỉ ghi file sau khi không có thay đổi mới trong khoảng này
+WRITE_DELAY_SECONDS = 0.3
+# Khoảng tối thiểu giữa 2 lần stat file để phát hiện file bị sửa từ bên ngoài
+EXTERNAL_CHECK_INTERVAL_SECONDS = 1.0
+
+
 class UserDataConfigSchema(TypedDict):
     remotes: list[str]
     active_remote: str | None
@@ -16,9 +26,170 @@ class UserDataConfigSchema(TypedDict):
     last_gdrive_entered_dir: str | None
 
 
+def _default_config() -> UserDataConfigSchema:
+    return UserDataConfigSchema(
+        remotes=[],
+        active_remote=None,
+        last_sync=None,
+        last_gdrive_entered_dir=None,
+    )
+
+
+class _UserDataStore:
+    """
+    Bản sao trong bộ nhớ của sync-with-gdrive.json, dùng chung cho cả process.
+    - Parse file 1 lần, các lần đọc sau lấy từ bộ nhớ
+    - Ghi được gom lại (write-behind) rồi ghi nguyên tử: file tạm + rename
+    - File bị sửa từ bên ngoài (VD: user mở file từ màn hình Cài đặt) được phát hiện
+      qua mtime và đọc lại; các field đang chờ ghi vẫn được giữ
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._lock = threading.RLock()
+        self._data: dict = {}
+        self._is_loaded: bool = False
+        # mtime của file ở lần đọc/ghi gần nhất (None nếu file chưa tồn tại)
+        self._mtime_ns: int | None = None
+        self._last_check: float = 0.0
+        # Field đã đổi trong bộ nhớ nhưng chưa ghi ra file
+        self._dirty_fields: dict[str, Any] = {}
+        self._write_timer: threading.Timer | None = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _stat_mtime_ns(self) -> int | None:
+        try:
+            return os.stat(self._path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _reload(self, mtime_ns: int | None) -> None:
+        """Đọc lại file. File lỗi cú pháp -> giữ dữ liệu cũ trong bộ nhớ."""
+        self._mtime_ns = mtime_ns
+        self._is_loaded = True
+        if mtime_ns is None:
+            self._data = {}
+        else:
+            try:
+                with open(self._path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if not isinstance(data, dict):
+                    raise ValueError("Config không phải JSON object")
+                self._data = data
+            except Exception as e:
+                print(f">>> Error reading user data config '{self._path}': {e}")
+                return
+        # Field chưa kịp ghi vẫn ưu tiên hơn dữ liệu trên disk
+        self._data.update(copy.deepcopy(self._dirty_fields))
+
+    def _refresh_if_changed(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if (
+            self._is_loaded
+            and not force
+            and now - self._last_check < EXTERNAL_CHECK_INTERVAL_SECONDS
+        ):
+            return
+        self._last_check = now
+        mtime_ns = self._stat_mtime_ns()
+        if not self._is_loaded or mtime_ns != self._mtime_ns:
+            self._reload(mtime_ns)
+
+    def exists(self) -> bool:
+        with self._lock:
+            self._refresh_if_changed()
+            return self._mtime_ns is not None or bool(self._dirty_fields)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._refresh_if_changed()
+            return copy.deepcopy(self._data)
+
+    def get(self, field_path: str) -> Any:
+        """Lấy field (phân cách bởi dấu chấm), None nếu không có."""
+        with self._lock:
+            self._refresh_if_changed()
+            value: Any = self._data
+            for key in field_path.split("."):
+                if isinstance(value, dict) and key in value:
+                    value = value[key]
+                else:
+                    return None
+            # Trả về bản sao: người gọi sửa list/dict không làm hỏng dữ liệu chung
+            return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Đổi field cấp 1 trong bộ nhớ, file được ghi sau WRITE_DELAY_SECONDS."""
+        with self._lock:
+            self._refresh_if_changed()
+            value = copy.deepcopy(value)
+            self._data[key] = value
+            self._dirty_fields[key] = value
+            self._schedule_write()
+
+    def write_initial(self, data: dict) -> None:
+        """Tạo file với dữ liệu mặc định (ghi ngay)."""
+        with self._lock:
+            self._data = copy.deepcopy(data)
+            self._data.update(copy.deepcopy(self._dirty_fields))
+            self._is_loaded = True
+            self._write_now(indent=2)
+
+    def _schedule_write(self) -> None:
+        if self._write_timer is not None:
+            self._write_timer.cancel()
+        self._write_timer = threading.Timer(WRITE_DELAY_SECONDS, self.flush)
+        self._write_timer.daemon = True
+        self._write_timer.start()
+
+    def flush(self) -> None:
+        """Ghi các thay đổi đang chờ ra file (gọi thêm khi thoát app)."""
+        with self._lock:
+            if self._write_timer is not None:
+                self._write_timer.cancel()
+                self._write_timer = None
+            if not self._dirty_fields:
+                return
+            # File vừa bị sửa từ bên ngoài -> gộp trước, không ghi đè mất thay đổi đó
+            self._refresh_if_changed(force=True)
+            self._write_now(indent=4)
+
+    def _write_now(self, indent: int) -> None:
+        tmp_path = self._path.with_suffix(".json.tmp")
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, indent=indent, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            tmp_path.replace(self._path)
+        except Exception as e:
+            print(f">>> Error saving user data config '{self._path}': {e}")
+            return
+        self._dirty_fields.clear()
+        self._mtime_ns = self._stat_mtime_ns()
+
+
+_store: _UserDataStore | None = None
+_store_lock = threading.Lock()
+
+
+def _user_data_store() -> _UserDataStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = _UserDataStore(create_data_config_path())
+            atexit.register(_store.flush)
+        return _store
+
+
 class UserDataManager:
     def __init__(self):
-        self._data_config_path: Path = create_data_config_path()
+        self._store = _user_data_store()
+        self._data_config_path: Path = self._store.path
         self._is_data_inited: bool = False
 
     @staticmethod
@@ -26,67 +197,41 @@ class UserDataManager:
         """Trả về đường dẫn file cấu hình sync-with-gdrive.json."""
         return str(create_data_config_path())
 
+    @staticmethod
+    def flush() -> None:
+        """Ghi ngay các thay đổi đang chờ ra file."""
+        _user_data_store().flush()
+
     def check_if_data_inited(self) -> bool:
         """
         Kiểm tra xem dữ liệu đã được khởi tạo chưa.
         """
-        file_exists = self._data_config_path.exists()
-        if file_exists:
+        if self._store.exists():
             self._is_data_inited = True
         return self._is_data_inited
 
     def init_data_config_file(self) -> None:
         """Khởi tạo file cấu hình sync-with-gdrive.json nếu chưa tồn tại."""
-        path = self._data_config_path
-
-        # 1. Đảm bảo thư mục cha tồn tại
-        path.parent.mkdir(parents=True, exist_ok=True)
+        # Nếu file chưa tồn tại thì tạo mới với dữ liệu mặc định
+        if not self._data_config_path.exists():
+            self._store.write_initial(dict(_default_config()))
 
-        # 2. Nếu file chưa tồn tại thì tạo mới với dữ liệu mặc định
-        if not path.exists():
-            initial_data: UserDataConfigSchema = {
-                "remotes": [],
-                "active_remote": None,
-                "last_sync": None,
-                "last_gdrive_entered_dir": None,
-            }
-
-            with path.open("w", encoding="utf-8") as f:
-                json.dump(initial_data, f, indent=2, ensure_ascii=False)
-
-        # 3. Đánh dấu đã init
+        # Đánh dấu đã init
         self._is_data_inited = True
 
     def get_entire_config(self) -> UserDataConfigSchema:
         """Lấy toàn bộ nội dung file cấu hình sync-with-gdrive.json dưới dạng dict."""
-        try:
-            if not self._data_config_path.exists():
-                return UserDataConfigSchema(
-                    remotes=[],
-                    active_remote=None,
-                    last_sync=None,
-                    last_gdrive_entered_dir=None,
-                )
-            with open(self._data_config_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data
-        except Exception:
-            return UserDataConfigSchema(
-                remotes=[],
-                active_remote=None,
-                last_sync=None,
-                last_gdrive_entered_dir=None,
-            )
+        if not self._store.exists():
+            return _default_config()
+        return self._store.snapshot()  # type: ignore[return-value]
 
     def get_last_gdrive_entered_dir(self) -> str | None:
         """Trả về gdrive root dir đã lưu (nếu có)."""
-        return get_json_field_value(
-            "last_gdrive_entered_dir", self._data_config_path, True
-        )
+        return self._store.get("last_gdrive_entered_dir")
 
     def get_remotes_list(self) -> list[str]:
         """Trả về danh sách remotes đã cấu hình trong rclone."""
-        remotes = get_json_field_value("remotes", self._data_config_path, True)
+        remotes = self._store.get("remotes")
         if isinstance(remotes, list):
             return remotes
         return []
@@ -98,21 +243,19 @@ class UserDataManager:
 
     def get_active_remote(self) -> str | None:
         """Trả về remote đang được sử dụng (nếu có)."""
-        return get_json_field_value("active_remote", self._data_config_path, True)
+        return self._store.get("active_remote")
 
     def save_active_remote(self, remote_name: str) -> None:
         """Lưu remote đang được sử dụng."""
-        set_json_field_value("active_remote", remote_name, self._data_config_path, True)
+        self._store.set("active_remote", remote_name)
 
     def add_new_remote(self, remote_name: str) -> None:
         """Thêm remote mới vào danh sách remotes đã cấu hình."""
         remotes = self.get_remotes_list()
         if remote_name not in remotes:
             remotes.append(remote_name)
-            set_json_field_value("remotes", remotes, self._data_config_path, True)
+            self._store.set("remotes", remotes)
 
     def save_last_gdrive_entered_dir(self, gdrive_dir: str) -> None:
         """Lưu gdrive root dir đã nhập gần nhất."""
-        set_json_field_value(
-            "last_gdrive_entered_dir", gdrive_dir, self._data_config_path, True
-        )
+        self._store.set("last_gdrive_entered_dir", gdrive_dir)
@@ -1,64 +1,429 @@
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
-    QTreeWidget,
-    QTreeWidgetItem,
+    QTreeView,
     QHBoxLayout,
+    QLineEdit,
+    QListView,
     QStyledItemDelegate,
+    QStyleOptionViewItem,
     QStyle,
     QStackedLayout,
     QFrame,
     QSizePolicy,
+    QHeaderView,
 )
-from PySide6.QtCore import Qt, QSize, Signal, QRect
-from PySide6.QtGui import QPainter, QCloseEvent
+from PySide6.QtCore import (
+    Qt,
+    QSize,
+    Signal,
+    QRect,
+    QAbstractItemModel,
+    QModelIndex,
+    QStringListModel,
+    QTimer,
+    QElapsedTimer,
+)
+from PySide6.QtGui import QPainter, QCloseEvent, QIcon, QColor
 from .components.label import CustomLabel
 from .components.announcement import CustomAnnounce
 from .mixins.keyboard_shortcuts import KeyboardShortcutsDialogMixin
 from .data.user_data_manager import UserDataManager
-from .utils.helpers import get_svg_as_icon
-from .workers.fetch_folders_worker import FetchFoldersWorker
+from .utils.helpers import get_svg_as_icon, format_bytes
+from .workers.fetch_folders_worker import FetchFoldersWorker, FetchFolderSizeWorker
 from .components.loading import LoadingDots
 from .configs.configs import ThemeColors
 from .components.button import CustomButton
+from .data.remote_folders_cache import RemoteFoldersCache, FolderSearchIndex
+from .workers.folders_search_index_worker import BuildFoldersSearchIndexWorker
+from .workers.cancellable_worker import orphaned_workers_info, release_worker
+from typing import Callable
+
+# Số dòng tối đa được đưa vào view cho mỗi lần fetchMore.
+# Thư mục có hàng chục nghìn con sẽ được "lộ" dần khi user cuộn xuống.
+FETCH_BATCH_SIZE = 500
+# Độ rộng cột dung lượng (bytes + số file)
+SIZE_COLUMN_WIDTH = 150
+
+
+class FolderNode:
+    """
+    Node gọn nhẹ của cây thư mục (dùng __slots__ để tiết kiệm bộ nhớ).
+    Không tạo widget/item Qt nào cho từng folder.
+    """
+
+    __slots__ = (
+        "name",
+        "full_path",
+        "parent",
+        "row",
+        "children",
+        "pending_names",
+        "is_loaded",
+        "is_loading",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        full_path: str,
+        parent: "FolderNode | None" = None,
+        row: int = 0,
+    ):
+        self.name = name
+        self.full_path = full_path
+        self.parent = parent
+        self.row = row
+        self.children: list[FolderNode] = []
+        # Tên các folder con đã nhận từ rclone nhưng chưa đưa vào view
+        self.pending_names: list[str] = []
+        self.is_loaded = False
+        self.is_loading = False
+
+
+class FolderTreeModel(QAbstractItemModel):
+    """
+    Model cây thư mục Google Drive với Lazy Loading qua canFetchMore/fetchMore.
+
+    - Node chưa load: hasChildren() = True để view hiện mũi tên expand (thay cho dummy item).
+    - Khi expand, view gọi fetchMore() -> model phát fetch_requested để dialog chạy worker.
+    - Khi có dữ liệu, set_children() chỉ đưa vào view từng batch FETCH_BATCH_SIZE dòng,
+      phần còn lại được đưa vào khi view gọi fetchMore() lúc cuộn tới cuối.
+    - Cột SIZE_COLUMN hiện dung lượng + số file đã tính (tra qua size lookup của cache).
+    """
+
+    NAME_COLUMN = 0
+    SIZE_COLUMN = 1
+
+    # Role lưu full path của folder
+    FULL_PATH_ROLE = Qt.ItemDataRole.UserRole + 2
+    # Role lưu (bytes, count) của folder, None nếu chưa tính
+    FOLDER_SIZE_ROLE = Qt.ItemDataRole.UserRole + 3
+
+    # Phát ra khi view cần load con của 1 node (index của node đó)
+    fetch_requested = Signal(QModelIndex)
+
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+        self._root = FolderNode("", "")
+        self._folder_icon = QIcon(
+            get_svg_as_icon("folder_icon", 64, stroke_color="#FFD700", stroke_width=3)
+        )
+        self._size_lookup: Callable[[str], tuple[int, int] | None] = lambda _: None
+        # Các folder đang được tính dung lượng
+        self._sizing_paths: set[str] = set()
+
+    # --- HELPERS ---
+    def node_from_index(self, index: QModelIndex) -> FolderNode:
+        if index.isValid():
+            return index.internalPointer()
+        return self._root
+
+    def index_from_node(self, node: FolderNode, column: int = 0) -> QModelIndex:
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, column, node)
+
+    def _is_alive(self, node: FolderNode) -> bool:
+        """Node còn thuộc cây hiện tại không (cây có thể đã bị reset khi refresh)."""
+        while node.parent is not None:
+            node = node.parent
+        return node is self._root
+
+    # --- QAbstractItemModel API ---
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()):
+        if not 0 <= column <= self.SIZE_COLUMN:
+            return QModelIndex()
+        parent_node = self.node_from_index(parent)
+        if 0 <= row < len(parent_node.children):
+            return self.createIndex(row, column, parent_node.children[row])
+        return QModelIndex()
+
+    def parent(self, index: QModelIndex = QModelIndex()):  # type: ignore[override]
+        if not index.isValid():
+            return QModelIndex()
+        node: FolderNode = index.internalPointer()
+        parent_node = node.parent
+        if parent_node is None or parent_node is self._root:
+            return QModelIndex()
+        return self.createIndex(parent_node.row, 0, parent_node)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        return len(self.node_from_index(parent).children)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 2
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        if parent.column() > 0:
+            return False
+        node = self.node_from_index(parent)
+        if node is self._root:
+            return len(node.children) > 0
+        if not node.is_loaded:
+            return True  # Chưa biết -> vẫn hiện mũi tên để user expand
+        return len(node.children) > 0 or len(node.pending_names) > 0
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node: FolderNode = index.internalPointer()
+        if index.column() == self.SIZE_COLUMN:
+            return self._size_data(node, role)
+        if role == Qt.ItemDataRole.DisplayRole:
+            return node.name
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._folder_icon
+        if role == self.FULL_PATH_ROLE:
+            return node.full_path
+        return None
+
+    def _size_data(self, node: FolderNode, role: int):
+        if role == Qt.ItemDataRole.DisplayRole:
+            size = self._size_lookup(node.full_path)
+            if size is not None:
+                return f"{format_bytes(size[0])} · {size[1]:,} file"
+            if node.full_path in self._sizing_paths:
+                return "Đang tính..."
+            return ""
+        if role == self.FOLDER_SIZE_ROLE:
+            return self._size_lookup(node.full_path)
+        if role == self.FULL_PATH_ROLE:
+            return node.full_path
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        if parent.column() > 0:
+            return False
+        node = self.node_from_index(parent)
+        if node.pending_names:
+            return True
+        # Root được dialog load chủ động, không request qua fetchMore
+        if node is self._root:
+            return False
+        return not node.is_loaded and not node.is_loading
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        node = self.node_from_index(parent)
+        if node.pending_names:
+            self._insert_next_batch(node)
+            return
+        if node is self._root or node.is_loaded or node.is_loading:
+            return
+        node.is_loading = True
+        self.fetch_requested.emit(parent)
+
+    # --- PUBLIC API ---
+    def reset_root(self) -> None:
+        """Xoá toàn bộ cây, chuẩn bị load lại danh sách gốc."""
+        self.beginResetModel()
+        self._root = FolderNode("", "")
+        self._root.is_loading = True
+        self._sizing_paths.clear()
+        self.endResetModel()
+
+    def root_node(self) -> FolderNode:
+        return self._root
+
+    def set_children(self, node: FolderNode, folder_names: list[str]) -> None:
+        """Gán danh sách folder con (tên) cho node sau khi worker trả về."""
+        if not self._is_alive(node):
+            return  # Kết quả của cây cũ (đã refresh) -> bỏ qua
+
+        node.is_loading = False
+        if node.is_loaded:
+            # Node đã được điền từ cache (khi nhảy tới kết quả tìm kiếm)
+            # -> chỉ bổ sung các folder mới
+            existing = {child.name for child in node.children}
+            existing.update(node.pending_names)
+            node.pending_names.extend(n for n in folder_names if n not in existing)
+            if node.pending_names:
+                self._insert_next_batch(node)
+            return
+
+        node.is_loaded = True
+        node.pending_names = list(folder_names)
+
+        if not node.pending_names:
+            # Không có con -> báo view cập nhật để ẩn mũi tên expand
+            if node is not self._root:
+                index = self.index_from_node(node)
+                self.dataChanged.emit(index, index)
+            return
+
+        self._insert_next_batch(node)
+
+    def set_size_lookup(
+        self, size_lookup: Callable[[str], tuple[int, int] | None]
+    ) -> None:
+        """Nguồn dung lượng đã tính (full path -> (bytes, count)), thường là cache."""
+        self._size_lookup = size_lookup
+
+    def set_size_computing(self, full_path: str, is_computing: bool) -> None:
+        if is_computing:
+            self._sizing_paths.add(full_path)
+        else:
+            self._sizing_paths.discard(full_path)
+        self.notify_size_changed(full_path)
+
+    def notify_size_changed(self, full_path: str) -> None:
+        """Báo view vẽ lại ô dung lượng của folder (nếu folder đang có trong model)."""
+        node = self._root
+        for name in full_path.split("/"):
+            node = next((c for c in node.children if c.name == name), None)
+            if node is None:
+                return
+        index = self.index_from_node(node, self.SIZE_COLUMN)
+        self.dataChanged.emit(index, index)
+
+    def mark_failed(self, node: FolderNode) -> None:
+        """Load thất bại -> cho phép expand lại để thử lại."""
+        if not self._is_alive(node):
+            return
+        node.is_loading = False
+        node.is_loaded = False
+
+    def reveal_path(
+        self, full_path: str, get_cached_listing: Callable[[str], list[str] | None]
+    ) -> QModelIndex:
+        """
+        Đảm bảo mọi node trên đường dẫn full_path đã có trong model, dùng listings
+        trong cache cho các node chưa load (không gọi mạng).
+        Trả về index của node đích, hoặc QModelIndex() nếu không dựng được.
+        """
+        node = self._root
+        for name in full_path.split("/"):
+            if not node.is_loaded:
+                cached_names = get_cached_listing(node.full_path)
+                if cached_names is None:
+                    return QModelIndex()
+                self.set_children(node, cached_names)
+
+            child = self._find_child(node, name)
+            if child is None:
+                return QModelIndex()
+            node = child
+        return self.index_from_node(node)
+
+    def _find_child(self, node: FolderNode, name: str) -> FolderNode | None:
+        for child in node.children:
+            if child.name == name:
+                return child
+        if name in node.pending_names:
+            # Folder nằm trong phần chưa đưa vào view -> đưa vào tới vị trí của nó
+            self._insert_next_batch(node, node.pending_names.index(name) + 1)
+            return node.children[-1]
+        return None
+
+    def _insert_next_batch(
+        self, node: FolderNode, batch_size: int = FETCH_BATCH_SIZE
+    ) -> None:
+        batch = node.pending_names[:batch_size]
+        del node.pending_names[:batch_size]
+
+        first = len(node.children)
+        last = first + len(batch) - 1
+        parent_path = node.full_path
+
+        self.beginInsertRows(self.index_from_node(node), first, last)
+        children = node.children
+        for offset, name in enumerate(batch):
+            full_path = f"{parent_path}/{name}" if parent_path else name
+            children.append(FolderNode(name, full_path, node, first + offset))
+        self.endInsertRows()
 
 
 class FolderTreeDelegate(QStyledItemDelegate):
+    """Vẽ item trực tiếp từ dữ liệu của FolderTreeModel (không dùng widget cho từng dòng)."""
+
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+        # Icon dùng chung cho mọi dòng, chỉ render 1 lần
+        self._selected_folder_icon = QIcon(
+            get_svg_as_icon("folder_icon", 64, stroke_color="black", stroke_width=3)
+        )
+        # Render to (64px) để khi vẽ co lại vào khung 24px vẫn nét căng
+        self._check_icon = get_svg_as_icon(
+            "check_icon",
+            64,
+            stroke_color="black",
+            stroke_width=3,
+        )
+
     def paint(self, painter: QPainter, option, index):
-        super().paint(painter, option, index)
-
-        if option.state & QStyle.StateFlag.State_Selected:
-            # --- THAY ĐỔI 1: Tăng resolution khi tạo ảnh ---
-            # Thay vì 24, hãy render ra 64 hoặc 96.
-            # Dù ảnh to nhưng ta sẽ vẽ nó co lại vào khung 24px sau.
-            high_res_size = 64
-
-            check_icon = get_svg_as_icon(
-                "check_icon",
-                high_res_size,  # Render to để nét căng
-                stroke_color="black",
-                stroke_width=3,
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+
+        is_selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        if index.column() == FolderTreeModel.SIZE_COLUMN:
+            self._paint_size_cell(painter, opt, is_selected)
+            return
+
+        if is_selected:
+            # Đổi icon của item đang chọn sang màu đen
+            opt.icon = self._selected_folder_icon
+
+        widget = opt.widget
+        style = widget.style() if widget else None
+        if style:
+            style.drawControl(
+                QStyle.ControlElement.CE_ItemViewItem, opt, painter, widget
             )
+        else:
+            super().paint(painter, option, index)
 
-            # Tính toán khung vẽ (Vẫn giữ logic vị trí cũ 24px)
+        if is_selected:
+            # Tính toán khung vẽ (24px, sát mép phải)
             display_size = 24
             padding_right = 10
             rect_x = option.rect.right() - display_size - padding_right
             rect_y = option.rect.center().y() - (display_size // 2)
             target_rect = QRect(rect_x, rect_y, display_size, display_size)
 
-            # --- THAY ĐỔI 2: Bật khử răng cưa khi vẽ ---
+            # Bật khử răng cưa khi vẽ
             painter.save()
             painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            painter.setRenderHint(
-                QPainter.RenderHint.SmoothPixmapTransform
-            )  # <--- Quan trọng
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
 
             # Vẽ ảnh 64px vào khung 24px -> Mịn tuyệt đối
-            painter.drawPixmap(target_rect, check_icon)
+            painter.drawPixmap(target_rect, self._check_icon)
 
             painter.restore()
 
+    def _paint_size_cell(
+        self, painter: QPainter, opt: QStyleOptionViewItem, is_selected: bool
+    ):
+        # Vẽ nền (hover/selected) theo style, còn text tự vẽ nhỏ + mờ, căn phải
+        text = opt.text
+        opt.text = ""
+        widget = opt.widget
+        style = widget.style() if widget else None
+        if style:
+            style.drawControl(
+                QStyle.ControlElement.CE_ItemViewItem, opt, painter, widget
+            )
+        if not text:
+            return
+
+        painter.save()
+        font = painter.font()
+        font.setPixelSize(13)
+        painter.setFont(font)
+        painter.setPen(QColor("black" if is_selected else "#b8b8b8"))
+        painter.drawText(
+            opt.rect.adjusted(0, 0, -10, 0),
+            Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+            text,
+        )
+        painter.restore()
+
 
 class GDriveFoldersPicker(KeyboardShortcutsDialogMixin):
     """
@@ -67,25 +432,30 @@ class GDriveFoldersPicker(KeyboardShortcutsDialogMixin):
 
     folder_picked = Signal(str)  # Signal phát ra folder path khi chọn xong
 
-    # Role dùng để lưu trạng thái đã load children chưa
-    LOADED_ROLE = Qt.ItemDataRole.UserRole + 1
-    # Role lưu full path (hoặc tên folder để tái tạo path)
-    FULL_PATH_ROLE = Qt.ItemDataRole.UserRole + 2
-
     def __init__(self, parent: QWidget):
         super().__init__(parent)
         self.setWindowTitle("Chọn thư mục Google Drive")
         self.resize(600, 500)
 
         self._data_manager = UserDataManager()
-        self._worker = None
+        # Các worker đang tải listing (expand nhiều node cùng lúc -> chạy song song)
+        self._fetch_workers: list[FetchFoldersWorker] = []
+        # Chỉ tính dung lượng cho folder đang chọn (chọn folder khác -> huỷ cái cũ)
+        self._size_worker: FetchFolderSizeWorker | None = None
+        self._size_worker_path = ""
 
         # State
         self._selected_full_path = ""
-        self._loading_nodes = set()  # Track nodes đang loading
-        self._previous_selected_item: QTreeWidgetItem | None = None
+
+        # Search: cache listings + chỉ mục tìm kiếm (dựng ngầm khi mở dialog)
+        self._folders_cache: RemoteFoldersCache | None = None
+        self._search_index: FolderSearchIndex | None = None
+        self._index_worker: BuildFoldersSearchIndexWorker | None = None
+        # Listings tải về trong lúc chỉ mục đang dựng, sẽ thêm vào sau
+        self._pending_index_listings: list[tuple[str, list[str]]] = []
 
         self._setup_ui()
+        self._init_search_index()
 
         # Load root folders ngay khi mở
         self._load_root_data()
@@ -101,8 +471,25 @@ class GDriveFoldersPicker(KeyboardShortcutsDialogMixin):
         self.lbl_info.setStyleSheet("color: #b8b8b8;")
         main_layout.addWidget(self.lbl_info)
 
+        # --- SEARCH SECTION ---
+        self._search_input = QLineEdit()
+        self._search_input.setObjectName("FoldersSearchInput")
+        self._search_input.setPlaceholderText("Tìm thư mục đã tải (gõ để tìm)...")
+        self._search_input.setClearButtonEnabled(True)
+        self._search_input.setEnabled(False)
+        self._search_input.textChanged.connect(self._on_search_text_changed)
+        self._search_input.returnPressed.connect(self._on_search_enter_pressed)
+        main_layout.addWidget(self._search_input)
+
+        # Debounce: chỉ tìm khi user ngừng gõ một chút
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(120)
+        self._search_timer.timeout.connect(self._run_search)
+
         # --- CONTENT SECTION ---
-        # StackedLayout: Layer 0 (Loading toàn màn hình - ít dùng), Layer 1 (Tree)
+        # StackedLayout: Layer 0 (Loading toàn màn hình - ít dùng), Layer 1 (Tree),
+        # Layer 2 (Kết quả tìm kiếm)
         self.content_layout = QStackedLayout()
 
         # Input Loading Dots (cho lúc load root ban đầu)
@@ -118,18 +505,32 @@ class GDriveFoldersPicker(KeyboardShortcutsDialogMixin):
             self.loading_dots, alignment=Qt.AlignmentFlag.AlignCenter
         )
 
-        # Tree Widget
-        self.tree_widget = QTreeWidget(self)
-        self.tree_widget.setHeaderHidden(True)
-        self.tree_widget.setIconSize(QSize(24, 24))
-        self.tree_widget.setItemDelegate(FolderTreeDelegate(self.tree_widget))
-        self.tree_widget.setColumnCount(1)
-        self.tree_widget.setIndentation(20)
+        # Tree View (model-based, chỉ vẽ các dòng đang hiển thị)
+        self._tree_model = FolderTreeModel(self)
+        self._tree_model.fetch_requested.connect(self._on_fetch_requested)
+
+        self._tree_view = QTreeView(self)
+        self._tree_view.setHeaderHidden(True)
+        self._tree_view.setIconSize(QSize(24, 24))
+        self._tree_view.setItemDelegate(FolderTreeDelegate(self._tree_view))
+        self._tree_view.setIndentation(20)
+        # Mọi dòng cao bằng nhau -> view không phải đo từng dòng khi cuộn
+        self._tree_view.setUniformRowHeights(True)
+        self._tree_view.setModel(self._tree_model)
+        header = self._tree_view.header()
+        header.setStretchLastSection(False)
+        header.setSectionResizeMode(
+            FolderTreeModel.NAME_COLUMN, QHeaderView.ResizeMode.Stretch
+        )
+        header.setSectionResizeMode(
+            FolderTreeModel.SIZE_COLUMN, QHeaderView.ResizeMode.Fixed
+        )
+        header.resizeSection(FolderTreeModel.SIZE_COLUMN, SIZE_COLUMN_WIDTH)
 
         # Style cho Tree
-        self.tree_widget.setStyleSheet(
+        self._tree_view.setStyleSheet(
             f"""
-            QTreeWidget {{
+            QTreeView {{
                 outline: 0;
                 background-color: {ThemeColors.GRAY_BACKGROUND};
                 border: 1px solid {ThemeColors.GRAY_BORDER};
@@ -137,14 +538,14 @@ class GDriveFoldersPicker(KeyboardShortcutsDialogMixin):
                 color: white;
                 font-size: 16px;
             }}
-            QTreeWidget::item {{
+            QTreeView::item {{
                 height: 32px;
                 padding: 4px;
             }}
-            QTreeWidget::item:hover {{
+            QTreeView::item:hover {{
                 background-color: {ThemeColors.GRAY_HOVER};
             }}
-            QTreeWidget::item:selected {{
+            QTreeView::item:selected {{
                 background-color: {ThemeColors.MAIN};
                 color: black;
             }}
@@ -178,14 +579,60 @@ class GDriveFoldersPicker(KeyboardShortcutsDialogMixin):
             """
         )
 
-        # Events
-        self.tree_widget.itemExpanded.connect(self._on_item_expanded)
-        self.tree_widget.itemSelectionChanged.connect(self._on_item_selection_changed)
+        # Events (expand được xử lý qua model.fetchMore -> fetch_requested)
+        self._tree_view.selectionModel().selectionChanged.connect(
+            self._on_item_selection_changed
+        )
         # Double click để chọn luôn và đóng
-        # self.tree_widget.itemDoubleClicked.connect(self._on_confirm_selection)
+        # self._tree_view.doubleClicked.connect(self._on_confirm_selection)
+
+        # Search results list
+        self._search_results_model = QStringListModel(self)
+        self._search_results_view = QListView(self)
+        self._search_results_view.setObjectName("FoldersSearchResults")
+        self._search_results_view.setModel(self._search_results_model)
+        self._search_results_view.setUniformItemSizes(True)
+        self._search_results_view.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self._search_results_view.activated.connect(self._on_search_result_activated)
+        self._search_results_view.clicked.connect(self._on_search_result_activated)
+
+        self.setStyleSheet(
+            f"""
+            #FoldersSearchInput {{
+                background-color: {ThemeColors.GRAY_BACKGROUND};
+                border: 1px solid {ThemeColors.GRAY_BORDER};
+                border-radius: 6px;
+                color: white;
+                padding: 4px 8px 6px;
+            }}
+            #FoldersSearchInput:focus {{
+                border-color: {ThemeColors.MAIN};
+            }}
+            #FoldersSearchResults {{
+                outline: 0;
+                background-color: {ThemeColors.GRAY_BACKGROUND};
+                border: 1px solid {ThemeColors.GRAY_BORDER};
+                border-radius: 6px;
+                color: white;
+                font-size: 15px;
+            }}
+            #FoldersSearchResults::item {{
+                height: 30px;
+                padding: 0px 6px;
+            }}
+            #FoldersSearchResults::item:hover {{
+                background-color: {ThemeColors.GRAY_HOVER};
+            }}
+            #FoldersSearchResults::item:selected {{
+                background-color: {ThemeColors.MAIN};
+                color: black;
+            }}
+            """
+        )
 
         self.content_layout.addWidget(loading_container)  # 0
-        self.content_layout.addWidget(self.tree_widget)  # 1
+        self.content_layout.addWidget(self._tree_view)  # 1
+        self.content_layout.addWidget(self._search_results_view)  # 2
         self.content_layout.setCurrentIndex(1)  # Mặc định hiện tree trắng
 
         main_layout.addLayout(self.content_layout)
@@ -315,7 +762,8 @@ class GDriveFoldersPicker(KeyboardShortcutsDialogMixin):
     def _refresh_data(self):
         self.helper_label.setText("Chọn 1 thư mục để bắt đầu...")
         self.final_folder_label.setText("")
-        self._previous_selected_item = None
+        self._selected_full_path = ""
+        self._reset_search_index()
         self._load_root_data()
 
     # --- LOGIC: ROOT FILES ---
@@ -324,203 +772,296 @@ class GDriveFoldersPicker(KeyboardShortcutsDialogMixin):
         if not remote_name:
             return
 
+        # Cây cũ bị bỏ -> kill các lệnh rclone còn đang tải cho nó
+        self._release_fetch_workers()
+
         # UI State
-        self.tree_widget.clear()
+        self._tree_model.reset_root()
         self.content_layout.setCurrentIndex(0)  # Loading
         self.loading_dots.start()
         self.lbl_info.setText(f"Đang tải danh sách gốc từ: {remote_name}...")
         self._enable_buttons(False, False)
 
         # Worker
-        self._start_fetch_worker(remote_name, "", is_root=True)
+        self._start_fetch_worker(remote_name, self._tree_model.root_node())
 
     # --- LOGIC: EXPAND NODE ---
-    def _on_item_expanded(self, item: QTreeWidgetItem):
-        # Kiểm tra xem node này đã load chưa
-        if item.data(0, self.LOADED_ROLE) == True:
-            return
+    def _on_fetch_requested(self, index: QModelIndex):
+        # View đã gọi fetchMore() khi user expand node chưa load
+        node = self._tree_model.node_from_index(index)
 
         remote_name = self._get_remote_name()
         if not remote_name:
+            self._tree_model.mark_failed(node)
             return
 
-        # Lấy path của node hiện tại
-        # Path được lưu trong FULL_PATH_ROLE hoặc tái tạo từ parent
-        # Ở đây ta nên lưu full path từ lúc tạo node cha
-        current_path = item.data(0, self.FULL_PATH_ROLE)
-
-        # Đánh dấu đang load (để tránh spam)
-        # Có thể đổi icon sang loading
-        self._set_item_loading_state(item, True)
-
-        self.lbl_info.setText(f"Đang tải con của: {current_path}...")
-        self._start_fetch_worker(remote_name, current_path, parent_item=item)
-
-    def _start_fetch_worker(self, remote_name, path, is_root=False, parent_item=None):
-        # Stop worker cũ nếu đang chạy (chỉ áp dụng nếu user spam refresh root,
-        # còn expand nhiều node cùng lúc thì nên hỗ trợ queue hoặc worker riêng biêt?
-        # Code cũ dùng 1 biến self._worker, nên tạm thời ta chấp nhận 1 worker tại 1 thời điểm
-        # hoặc tạo worker cục bộ. Để an toàn và đơn giản: tạo worker mới, không lưu vào self._worker
-        # nếu muốn concurrent, nhưng FetchFoldersWorker là QThread, cần giữ ref.
-        # => Tạm thời: cancel worker cũ nếu có (chấp nhận chỉ load 1 cái 1 lúc).
+        self.lbl_info.setText(f"Đang tải con của: {node.full_path}...")
+        self._start_fetch_worker(remote_name, node)
 
-        if self._worker and self._worker.isRunning():
-            self._worker.quit()
-            self._worker.wait()
-
-        worker = FetchFoldersWorker(remote_name, path)
+    def _start_fetch_worker(self, remote_name: str, node: FolderNode):
+        # Mỗi node 1 worker riêng, chạy song song; refresh/đóng dialog sẽ huỷ hết
+        worker = FetchFoldersWorker(remote_name, node.full_path)
         worker.data_ready.connect(
-            lambda folders, err: self._on_worker_finished(
-                folders, err, is_root, parent_item, worker
-            )
+            lambda folders, err: self._on_worker_finished(folders, err, node, worker)
         )
-        self._worker = worker  # Keep reference
+        self._fetch_workers.append(worker)  # Keep reference
         worker.start()
 
-    def _on_worker_finished(self, folders, error_msg, is_root, parent_item, worker_ref):
-        # Clean up ref
-        if self._worker == worker_ref:
-            self._worker = None
+    def _release_fetch_workers(self):
+        # Kill rclone ngay, tracker chung giữ QThread tới khi nó thoát hẳn
+        for worker in self._fetch_workers:
+            release_worker(worker)
+        self._fetch_workers.clear()
+        self._release_size_worker()
+
+    def _on_worker_finished(self, folders, error_msg, node: FolderNode, worker_ref):
+        # Clean up ref (worker đã phát kết quả, thread sẽ thoát ngay sau đó)
+        if worker_ref in self._fetch_workers:
+            self._fetch_workers.remove(worker_ref)
+            release_worker(worker_ref)
+
+        is_root = node is self._tree_model.root_node()
 
         if error_msg:
             CustomAnnounce.error(self, "Lỗi tải dữ liệu", error_msg)
+            self._tree_model.mark_failed(node)
             if is_root:
                 self.content_layout.setCurrentIndex(1)  # Back to tree (empty)
                 self.loading_dots.stop()
                 self._enable_buttons(True, False)
-            else:
-                # Revert loading state của item
-                self._set_item_loading_state(parent_item, False)
             return
 
         # Success
+        self._tree_model.set_children(node, folders)
+        self._add_listing_to_search(node.full_path, folders)
         if is_root:
             self.content_layout.setCurrentIndex(1)
             self.loading_dots.stop()
-            self._populate_tree(
-                self.tree_widget.invisibleRootItem(), folders, parent_path=""
-            )
             self.lbl_info.setText("Đã tải xong danh sách gốc.")
             self._enable_buttons(True, False)
         else:
-            # Xử lý cho node con
-            self._populate_tree(
-                parent_item,
-                folders,
-                parent_path=parent_item.data(0, self.FULL_PATH_ROLE),
-            )
-            self._set_item_loading_state(parent_item, False)  # Sets icon back to folder
-            # Mark as loaded
-            parent_item.setData(0, self.LOADED_ROLE, True)
             self.lbl_info.setText("Đã tải xong.")
 
-    def _populate_tree(self, parent_node, folder_names, parent_path=""):
-        # parent_node có thể là invisibleRootItem hoặc 1 QTreeWidgetItem
-
-        # Nếu là node con, xóa dummy item "Loading..." trước
-        if isinstance(parent_node, QTreeWidgetItem):
-            # Xóa hết con cũ (thường là dummy)
-            parent_node.takeChildren()
-
-        if not folder_names:
-            if isinstance(parent_node, QTreeWidgetItem):
-                # Set policy là DontShowIndicator để ẩn mũi tên đi
-                parent_node.setChildIndicatorPolicy(
-                    QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicator
-                )
+    # --- LOGIC: SEARCH ---
+    def _init_search_index(self):
+        remote_name = self._data_manager.get_active_remote()
+        if not remote_name:
             return
 
-        # Icons
-        icon_folder = get_svg_as_icon(
-            "folder_icon", 64, stroke_color="#FFD700", stroke_width=3
-        )
+        self._folders_cache = RemoteFoldersCache(remote_name)
+        self._tree_model.set_size_lookup(self._folders_cache.get_size)
+        self._index_worker = BuildFoldersSearchIndexWorker(self._folders_cache)
+        self._index_worker.index_ready.connect(self._on_search_index_ready)
+        self._index_worker.start()
+
+    def _on_search_index_ready(self, disk_data: dict, search_index: FolderSearchIndex):
+        if self._folders_cache is None or self._search_index is not None:
+            return  # Đã refresh trong lúc dựng chỉ mục -> bỏ kết quả cũ
+
+        self._folders_cache.merge_disk_data(disk_data)
+        self._tree_view.viewport().update()  # Hiện dung lượng đã cache
+        self._update_selected_folder_label()
+        for parent_path, names in self._pending_index_listings:
+            search_index.add_listing(parent_path, names)
+        self._pending_index_listings.clear()
+
+        self._search_index = search_index
+        self._search_input.setEnabled(True)
+        if self._search_input.text().strip():
+            self._run_search()
+
+    def _reset_search_index(self):
+        if self._folders_cache is None:
+            return
+        if self._index_worker is not None:
+            release_worker(self._index_worker)  # Chỉ mục cũ không còn dùng
+            self._index_worker = None
+        self._folders_cache.clear()
+        self._pending_index_listings.clear()
+        self._search_index = FolderSearchIndex()
+        self._search_input.clear()
+        self._search_input.setEnabled(True)
+
+    def _add_listing_to_search(self, parent_path: str, folder_names: list[str]):
+        if self._folders_cache is None:
+            return
+        self._folders_cache.put_listing(parent_path, folder_names)
+        if self._search_index is None:
+            self._pending_index_listings.append((parent_path, folder_names))
+        else:
+            self._search_index.add_listing(parent_path, folder_names)
+
+    def _on_search_text_changed(self, text: str):
+        if not text.strip():
+            self._search_timer.stop()
+            self._search_results_model.setStringList([])
+            if self.content_layout.currentIndex() == 2:
+                self.content_layout.setCurrentIndex(1)
+            return
+        self._search_timer.start()
 
-        items_to_add = []
-        for name in folder_names:
-            item = QTreeWidgetItem()
-            item.setText(0, name)
-            item.setIcon(0, icon_folder)
+    def _run_search(self):
+        query = self._search_input.text().strip()
+        if not query or self._search_index is None:
+            return
 
-            # .Tính full path
-            full_path = f"{parent_path}/{name}" if parent_path else name
-            item.setData(0, self.FULL_PATH_ROLE, full_path)
-            item.setData(0, self.LOADED_ROLE, False)  # Chưa load con
+        timer = QElapsedTimer()
+        timer.start()
+        results = self._search_index.search(query)
+        elapsed_ms = timer.elapsed()
 
-            # Thêm dummy child để hiện mũi tên expand
-            dummy = QTreeWidgetItem()
-            dummy.setText(0, "Đang tải...")
-            item.addChild(dummy)
+        self._search_results_model.setStringList(results)
+        self.content_layout.setCurrentIndex(2)
+        if results:
+            self._search_results_view.setCurrentIndex(
+                self._search_results_model.index(0, 0)
+            )
+        self.lbl_info.setText(
+            f"Tìm thấy {len(results)} thư mục trong {len(self._search_index)} "
+            f"thư mục đã tải ({elapsed_ms} ms)."
+        )
 
-            items_to_add.append(item)
+    def _on_search_enter_pressed(self):
+        self._search_timer.stop()
+        self._run_search()
+        current = self._search_results_view.currentIndex()
+        if current.isValid():
+            self._on_search_result_activated(current)
 
-        if isinstance(parent_node, QTreeWidget):  # Root
-            parent_node.addTopLevelItems(items_to_add)
-        else:
-            parent_node.addChildren(items_to_add)
+    def _on_search_result_activated(self, index: QModelIndex):
+        full_path = index.data(Qt.ItemDataRole.DisplayRole)
+        if not full_path or self._folders_cache is None:
+            return
 
-    def _set_item_loading_state(self, item: QTreeWidgetItem, is_loading: bool):
-        if is_loading:
-            # Có thể đổi icon thành loading hoặc text tạm
-            # item.setText(0, f"{item.text(0)} (Đang tải...)")
-            pass
-        else:
-            # item.setText(0, item.text(0).replace(" (Đang tải...)", ""))
-            pass
+        # Quay lại cây và mở tới thư mục tìm được (dùng cache, không gọi mạng)
+        self._search_input.blockSignals(True)
+        self._search_input.clear()
+        self._search_input.blockSignals(False)
+        self.content_layout.setCurrentIndex(1)
 
-    def _on_item_selection_changed(self):
-        selected_items = self.tree_widget.selectedItems()
-        if not selected_items:
-            self._selected_full_path = ""
-            self._enable_buttons(True, False)
+        target = self._tree_model.reveal_path(
+            full_path, self._folders_cache.get_listing
+        )
+        if not target.isValid():
+            CustomAnnounce.warn(
+                self,
+                "Không tìm thấy",
+                f'Không mở được thư mục "{full_path}". Hãy thử "Làm mới toàn bộ".',
+            )
             return
 
-        item = selected_items[0]
-        # Bỏ qua nếu chọn phải dummy item
-        if item.text(0) == "Đang tải...":
+        parent = target.parent()
+        while parent.isValid():
+            self._tree_view.expand(parent)
+            parent = parent.parent()
+        self._tree_view.setCurrentIndex(target)
+        self._tree_view.scrollTo(target, QTreeView.ScrollHint.PositionAtCenter)
+        self._tree_view.setFocus()
+
+    def _on_item_selection_changed(self, *_):
+        # Chọn theo dòng -> lấy index của cột tên
+        indexes = self._tree_view.selectionModel().selectedRows()
+        if not indexes:
             self._selected_full_path = ""
             self._enable_buttons(True, False)
             return
 
-        # 2. Đổi icon của item đang chọn sang màu đen
-        item.setIcon(
-            0,
-            get_svg_as_icon(
-                "folder_icon", 64, stroke_color="black", stroke_width=3
-            ),  # Giả sử bạn có icon này
-        )
-
-        self._selected_full_path = item.data(0, self.FULL_PATH_ROLE)
+        # Icon của item đang chọn được FolderTreeDelegate đổi sang màu đen khi vẽ
+        self._selected_full_path = indexes[0].data(FolderTreeModel.FULL_PATH_ROLE)
         self.helper_label.setText("Thư mục đã chọn:")
-        self.final_folder_label.setText(self._selected_full_path)
+        self._update_selected_folder_label()
+        self._request_folder_size(self._selected_full_path)
 
         self._enable_buttons(True, True)
 
-        if self._previous_selected_item:
-            self._previous_selected_item.setIcon(
-                0,
-                get_svg_as_icon(
-                    "folder_icon", 64, stroke_color="#FFD700", stroke_width=3
-                ),  # Giả sử bạn có icon này
-            )
+    def _update_selected_folder_label(self):
+        if not self._selected_full_path:
+            return
+        text = self._selected_full_path
+        size = None
+        if self._folders_cache is not None:
+            size = self._folders_cache.get_size(text)
+        if size is not None:
+            text += f"  ({format_bytes(size[0])}, {size[1]:,} file)"
+        self.final_folder_label.setText(text)
+
+    # --- LOGIC: FOLDER SIZE ---
+    def _request_folder_size(self, full_path: str):
+        """Tính ngầm dung lượng folder đang chọn (nếu chưa có trong cache)."""
+        if self._folders_cache is None or not full_path:
+            return
+        if self._folders_cache.get_size(full_path) is not None:
+            return
+        if self._size_worker is not None and self._size_worker_path == full_path:
+            return  # Đang tính rồi
+        remote_name = self._get_remote_name()
+        if not remote_name:
+            return
+
+        self._release_size_worker()
+        # Folder con đã biết dung lượng được cộng thẳng, rclone chỉ duyệt phần còn lại
+        child_names = self._folders_cache.get_listing(full_path) or []
+        known_children = self._folders_cache.known_child_sizes(full_path, child_names)
+
+        worker = FetchFolderSizeWorker(remote_name, full_path, known_children)
+        worker.data_ready.connect(
+            lambda size, err: self._on_folder_size_ready(size, err, full_path, worker)
+        )
+        self._size_worker = worker
+        self._size_worker_path = full_path
+        self._tree_model.set_size_computing(full_path, True)
+        worker.start()
 
-        self._previous_selected_item = item
+    def _release_size_worker(self):
+        if self._size_worker is None:
+            return
+        release_worker(self._size_worker)
+        self._tree_model.set_size_computing(self._size_worker_path, False)
+        self._size_worker = None
+        self._size_worker_path = ""
+
+    def _on_folder_size_ready(
+        self, size: tuple, error_msg: str, full_path: str, worker_ref
+    ):
+        if worker_ref is not self._size_worker:
+            return  # Kết quả của lần tính đã bị huỷ
+        self._release_size_worker()
+
+        if error_msg:
+            self.lbl_info.setText(f'Không tính được dung lượng "{full_path}".')
+            print(f">>> Error computing folder size '{full_path}': {error_msg}")
+            return
+
+        if self._folders_cache is not None:
+            self._folders_cache.put_size(full_path, size)
+        self._tree_model.notify_size_changed(full_path)
+        if full_path == self._selected_full_path:
+            self._update_selected_folder_label()
 
     def _on_confirm_selection(self):
         if self._selected_full_path:
             self.folder_picked.emit(self._selected_full_path)
             self.accept()
         else:
-            # Nếu double click vào item dummy
-            if (
-                self.tree_widget.currentItem()
-                and self.tree_widget.currentItem().text(0) == "Đang tải..."
-            ):
-                return
             CustomAnnounce.warn(self, "Chưa chọn", "Vui lòng chọn một thư mục.")
 
+    def done(self, result: int):
+        # Không chờ worker nào: huỷ hết (kill rclone) rồi đóng dialog ngay
+        self._release_fetch_workers()
+        if self._index_worker is not None:
+            release_worker(self._index_worker)
+            self._index_worker = None
+        # alive phải về 0 sau vài trăm ms (lần đóng sau), nếu tăng dần -> worker bị treo
+        info = orphaned_workers_info()
+        print(
+            f">>> Orphaned workers: alive={info['alive']}, peak={info['peak']},"
+            f" total_released={info['total_released']}"
+        )
+        if self._folders_cache is not None:
+            self._folders_cache.save()
+        super().done(result)
+
     def closeEvent(self, event: QCloseEvent):
-        if self._worker is not None and self._worker.isRunning():
-            self._worker.quit()
-            self._worker.wait()
+        # Worker được huỷ trong done() (close -> reject -> done)
         self.loading_dots.stop()
         super().closeEvent(event)
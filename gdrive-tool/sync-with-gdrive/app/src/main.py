@@ -1,4 +1,5 @@
-from . import resources_rc  # noqa: F401
+from __future__ import annotations
+from .testing.performance_testing import PerformanceTestingMixin, startup_timeline
 import sys
 from pathlib import Path
 from PySide6.QtWidgets import (
@@ -9,47 +10,50 @@ from PySide6.QtWidgets import (
     QFileDialog,
     QSizePolicy,
     QFrame,
-    QScrollArea,
 )
 from PySide6.QtGui import QKeySequence, QShortcut, QIcon
 from PySide6.QtCore import QProcess, QSize, Qt, QTimer
-from .sync_progress import SyncProgressDialog
-from .components.tooltip import CollisionConstraint, ToolTipBinder, ToolTipConfig
-from .gdrive_folders_picker import GDriveFoldersPicker
-from .components.scrollable_text import ScrollableText
-from .login_gdrive_screen import LoginGDriveScreen, LoginResult
-from .active_remote_info import ActiveRemoteScreen
+from .components.log_view import LogView
 from .components.announcement import CustomAnnounce
 from .components.divider import CustomDivider
-from .utils.helpers import (
-    detect_content_type_by_file_extension,
-    detect_file_extension,
-    detect_path_type,
-    extract_filename_with_ext,
-    get_svg_as_icon,
-)
-from .components.flow_layout import CustomFlowLayout
-from .components.selected_file_box import FileInfoBox
+from .utils.helpers import app_data_dir, get_svg_as_icon
+from .components.selected_items_preview import SelectedItemsPreview
 from .components.label import CustomLabel
-from .workers.sync_worker import (
-    RcloneSyncWorker,
-    SyncAction,
-    SyncOptions,
-    SyncProgressData,
-    SyncProgressStatus,
-)
 
 # from testing.mock_sync_worker import MockRcloneSyncWorker
 from .data.user_data_manager import UserDataConfigSchema, UserDataManager
 from .configs.configs import SyncError, ThemeColors
 from .components.button import CustomButton, LoadingButton
 from .components.overlay import OverlayPosition, PositionedOverlay
-from .settings_screen import SettingsScreen
 import os
 from .components.window_title_bar import CustomWindowTitleBar
 from .mixins.main_window import MainWindowMixin
-from .testing.performance_testing import PerformanceTestingMixin
 from .data.rclone_configs_manager import RCloneConfigManager
+from .utils.single_instance import forward_paths_to_running_instance
+from typing import TYPE_CHECKING
+
+# Các màn hình phụ + sync worker chỉ cần sau khi user bấm -> import lúc mở lần đầu
+# (trong method tương ứng) để cửa sổ chính hiện nhanh hơn khi mở từ context menu
+if TYPE_CHECKING:
+    from .sync_progress import SyncProgressDialog
+    from .login_gdrive_screen import LoginResult
+    from .settings_screen import SettingsScreen
+    from .workers.detect_path_types_worker import DetectPathTypesWorker
+    from .workers.sync_worker import (
+        RcloneSyncWorker,
+        SyncProgressData,
+        SyncProgressStatus,
+    )
+
+# Gom các paths được chuyển tới liên tiếp (chọn nhiều file) rồi cập nhật preview 1 lần
+FORWARDED_PATHS_COALESCE_MS = 50
+# Số lần gửi lại paths khi app đang chạy vẫn giữ server nhưng chưa phản hồi kịp
+FORWARD_PATHS_RETRIES = 3
+# Ghi toàn bộ log đồng bộ ra file xoay vòng %AppData%/SynRive/logs/sync.log
+# (khung log trên UI chỉ giữ các dòng gần nhất)
+SYNC_LOG_TO_FILE = True
+
+startup_timeline.record_since_begin("imports")
 
 
 class MainWindow(PerformanceTestingMixin, MainWindowMixin):
@@ -68,17 +72,25 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
         self._current_gdrive_path: str = ""
         self._active_remote: str
         self._selected_docs_preview: QVBoxLayout
-        self._selected_docs_flow: CustomFlowLayout
+        self._selected_items_preview: SelectedItemsPreview
+        self._detect_path_types_worker: DetectPathTypesWorker | None = None
         self._sync_btn: LoadingButton | None = None
         self._is_syncing: bool = False
-        self._log_output: ScrollableText
+        self._log_output: LogView
         self._right_actions_layout: QHBoxLayout
         self._active_remote_label: CustomLabel
         self._user_already_had_data: bool = False
         self._copy_log_btn: CustomButton
         self._settings_dialog: SettingsScreen | None = None
         self._copy_log_btn_overlay: PositionedOverlay
-        self._setup_ui()
+        # Paths nhận từ các lần mở app sau (single instance), chờ gom rồi mới thêm
+        self._forwarded_paths: list[str] = []
+        self._forwarded_paths_timer = QTimer(self)
+        self._forwarded_paths_timer.setSingleShot(True)
+        self._forwarded_paths_timer.setInterval(FORWARDED_PATHS_COALESCE_MS)
+        self._forwarded_paths_timer.timeout.connect(self._flush_forwarded_paths)
+        with startup_timeline.phase("_setup_ui"):
+            self._setup_ui()
 
     def _center_window(self) -> None:
         """Căn giữa cửa sổ ứng dụng vào màn hình (tránh bị che bởi taskbar)."""
@@ -99,6 +111,27 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
         self._local_paths_list = paths
         self._update_selected_docs_preview()
 
+    def _on_paths_forwarded(self, paths: list[str]) -> None:
+        """Nhận paths từ lần mở app sau (context menu) khi app đang chạy."""
+        self._forwarded_paths.extend(paths)
+        self._forwarded_paths_timer.start()  # Start lại -> gom các lần gọi liên tiếp
+        self._bring_to_front()
+
+    def _flush_forwarded_paths(self) -> None:
+        existing = set(self._local_paths_list)
+        new_paths = [
+            p for p in santize_input_paths(self._forwarded_paths) if p not in existing
+        ]
+        self._forwarded_paths.clear()
+        if new_paths:
+            self._set_local_paths_list(self._local_paths_list + new_paths)
+
+    def _bring_to_front(self) -> None:
+        if self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
     def _set_gdrive_path_input(self, path: str) -> None:
         self._gdrive_path_input.setText(path)
 
@@ -273,14 +306,10 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
                 background-color: {ThemeColors.MAIN};
                 color: black;
             }}
-            #ScrollableTextScroll {{
+            #LogViewText {{
                 background-color: {ThemeColors.GRAY_BACKGROUND};
                 border: 1px solid {ThemeColors.GRAY_BORDER};
                 border-radius: 12px;
-            }}
-            #ScrollableTextLabel {{
-                background-color: {ThemeColors.GRAY_BACKGROUND};
-                border-radius: 12px;
                 color: white;
             }}
             #CopyLogButton {{
@@ -309,10 +338,8 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
         QTimer.singleShot(0, self._animate_open_zoom)
         # Thêm các phím tắt
         QTimer.singleShot(0, self._add_keyboard_shortcuts)
-        # Thiết lập danh sách local paths ban đầu
-        QTimer.singleShot(
-            800, lambda paths=self._local_paths_list: self._set_local_paths_list(paths)
-        )
+        # Hiển thị danh sách local paths ban đầu (kể cả paths vừa được chuyển tới)
+        QTimer.singleShot(800, self._update_selected_docs_preview)
         # Load saved user data
         QTimer.singleShot(1000, self._load_saved_user_data)
 
@@ -329,6 +356,7 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
                 None,
                 "#000000",
                 margins=(0, 0, 8, 0),
+                device_pixel_ratio=browse_btn.devicePixelRatioF(),
             )
         )
         browse_btn.setIconSize(QSize(26, 26))
@@ -366,76 +394,40 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
 
     def _render_selected_docs_preview(self) -> None:
         """Khởi tạo preview các tệp/thư mục đã chọn."""
-        selected_docs_label = CustomLabel(
-            "Tệp và thư mục được chọn trên máy:", is_bold=True
+        self._selected_items_preview = SelectedItemsPreview(
+            "Tệp và thư mục được chọn trên máy:"
         )
-        selected_docs_label.setContentsMargins(6, 0, 0, 0)
-
-        self._selected_docs_frame_inner_scroll = QFrame()
-        self._selected_docs_flow = CustomFlowLayout(
-            margins=(0, 4, 0, 0),
-            h_spacing=8,
-            v_spacing=8,
-            parent=self._selected_docs_frame_inner_scroll,
+        self._selected_items_preview.path_clicked.connect(
+            self._reveal_path_in_file_explorer
         )
+        self._selected_docs_preview.addWidget(self._selected_items_preview)
 
-        selected_docs_empty_label = CustomLabel(
-            "Chưa có tệp hoặc thư mục nào được chọn.", font_size=12
-        )
-        self._selected_docs_empty_overlay = PositionedOverlay(
-            container=self._selected_docs_frame_inner_scroll,
-            overlay=selected_docs_empty_label,
-            position=OverlayPosition.TOP_LEFT,
-            margin=0,
-        )
+    def _update_selected_docs_preview(self) -> None:
+        """Cập nhật lại preview các tệp/thư mục đã chọn."""
+        from .workers.cancellable_worker import release_worker
+        from .workers.detect_path_types_worker import DetectPathTypesWorker
 
-        selected_docs_scroll = QScrollArea()
-        selected_docs_scroll.setWidgetResizable(True)
-        selected_docs_scroll.setFrameShape(QScrollArea.Shape.NoFrame)
-        selected_docs_scroll.setHorizontalScrollBarPolicy(
-            Qt.ScrollBarPolicy.ScrollBarAlwaysOff
-        )
-        selected_docs_scroll.setMinimumHeight(100)
-        selected_docs_scroll.setMaximumHeight(160)
-        selected_docs_scroll.setWidget(self._selected_docs_frame_inner_scroll)
+        # Huỷ lần phân loại trước (nếu chưa xong), kết quả cũ bị bỏ qua
+        if self._detect_path_types_worker is not None:
+            release_worker(self._detect_path_types_worker)
+            self._detect_path_types_worker = None
 
-        self._selected_docs_preview.addWidget(selected_docs_label)
-        self._selected_docs_preview.addWidget(selected_docs_scroll)
+        self._selected_items_preview.reset(len(self._local_paths_list))
+        if not self._local_paths_list:
+            return
 
-    def _update_selected_docs_preview(self) -> None:
-        """Cập nhật lại preview các tệp/thư mục đã chọn."""
-        # Xoá hết item cũ
-        self._selected_docs_flow.clear_items()
-
-        # Thêm nhiều box để thấy wrap
-        if len(self._local_paths_list) > 0:
-            self._selected_docs_empty_overlay.hide()
-            for path in self._local_paths_list:
-                path_type = detect_path_type(path)
-                content_type = "folder"
-                if path_type == "file":
-                    file_ext = detect_file_extension(path)
-                    content_type = detect_content_type_by_file_extension(file_ext or "")
-                file_info_box = FileInfoBox(
-                    svg_name=f"{content_type}_icon",
-                    svg_fill_color=None,
-                    svg_stroke_color="#ffffff",
-                    text=extract_filename_with_ext(path),
-                )
-                file_info_box.on_clicked(
-                    lambda p=path: self._reveal_path_in_file_explorer(p)
-                )
-                ToolTipBinder(
-                    file_info_box,
-                    ToolTipConfig(
-                        text=f"<b>{'Thư mục' if path_type=='folder' else 'Tệp'}</b>: {path}",
-                        show_delay_ms=100,
-                        constrain_to=CollisionConstraint.WINDOW,
-                    ),
-                )
-                self._selected_docs_flow.addWidget(file_info_box)
-        else:
-            self._selected_docs_empty_overlay.show()
+        # Stat từng path (có thể nằm trên ổ mạng) ở worker, không chặn GUI thread
+        worker = DetectPathTypesWorker(self._local_paths_list)
+        worker.batch_ready.connect(
+            lambda infos, w=worker: self._on_path_types_detected(infos, w)
+        )
+        self._detect_path_types_worker = worker
+        worker.start()
+
+    def _on_path_types_detected(self, infos: list, worker: DetectPathTypesWorker):
+        if worker is not self._detect_path_types_worker:
+            return  # Kết quả của danh sách cũ
+        self._selected_items_preview.append_path_infos(infos)
 
     def _create_active_remote_info(self) -> QVBoxLayout:
         layout = QVBoxLayout()
@@ -493,6 +485,8 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
 
     def _open_active_remote_screen(self):
         """Mở window để chọn active remote"""
+        from .active_remote_info import ActiveRemoteScreen
+
         active_remote_screen = ActiveRemoteScreen(self)
         active_remote_screen.remote_selected.connect(self._on_remote_selected)
         active_remote_screen.on_add_remote_requested(self._open_login_gdrive_screen)
@@ -510,6 +504,8 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
     def _open_gdrive_folders_picker(self) -> None:
         """Mở dialog chọn thư mục trên Google Drive."""
         # Hiện tại chưa hỗ trợ do rclone không có chức năng này
+        from .gdrive_folders_picker import GDriveFoldersPicker
+
         folders_picker = GDriveFoldersPicker(self)
         folders_picker.folder_picked.connect(self._on_gdrive_folder_picked)
         folders_picker.exec()
@@ -545,6 +541,7 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
                 None,
                 "#000000",
                 margins=(0, 0, 0, 0),
+                device_pixel_ratio=open_gdrive_folders_preview.devicePixelRatioF(),
             )
         )
         open_gdrive_folders_preview.setIconSize(QSize(26, 26))
@@ -580,6 +577,8 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
 
     def _do_login_gdrive(self) -> None:
         """Mở popup đăng nhập Google Drive."""
+        from .login_gdrive_screen import LoginGDriveScreen
+
         login_gdrive_screen = LoginGDriveScreen(self)
         login_gdrive_screen.login_result.connect(self._on_login_gdrive_successful)
         login_gdrive_screen.login_log.connect(self._write_log)
@@ -589,7 +588,14 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
         """Xử lý khi người dùng nhấn nút sao chép log."""
         QApplication.clipboard().setText(self._log_output.get_text())
         self._copy_log_btn.switch_text_and_icon(
-            icon=get_svg_as_icon("double_check_icon", 20, None, "#ffffff", 2),
+            icon=get_svg_as_icon(
+                "double_check_icon",
+                20,
+                None,
+                "#ffffff",
+                2,
+                device_pixel_ratio=self._copy_log_btn.devicePixelRatioF(),
+            ),
             icon_size=20,
         )
         QTimer.singleShot(
@@ -600,14 +606,20 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
         log_layout = QVBoxLayout()
         log_label = CustomLabel("Chi tiết đồng bộ:", is_bold=True)
         log_label.setContentsMargins(6, 16, 0, 0)
-        self._log_output = ScrollableText(
+        self._log_output = LogView(
             fixed_height=150,
-            default_text="Đồng bộ ngay để xem chi tiết...",
+            placeholder_text="Đồng bộ ngay để xem chi tiết...",
+            log_file_path=(
+                app_data_dir() / "logs" / "sync.log" if SYNC_LOG_TO_FILE else None
+            ),
         )
         self._log_output.set_contents_margins(10, 6, 10, 6)
         self._log_output.set_font_size(12)
         self._copy_log_btn = CustomButton("Sao chép", fixed_height=28, font_size=11)
         self._copy_log_btn.setObjectName("CopyLogButton")
+        self._copy_log_btn.setToolTip(
+            f"Sao chép {self._log_output.max_lines} dòng log gần nhất"
+        )
         self._copy_log_btn.adjustSize()
         self._copy_log_btn.on_clicked(self._on_copy_log)
         self._copy_log_btn_overlay = PositionedOverlay(
@@ -621,7 +633,7 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
         return log_layout
 
     def _write_log(self, text: str) -> None:
-        self._log_output.setText(f"{text}")
+        self._log_output.append_line(text)
 
     def _render_sync_button_section(self) -> None:
         """Render nút đồng bộ và nút thoát."""
@@ -645,6 +657,7 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
                     "#000000",
                     3,
                     (0, 0, 8, 0),
+                    self._sync_btn.devicePixelRatioF(),
                 )
             )
             self._sync_btn.setIconSize(QSize(30, 30))
@@ -690,6 +703,8 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
 
     def _do_sync(self) -> None:
         """Thực hiện đồng bộ."""
+        from .workers.sync_worker import RcloneSyncWorker, SyncAction, SyncOptions
+
         # Start sync with worker
         options = SyncOptions(action=SyncAction.ONLY_UPLOAD)
 
@@ -738,6 +753,8 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
         self._do_sync()
 
         # Hiện dialog tiến trình đồng bộ (sync progress dialog)
+        from .sync_progress import SyncProgressDialog
+
         self._sync_progress_dialog = SyncProgressDialog(parent=self)
         self._sync_progress_dialog.reset()
         self._sync_progress_dialog.cancel_requested.connect(self._on_cancel_sync)
@@ -751,6 +768,8 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
     def _on_sync_progress(
         self, status: SyncProgressStatus, data: SyncProgressData
     ) -> None:
+        from .workers.sync_worker import SyncProgressStatus
+
         # Update dữ liệu vào list
         if self._sync_progress_dialog:
             self._sync_progress_dialog.update_item_progress(data)
@@ -791,6 +810,8 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
     def _open_settings_screen(self) -> None:
         """Mở window Settings."""
         if not self._settings_dialog:
+            from .settings_screen import SettingsScreen
+
             self._settings_dialog = SettingsScreen(self)
         self._settings_dialog.exec()
 
@@ -818,6 +839,7 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
                     24,
                     None,
                     "#ffffff",
+                    device_pixel_ratio=settings_btn.devicePixelRatioF(),
                 )
             )
             settings_btn.setIconSize(QSize(24, 24))
@@ -837,6 +859,7 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
                     None,
                     "#000000",
                     margins=(0, 0, 8, 0),
+                    device_pixel_ratio=login_btn.devicePixelRatioF(),
                 )
             )
             login_btn.setIconSize(QSize(26, 26))
@@ -856,8 +879,11 @@ class MainWindow(PerformanceTestingMixin, MainWindowMixin):
 
     def _load_saved_user_data(self) -> None:
         """Tải dữ liệu người dùng đã lưu (nếu có)."""
-        self._ensure_significant_data_initialized()
-        self._render_user_data(self._data_manager.get_entire_config())
+        # Lần gọi đầu tiên là bước khởi động cuối -> ghi startup timeline
+        with startup_timeline.phase("_load_saved_user_data"):
+            self._ensure_significant_data_initialized()
+            self._render_user_data(self._data_manager.get_entire_config())
+        self._finish_startup_timeline()
 
     def _add_user_remote(self, remote_name: str) -> None:
         """Thêm remote vào config."""
@@ -909,16 +935,49 @@ def santize_input_paths(local_paths: list[str]) -> list[str]:
 def start_app(local_paths: list[str]) -> None:
     """Hàm khởi tạo ứng dụng."""
     print(">>> Starting application...")
-    RCloneConfigManager.init_rclone_config_path()
-
-    app = QApplication(sys.argv)
-    font = app.font()
-    font.setPointSize(14)
-    app.setFont(font)
-
     # Lấy và sanitize input paths
-    local_paths = santize_input_paths(local_paths)
+    with startup_timeline.phase("santize_input_paths"):
+        local_paths = santize_input_paths(local_paths)
+
+    # Single instance: app đã chạy -> chuyển paths cho cửa sổ đó rồi thoát luôn
+    if forward_paths_to_running_instance(local_paths):
+        print(">>> Forwarded paths to the running instance")
+        return
+
+    # Đăng ký icon/font nhúng (qrc) ngay trước khi dựng UI; import main để dùng
+    # lại hàm/class (VD: launcher, script) không phải nạp khối dữ liệu này
+    with startup_timeline.phase("resources_rc"):
+        from . import resources_rc  # noqa: F401
+
+    with startup_timeline.phase("init_rclone_config_path"):
+        RCloneConfigManager.init_rclone_config_path()
+
+    with startup_timeline.phase("QApplication"):
+        app = QApplication(sys.argv)
+        font = app.font()
+        font.setPointSize(14)
+        app.setFont(font)
+
+    # Nghe paths từ các lần mở app sau (trước khi dựng UI để không lỡ lần gọi nào)
+    with startup_timeline.phase("single_instance_server"):
+        from .workers.single_instance_server import SingleInstanceServer
+
+        instance_server = SingleInstanceServer(app)
+        is_server_started = instance_server.start()
+
+    if not is_server_started and instance_server.is_other_instance_running:
+        # App khác vừa chiếm server (chạy đua) hoặc lần gửi trước bị timeout vì app
+        # đó đang bận -> gửi lại paths cho app đó thay vì chiếm server của nó
+        for _ in range(FORWARD_PATHS_RETRIES):
+            if forward_paths_to_running_instance(local_paths):
+                print(">>> Forwarded paths to the running instance")
+                return
+        print(
+            ">>> Warning: running instance did not respond, "
+            "opening a separate window without single instance server"
+        )
 
     window = MainWindow(local_paths)
+    instance_server.paths_received.connect(window._on_paths_forwarded)
     window.show()
     sys.exit(app.exec())
@@ -1,14 +1,22 @@
 from PySide6.QtWidgets import (
     QVBoxLayout,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QHBoxLayout,
-    QProgressBar,
-    QFrame,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
     QWidget,
 )
-from PySide6.QtCore import Qt, Signal, QSize
-from PySide6.QtGui import QCloseEvent
+from PySide6.QtCore import (
+    Qt,
+    Signal,
+    QSize,
+    QRect,
+    QRectF,
+    QAbstractListModel,
+    QModelIndex,
+    QTimer,
+)
+from PySide6.QtGui import QCloseEvent, QPainter, QColor, QFont
 from .utils.helpers import get_svg_as_icon
 from .configs.configs import ThemeColors
 from .workers.sync_worker import SyncProgressData
@@ -17,106 +25,235 @@ from .components.button import CustomButton
 from .mixins.keyboard_shortcuts import KeyboardShortcutsDialogMixin
 from .components.overlay import PositionedOverlay
 
+# Chiều cao mỗi dòng trong danh sách
+ROW_HEIGHT = 50
+# Số dòng đã xong vẫn được giữ trong danh sách; các dòng xong cũ hơn được thu gọn
+# vào bộ đếm ở header -> bộ nhớ không tăng theo số file đồng bộ
+MAX_FINISHED_ROWS = 200
+# Chỉ thu gọn khi dư ít nhất chừng này dòng (tránh xoá từng dòng một)
+PRUNE_BATCH_SIZE = 100
+
+
+class SyncProgressRow:
+    """Dữ liệu 1 dòng: tên file + % tiến độ."""
+
+    __slots__ = ("file_name", "percent", "is_finished")
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.percent: float = 0
+        self.is_finished: bool = False
+
 
-class SyncProgressItem(QFrame):
+class SyncProgressModel(QAbstractListModel):
     """
-    Widget con đại diện cho 1 dòng trong danh sách.
-    Gồm: Icon status | Tên file | Progress Bar | % text
+    Model danh sách file đang đồng bộ.
+    Chỉ giữ các dòng đang chạy + tối đa MAX_FINISHED_ROWS dòng đã xong gần nhất,
+    các dòng xong cũ hơn chỉ còn lại tên file (đếm trong archived_count).
     """
 
-    def __init__(self, file_name: str, parent=None):
-        super().__init__(parent)
-        self._setup_ui(file_name)
-
-    def _setup_ui(self, file_name):
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(6, 6, 6, 6)
-        layout.setSpacing(10)
-
-        # 1. Status Icon (Dùng Label để hiện text unicode hoặc icon)
-        self.label_icon = CustomLabel(font_size=14, is_bold=True)
-        self.label_icon.setFixedSize(24, 24)
-        self.label_icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        # Mặc định là icon loading (hoặc dấu chấm tròn)
-        self.label_icon.setStyleSheet(
-            f"""
-            CustomLabel {{
-                border-radius: 12px;
-            }}
-        """
-        )
-        self.label_icon.setPixmap(
-            get_svg_as_icon("info_icon", 22, "#555555", "#ffffff", 3)
-        )
-        layout.addWidget(self.label_icon)
-
-        # 2. Thông tin file (Tên + Progress Bar)
-        info_layout = QVBoxLayout()
-        info_layout.setSpacing(2)
+    PERCENT_ROLE = Qt.ItemDataRole.UserRole + 1
+    FINISHED_ROLE = Qt.ItemDataRole.UserRole + 2
 
-        self.label_name = CustomLabel(file_name, is_bold=False, font_size=14)
+    # Phát khi số dòng đang chạy / đã xong thay đổi
+    counts_changed = Signal()
 
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setRange(0, 100)
-        self.progress_bar.setValue(0)
-        self.progress_bar.setFixedHeight(6)  # Thanh nhỏ gọn
-        self.progress_bar.setTextVisible(False)  # Ẩn text trên thanh
-        self.progress_bar.setStyleSheet(
-            f"""
-            QProgressBar {{
-                border: none;
-                background-color: #444;
-                border-radius: 3px;
-            }}
-            QProgressBar::chunk {{
-                background-color: {ThemeColors.MAIN}; 
-                border-radius: 3px;
-            }}
-        """
-        )
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+        self._rows: list[SyncProgressRow] = []
+        self._row_by_name: dict[str, int] = {}
+        self._finished_rows_count: int = 0
+        # Tên các file đã xong và bị thu gọn khỏi danh sách: rclone có thể in lại
+        # dòng 100% của file đó, không được thêm lại thành dòng mới / đếm xong 2 lần
+        self._archived_names: set[str] = set()
+
+    @property
+    def finished_count(self) -> int:
+        return self._finished_rows_count + len(self._archived_names)
+
+    @property
+    def archived_count(self) -> int:
+        return len(self._archived_names)
+
+    @property
+    def active_count(self) -> int:
+        return len(self._rows) - self._finished_rows_count
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return row.file_name
+        if role == self.PERCENT_ROLE:
+            return row.percent
+        if role == self.FINISHED_ROLE:
+            return row.is_finished
+        return None
+
+    def update_progress(self, file_name: str, percent: float) -> bool:
+        """Cập nhật tiến độ 1 file. Trả về True nếu vừa thêm dòng mới."""
+        if file_name in self._archived_names:
+            return False
+        row_index = self._row_by_name.get(file_name)
+        is_new_row = row_index is None
+        if row_index is None:
+            row_index = len(self._rows)
+            self.beginInsertRows(QModelIndex(), row_index, row_index)
+            self._rows.append(SyncProgressRow(file_name))
+            self._row_by_name[file_name] = row_index
+            self.endInsertRows()
+
+        row = self._rows[row_index]
+        if row.is_finished:
+            return is_new_row
+        row.percent = min(percent, 100)
+        if percent >= 100:
+            row.is_finished = True
+            self._finished_rows_count += 1
+        index = self.index(row_index)
+        self.dataChanged.emit(index, index)
+
+        if row.is_finished:
+            self._prune_finished_rows()
+        if is_new_row or row.is_finished:
+            self.counts_changed.emit()
+        return is_new_row
+
+    def _prune_finished_rows(self) -> None:
+        excess = self._finished_rows_count - MAX_FINISHED_ROWS
+        if excess < PRUNE_BATCH_SIZE:
+            return
 
-        info_layout.addWidget(self.label_name)
-        info_layout.addWidget(self.progress_bar)
-        layout.addLayout(info_layout)
+        # Các dòng đã xong cũ nhất (index nhỏ nhất)
+        rows_to_remove: list[int] = []
+        for row_index, row in enumerate(self._rows):
+            if row.is_finished:
+                rows_to_remove.append(row_index)
+                if len(rows_to_remove) == excess:
+                    break
+
+        # Gom thành các đoạn liên tiếp, xoá từ cuối lên để index không bị lệch
+        ranges: list[tuple[int, int]] = []
+        for row_index in rows_to_remove:
+            if ranges and ranges[-1][1] == row_index - 1:
+                ranges[-1] = (ranges[-1][0], row_index)
+            else:
+                ranges.append((row_index, row_index))
+        for first, last in reversed(ranges):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            self._archived_names.update(
+                row.file_name for row in self._rows[first : last + 1]
+            )
+            del self._rows[first : last + 1]
+            self.endRemoveRows()
+
+        self._finished_rows_count -= len(rows_to_remove)
+        self._row_by_name = {row.file_name: i for i, row in enumerate(self._rows)}
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._rows.clear()
+        self._row_by_name.clear()
+        self._finished_rows_count = 0
+        self._archived_names.clear()
+        self.endResetModel()
+        self.counts_changed.emit()
+
+
+class SyncProgressDelegate(QStyledItemDelegate):
+    """
+    Vẽ 1 dòng trực tiếp từ model (không tạo widget cho từng file):
+    Icon status | Tên file + Progress Bar | % text
+    """
 
-        # 3. Phần trăm text (bên phải cùng)
-        self.label_percent = CustomLabel("0%", is_bold=True)
-        self.label_percent.setFixedWidth(50)
-        self.label_percent.setAlignment(
-            Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+        # Icon dùng chung cho mọi dòng, chỉ render 1 lần
+        self._pending_icon = get_svg_as_icon("info_icon", 22, "#555555", "#ffffff", 3)
+        self._finished_icon = get_svg_as_icon(
+            "check_icon", 14, ThemeColors.SUCCESS, "#ffffff", 3
+        )
+        self._name_font = QFont()
+        self._name_font.setPointSize(14)
+        self._percent_font = QFont()
+        self._percent_font.setBold(True)
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(0, ROW_HEIGHT)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index):
+        file_name = index.data(Qt.ItemDataRole.DisplayRole) or ""
+        percent = index.data(SyncProgressModel.PERCENT_ROLE) or 0
+        is_finished = bool(index.data(SyncProgressModel.FINISHED_ROLE))
+
+        # Khung nội dung: margins 6px như layout của dòng cũ
+        rect = option.rect.adjusted(6, 6, -6, -6)
+        spacing = 10
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+
+        # 1. Status icon (24x24, căn giữa theo chiều dọc)
+        icon_rect = QRect(rect.left(), rect.center().y() - 12, 24, 24)
+        if is_finished:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(ThemeColors.SUCCESS))
+            painter.drawEllipse(icon_rect)
+            icon = self._finished_icon
+        else:
+            icon = self._pending_icon
+        painter.drawPixmap(
+            icon_rect.center().x() - icon.width() // 2 + 1,
+            icon_rect.center().y() - icon.height() // 2 + 1,
+            icon,
         )
-        self.label_percent.setStyleSheet("color: #aaa;")
-        layout.addWidget(self.label_percent)
 
-    def update_progress(self, percent: float):
-        """Cập nhật tiến độ"""
-        self.progress_bar.setValue(int(percent))
-        self.label_percent.setText(f"{percent}%")
+        # 3. Phần trăm text (bên phải cùng, rộng 50px)
+        percent_rect = QRect(rect.right() - 50, rect.top(), 50, rect.height())
+        painter.setFont(self._percent_font)
+        painter.setPen(QColor(ThemeColors.SUCCESS if is_finished else "#aaa"))
+        painter.drawText(
+            percent_rect,
+            Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+            "Xong" if is_finished else f"{int(percent)}%",
+        )
 
-        if percent >= 100:
-            self.set_finished()
-
-    def set_finished(self):
-        """Chuyển sang trạng thái hoàn thành (Tick xanh)"""
-        self.progress_bar.setValue(100)
-        self.label_percent.setText("Xong")
-        self.label_percent.setStyleSheet(
-            f"color: {ThemeColors.SUCCESS};"
-        )  # Màu xanh lá
-
-        # Đổi icon thành dấu tích V
-        self.label_icon.setPixmap(
-            get_svg_as_icon("check_icon", 14, ThemeColors.SUCCESS, "#ffffff", 3)
+        # 2. Tên file + Progress Bar ở giữa
+        info_left = icon_rect.right() + spacing
+        info_width = percent_rect.left() - spacing - info_left
+        bar_height = 6
+        name_rect = QRect(
+            info_left, rect.top(), info_width, rect.height() - bar_height - 2
         )
-        self.label_icon.setStyleSheet(
-            f"""
-            CustomLabel {{
-                background-color: {ThemeColors.SUCCESS}; 
-                border-radius: 12px;
-            }}
-        """
+        painter.setFont(self._name_font)
+        painter.setPen(QColor("white"))
+        elided_name = painter.fontMetrics().elidedText(
+            file_name, Qt.TextElideMode.ElideMiddle, name_rect.width()
+        )
+        painter.drawText(
+            name_rect,
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            elided_name,
         )
 
+        bar_rect = QRectF(info_left, rect.bottom() - bar_height, info_width, bar_height)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("#444"))
+        painter.drawRoundedRect(bar_rect, 3, 3)
+        chunk_width = bar_rect.width() * (100 if is_finished else percent) / 100
+        if chunk_width > 0:
+            painter.setBrush(QColor(ThemeColors.MAIN))
+            painter.drawRoundedRect(
+                QRectF(bar_rect.left(), bar_rect.top(), chunk_width, bar_height), 3, 3
+            )
+
+        painter.restore()
+
 
 class SyncProgressDialog(KeyboardShortcutsDialogMixin):
     cancel_requested = Signal()
@@ -126,10 +263,6 @@ class SyncProgressDialog(KeyboardShortcutsDialogMixin):
         self.setWindowTitle("Danh sách đồng bộ")
         self.resize(500, 400)
 
-        # Dictionary để map tên file -> Widget dòng tương ứng
-        # Key: file_name, Value: SyncProgressItem
-        self._items_map: dict[str, SyncProgressItem] = {}
-
         self._setup_ui()
         self._apply_styles()
 
@@ -149,21 +282,37 @@ class SyncProgressDialog(KeyboardShortcutsDialogMixin):
             "Tiến trình chi tiết", font_size=14, is_bold=True
         )
         header_layout.addWidget(self.label_title)
+        header_layout.addStretch()
+        # Tóm tắt số file đang chạy / đã xong (kể cả các dòng đã thu gọn)
+        self.label_summary = CustomLabel(font_size=11)
+        self.label_summary.setStyleSheet("color: #aaa;")
+        header_layout.addWidget(self.label_summary)
         layout.addLayout(header_layout)
 
-        # List Widget (Container chứa các dòng)
-        self.list_widget = QListWidget()
-        self.list_widget.setContentsMargins(0, 0, 6, 0)
-        self.list_widget.setSelectionMode(
-            QListWidget.SelectionMode.NoSelection
+        # List View (ảo hoá: chỉ vẽ các dòng đang hiển thị)
+        self._model = SyncProgressModel(self)
+        self._model.counts_changed.connect(self._update_summary)
+        self.list_view = QListView()
+        self.list_view.setModel(self._model)
+        self.list_view.setItemDelegate(SyncProgressDelegate(self.list_view))
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setContentsMargins(0, 0, 6, 0)
+        self.list_view.setSelectionMode(
+            QListView.SelectionMode.NoSelection
         )  # Không cho user chọn dòng
-        self.list_widget.setVerticalScrollMode(QListWidget.ScrollMode.ScrollPerPixel)
-        layout.addWidget(self.list_widget)
+        self.list_view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        layout.addWidget(self.list_view)
+
+        # Gom nhiều dòng mới liên tiếp -> chỉ cuộn xuống cuối 1 lần
+        self._scroll_to_bottom_timer = QTimer(self)
+        self._scroll_to_bottom_timer.setSingleShot(True)
+        self._scroll_to_bottom_timer.setInterval(0)
+        self._scroll_to_bottom_timer.timeout.connect(self.list_view.scrollToBottom)
 
         empty_text = CustomLabel("Bắt đầu đồng bộ...", font_size=14)
         empty_text.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.empty_text_overlay = PositionedOverlay(
-            self.list_widget.viewport(), empty_text
+            self.list_view.viewport(), empty_text
         )
 
         # Footer Button
@@ -184,7 +333,7 @@ class SyncProgressDialog(KeyboardShortcutsDialogMixin):
                 background-color: {ThemeColors.GRAY_BACKGROUND};
                 color: white;
             }}
-            QListWidget {{
+            QListView {{
                 background-color: #2b2b2b;
                 border: 1px solid #3d3d3d;
                 border-radius: 6px;
@@ -208,33 +357,25 @@ class SyncProgressDialog(KeyboardShortcutsDialogMixin):
         if file_name in ["Starting...", "Calculating...", "Finished"]:
             return
 
-        # Kiểm tra xem file này đã có trong list chưa
-        if file_name not in self._items_map:
-            self._add_new_row(file_name)
-
-        # Lấy widget ra và update
-        progress_item = self._items_map[file_name]
-        progress_item.update_progress(percent)
-
-    def _add_new_row(self, file_name: str):
-        # 1. Tạo Custom Widget
-        item_widget = SyncProgressItem(file_name)
-
-        # 2. Tạo QListWidgetItem (Container trong list)
-        list_item = QListWidgetItem(self.list_widget)
-        # Set size hint để list biết chiều cao của dòng (quan trọng)
-        list_item.setSizeHint(QSize(0, 50))
-
-        # 3. Gắn widget vào item
-        self.list_widget.setItemWidget(list_item, item_widget)
+        if self._model.update_progress(file_name, percent):
+            # Dòng mới -> auto scroll xuống dưới cùng
+            if not self._scroll_to_bottom_timer.isActive():
+                self._scroll_to_bottom_timer.start()
+            self.hide_overlay()
 
-        # 4. Lưu vào map để lần sau tìm lại update tiếp
-        self._items_map[file_name] = item_widget
-
-        # 5. Auto scroll xuống dưới cùng
-        self.list_widget.scrollToBottom()
-
-        self.hide_overlay()
+    def _update_summary(self):
+        model = self._model
+        if not model.rowCount() and not model.archived_count:
+            self.label_summary.setText("")
+            return
+        self.label_summary.setText(
+            f"Đang chạy: {model.active_count} · Xong: {model.finished_count}"
+        )
+        self.label_summary.setToolTip(
+            f"{model.archived_count} file xong từ trước đã được thu gọn khỏi danh sách"
+            if model.archived_count
+            else ""
+        )
 
     def hide_overlay(self):
         """Ẩn overlay thông báo trống nếu nó đang hiện"""
@@ -255,8 +396,7 @@ class SyncProgressDialog(KeyboardShortcutsDialogMixin):
         Xoá hết các dòng.
         Enable nút hủy.
         """
-        self.list_widget.clear()
-        self._items_map.clear()
+        self._model.clear()
         self.btn_cancel.setText("Hủy đồng bộ")
         self.btn_cancel.setEnabled(True)
         self.show_overlay()
@@ -1,4 +1,114 @@
+import time
+
+# Mốc bắt đầu khởi động: module này được import đầu tiên trong main.py
+_STARTUP_BEGIN = time.perf_counter()
+
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
 from PySide6.QtCore import QElapsedTimer
+from PySide6.QtWidgets import QApplication
+from ..utils.helpers import app_data_dir, svg_pixmap_cache_info
+
+# Ngân sách thời gian từ lúc import main tới khi MainWindow hiện lần đầu
+STARTUP_BUDGET_MS = 400
+# Đặt biến môi trường này = "1" để app tự thoát sau khi ghi xong timeline
+# (dùng bởi scripts/bench_startup.py)
+STARTUP_BENCH_ENV = "SYNRIVE_STARTUP_BENCH"
+# File timeline quá lớn thì chỉ giữ lại các lần khởi động gần nhất
+STARTUP_TIMELINE_MAX_BYTES = 512 * 1024
+STARTUP_TIMELINE_KEEP_LINES = 500
+
+
+def startup_elapsed_ms() -> float:
+    return (time.perf_counter() - _STARTUP_BEGIN) * 1000
+
+
+def startup_timeline_path() -> Path:
+    # %AppData%/SynRive/logs/startup_timeline.jsonl
+    return app_data_dir() / "logs" / "startup_timeline.jsonl"
+
+
+class StartupTimeline:
+    """
+    Ghi lại các giai đoạn khởi động app (mốc thời gian monotonic, tính bằng ms
+    kể từ lúc bắt đầu import main.py) rồi ghi 1 dòng JSON / lần khởi động.
+    """
+
+    def __init__(self, begin: float):
+        self._begin = begin
+        self._phases: list[dict] = []
+        self._is_flushed: bool = False
+
+    @property
+    def is_flushed(self) -> bool:
+        return self._is_flushed
+
+    def _to_ms(self, timestamp: float) -> float:
+        return round((timestamp - self._begin) * 1000, 2)
+
+    def record(self, name: str, start: float, end: float) -> None:
+        """Ghi 1 giai đoạn với mốc time.perf_counter() bắt đầu/kết thúc."""
+        if self._is_flushed:
+            return
+        self._phases.append(
+            {"name": name, "start_ms": self._to_ms(start), "end_ms": self._to_ms(end)}
+        )
+
+    def record_since_begin(self, name: str) -> None:
+        """Giai đoạn tính từ lúc bắt đầu import main.py tới hiện tại."""
+        self.record(name, self._begin, time.perf_counter())
+
+    def mark(self, name: str) -> None:
+        """Mốc tức thời (VD: first paint), lưu dạng {"name", "at_ms"}."""
+        if self._is_flushed:
+            return
+        self._phases.append({"name": name, "at_ms": self._to_ms(time.perf_counter())})
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def flush(self, extra: dict | None = None) -> dict | None:
+        """
+        Ghi timeline (kèm các field trong extra) ra file JSONL, chỉ 1 lần / process.
+        Trả về record đã ghi.
+        """
+        if self._is_flushed:
+            return None
+        self._is_flushed = True
+
+        record = {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "pid": os.getpid(),
+            "total_ms": self._to_ms(time.perf_counter()),
+            "phases": self._phases,
+            **(extra or {}),
+        }
+        path = startup_timeline_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.exists() and path.stat().st_size > STARTUP_TIMELINE_MAX_BYTES:
+                lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+                path.write_text(
+                    "".join(lines[-STARTUP_TIMELINE_KEEP_LINES:]), encoding="utf-8"
+                )
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f">>> Error writing startup timeline '{path}': {e}")
+        return record
+
+
+# Timeline dùng chung cho cả process
+startup_timeline = StartupTimeline(_STARTUP_BEGIN)
 
 
 class PerformanceTestingMixin:
@@ -6,12 +116,53 @@ class PerformanceTestingMixin:
         self._perf_timer = QElapsedTimer()
         self._perf_timer.start()
         self._measured_time = 0.0
+        self._is_first_paint_marked = False
         super().__init__(*args, **kwargs)  # quan trọng: cho MRO chạy tới QWidget
 
     def showEvent(self, event):
         super().showEvent(event)  # type: ignore
         className = self.__class__.__name__
         measured_time = self._perf_timer.elapsed()
-        if className == "MainWindow":
-            self._measured_time = measured_time
         print(f">>> first show {self.__class__.__name__} after {measured_time} ms")
+        if className == "MainWindow" and not self._measured_time:
+            self._measured_time = measured_time
+            startup_timeline.mark("first_show")
+            startup_ms = startup_elapsed_ms()
+            print(f">>> startup (import main -> first show) {startup_ms:.0f} ms")
+            if startup_ms > STARTUP_BUDGET_MS:
+                print(
+                    f">>> Warning: startup took {startup_ms:.0f} ms, "
+                    f"over budget {STARTUP_BUDGET_MS} ms"
+                )
+
+    def paintEvent(self, event):
+        super().paintEvent(event)  # type: ignore
+        if not self._is_first_paint_marked:
+            self._is_first_paint_marked = True
+            startup_timeline.mark("first_paint")
+
+    def _finish_startup_timeline(self) -> None:
+        """Gọi khi bước khởi động cuối cùng xong: ghi timeline ra file."""
+        # Số icon SVG đã render / lấy từ cache trong lúc khởi động
+        record = startup_timeline.flush(
+            extra={"svg_pixmap_cache": svg_pixmap_cache_info()}
+        )
+        if record is None:
+            return
+        phases = ", ".join(
+            (
+                f"{p['name']}@{p['at_ms']:.0f}"
+                if "at_ms" in p
+                else f"{p['name']}={p['end_ms'] - p['start_ms']:.0f}ms"
+            )
+            for p in record["phases"]
+        )
+        print(f">>> startup timeline: {phases}")
+        svg_cache = record["svg_pixmap_cache"]
+        print(
+            f">>> svg pixmap cache: {svg_cache['hits']} hits,"
+            f" {svg_cache['misses']} misses, {svg_cache['entries']} entries,"
+            f" {svg_cache['bytes'] / 1024:.0f} KB"
+        )
+        if os.getenv(STARTUP_BENCH_ENV) == "1":
+            QApplication.quit()
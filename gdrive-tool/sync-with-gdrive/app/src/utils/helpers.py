@@ -1,5 +1,6 @@
 from __future__ import annotations
 from pathlib import Path
+from collections import OrderedDict
 import os
 import json
 from typing import Iterable, Optional, Any
@@ -9,6 +10,7 @@ from PySide6.QtGui import QPixmap, QPainter
 from PySide6.QtCore import Qt, QRectF, QFile, QIODevice
 import re
 import sys
+import unicodedata
 from PySide6.QtWidgets import QApplication, QWidget
 
 
@@ -117,10 +119,43 @@ def detect_content_type_by_file_extension(file_extension: str) -> str:
     return content_type
 
 
+def detect_path_content_type(path_str: str, path_type: PathType) -> str:
+    """
+    Loại nội dung dùng để chọn icon "<loại>_icon" cho path:
+    không phải file -> "folder", file -> theo đuôi file (xem ở trên).
+    """
+    if path_type != PathType.FILE:
+        return "folder"
+    return detect_content_type_by_file_extension(detect_file_extension(path_str) or "")
+
+
 def extract_filename_with_ext(path: str) -> str:
     return Path(path).name
 
 
+def normalize_search_text(text: str) -> str:
+    """
+    Chuẩn hoá text để tìm kiếm: bỏ dấu tiếng Việt và chuyển về chữ thường.
+    - 'Tài liệu' -> 'tai lieu'
+    - 'Đồ án' -> 'do an'
+    """
+    text = text.replace("đ", "d").replace("Đ", "D")
+    text = unicodedata.normalize("NFD", text)
+    return "".join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def format_bytes(num_bytes: int) -> str:
+    """Định dạng dung lượng dễ đọc (đơn vị 1024). VD: 1536 -> '1.5 KB'."""
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024 or unit == "TB":
+            break
+        size /= 1024
+    if unit == "B":
+        return f"{int(size)} B"
+    return f"{size:.1f} {unit}"
+
+
 def get_json_field_value(
     field_path: str, json_file_path: Path, ensure_json_path_exists: bool = False
 ) -> Any:
@@ -222,6 +257,94 @@ def set_json_field_value(
         return False
 
 
+# Giới hạn bộ nhớ cho cache pixmap của SVG (tính theo byte ảnh ARGB32)
+SVG_PIXMAP_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+SvgPixmapCacheKey = tuple[
+    str,
+    int,
+    str | None,
+    str | None,
+    float | None,
+    tuple[int, int, int, int],
+    float,
+]
+
+
+class _SvgPixmapCache:
+    """
+    LRU cache dùng chung toàn process cho các pixmap render từ SVG.
+    Key gồm mọi tham số ảnh hưởng tới ảnh đầu ra; bị giới hạn theo tổng số byte.
+    """
+
+    def __init__(self, max_bytes: int):
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[SvgPixmapCacheKey, tuple[QPixmap, int]] = (
+            OrderedDict()
+        )
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: SvgPixmapCacheKey) -> QPixmap | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: SvgPixmapCacheKey, pixmap: QPixmap) -> None:
+        cost = pixmap.width() * pixmap.height() * 4
+        if cost > self._max_bytes:
+            return
+        old_entry = self._entries.pop(key, None)
+        if old_entry is not None:
+            self._total_bytes -= old_entry[1]
+        self._entries[key] = (pixmap, cost)
+        self._total_bytes += cost
+        # Bỏ bớt các pixmap lâu không dùng nhất cho tới khi vừa giới hạn
+        while self._total_bytes > self._max_bytes:
+            _, (_, evicted_cost) = self._entries.popitem(last=False)
+            self._total_bytes -= evicted_cost
+
+    def info(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self._max_bytes,
+        }
+
+
+_svg_pixmap_cache = _SvgPixmapCache(SVG_PIXMAP_CACHE_MAX_BYTES)
+
+
+def svg_pixmap_cache_info() -> dict[str, int]:
+    """
+    Thống kê cache pixmap SVG: hits, misses, entries, bytes, max_bytes (được ghi
+    kèm startup timeline).
+    """
+    return _svg_pixmap_cache.info()
+
+
+def _normalize_margins(
+    margins: int | tuple[int, int, int, int],
+) -> tuple[int, int, int, int]:
+    if isinstance(margins, int):
+        return margins, margins, margins, margins
+    if isinstance(margins, (tuple, list)) and len(margins) == 4:
+        return tuple(margins)  # type: ignore[return-value]
+    return 0, 0, 0, 0
+
+
+def _primary_screen_device_pixel_ratio() -> float:
+    screen = QApplication.primaryScreen()
+    return screen.devicePixelRatio() if screen else 1.0
+
+
 def svg_to_pixmap(
     svg_path: str,
     size: int,
@@ -229,9 +352,11 @@ def svg_to_pixmap(
     stroke_color: str | None = None,
     stroke_width: float | None = None,
     margins: int | tuple[int, int, int, int] = 0,  # <--- Tham số mới
+    device_pixel_ratio: float | None = None,
 ) -> QPixmap:
     """
     Chuyển đổi SVG thành QPixmap với tùy chọn đổi màu và thêm margin.
+    Kết quả được memoize trong LRU cache dùng chung (xem svg_pixmap_cache_info).
 
     Args:
         svg_path: Đường dẫn file SVG.
@@ -241,10 +366,53 @@ def svg_to_pixmap(
         margins: Khoảng cách bao quanh.
                  Nhập int (VD: 5) để áp dụng 4 phía.
                  Nhập tuple (left, top, right, bottom) (VD: (0, 0, 8, 0)).
+        device_pixel_ratio: Tỉ lệ pixel của màn hình (VD: 2.0 cho HiDPI), nên truyền
+                 widget.devicePixelRatioF(). Không truyền thì lấy theo màn hình chính.
     """
+    if not device_pixel_ratio:
+        device_pixel_ratio = _primary_screen_device_pixel_ratio()
+    svg_path = _normalize_qrc_path(svg_path)
+    normalized_margins = _normalize_margins(margins)
+    key: SvgPixmapCacheKey = (
+        svg_path,
+        size,
+        fill_color,
+        stroke_color,
+        stroke_width,
+        normalized_margins,
+        device_pixel_ratio,
+    )
 
+    cached = _svg_pixmap_cache.get(key)
+    if cached is None:
+        cached = _render_svg_to_pixmap(
+            svg_path,
+            size,
+            fill_color,
+            stroke_color,
+            stroke_width,
+            normalized_margins,
+            device_pixel_ratio,
+        )
+        if cached.isNull():
+            return cached  # Không cache lỗi đọc file
+        _svg_pixmap_cache.put(key, cached)
+
+    # Trả về bản copy (QPixmap chia sẻ dữ liệu ngầm, copy rất rẻ) để nơi gọi
+    # có vẽ/đổi pixmap cũng không làm hỏng bản trong cache
+    return QPixmap(cached)
+
+
+def _render_svg_to_pixmap(
+    svg_path: str,
+    size: int,
+    fill_color: str | None,
+    stroke_color: str | None,
+    stroke_width: float | None,
+    margins: tuple[int, int, int, int],
+    device_pixel_ratio: float,
+) -> QPixmap:
     # 1. Đọc và xử lý nội dung SVG (giữ nguyên logic của bạn)
-    svg_path = _normalize_qrc_path(svg_path)
     svg_content = ""
     if svg_path.startswith(":/"):
         qfile = QFile(svg_path)
@@ -300,12 +468,7 @@ def svg_to_pixmap(
             )
 
     # 2. Xử lý logic Margin
-    if isinstance(margins, int):
-        left = top = right = bottom = margins
-    elif isinstance(margins, (tuple, list)) and len(margins) == 4:
-        left, top, right, bottom = margins
-    else:
-        left = top = right = bottom = 0
+    left, top, right, bottom = margins
 
     # Tính toán kích thước tổng thể của QPixmap (Icon + Margins)
     total_width = size + left + right
@@ -314,8 +477,13 @@ def svg_to_pixmap(
     # 3. Render
     renderer = QSvgRenderer(svg_content.encode("utf-8"))
 
-    # Tạo Pixmap với kích thước tổng
-    pixmap = QPixmap(total_width, total_height)
+    # Tạo Pixmap với kích thước tổng (nhân theo device pixel ratio,
+    # painter vẫn vẽ theo toạ độ logic)
+    pixmap = QPixmap(
+        round(total_width * device_pixel_ratio),
+        round(total_height * device_pixel_ratio),
+    )
+    pixmap.setDevicePixelRatio(device_pixel_ratio)
     pixmap.fill(Qt.GlobalColor.transparent)  # Nền trong suốt
 
     painter = QPainter(pixmap)
@@ -344,8 +512,9 @@ def get_svg_as_icon(
     stroke_color: str | None = None,
     stroke_width: float | None = None,
     margins: int | tuple[int, int, int, int] = 0,
+    device_pixel_ratio: float | None = None,
 ) -> QPixmap:
-    """Lấy QPixmap từ file SVG trong thư mục assets."""
+    """Lấy QPixmap từ file SVG trong thư mục assets (có cache, xem svg_to_pixmap)."""
     return svg_to_pixmap(
         get_svg_file_path(svg_name)[0],
         size,
@@ -353,6 +522,7 @@ def get_svg_as_icon(
         stroke_color,
         stroke_width,
         margins,
+        device_pixel_ratio,
     )
 
 
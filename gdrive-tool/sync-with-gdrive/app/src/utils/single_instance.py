@@ -0,0 +1,139 @@
+"""
+Giao tiếp "single instance" giữa launcher và cửa sổ app đang chạy.
+
+Module này KHÔNG import PySide6 để launcher (run_app_multi.py, context menu) chạy
+và thoát trong vài ms. Phía server (QLocalServer) nằm ở
+workers/single_instance_server.py và dùng chung tên server + định dạng message.
+
+Message: 4 byte độ dài (big-endian) + JSON UTF-8 {"paths": [...]}.
+Server trả về 1 byte ACK sau khi đã nhận đủ message.
+"""
+
+import getpass
+import json
+import os
+import re
+import socket
+import struct
+import tempfile
+import threading
+import time
+
+ACK_BYTE = b"\x01"
+HEADER = struct.Struct(">I")
+# Giới hạn kích thước 1 message (tránh đọc dữ liệu rác vô hạn)
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+# Thời gian tối đa chờ app đang chạy xác nhận đã nhận paths
+FORWARD_TIMEOUT_SECONDS = 2.0
+# Windows: pipe đang bận (mọi instance đều đang phục vụ client khác) -> thử lại
+_PIPE_BUSY_RETRIES = 20
+_PIPE_BUSY_SLEEP_SECONDS = 0.01
+
+
+def single_instance_server_name() -> str:
+    """
+    Tên truyền cho QLocalServer.listen():
+    - Windows: tên named pipe (Qt tự thêm tiền tố \\\\.\\pipe\\)
+    - Unix: đường dẫn đầy đủ tới file socket trong thư mục temp
+    """
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "user"
+    name = "SynRive-" + re.sub(r"[^\w\-.]", "_", user)
+    if os.name == "nt":
+        return name
+    return os.path.join(tempfile.gettempdir(), f"{name}.sock")
+
+
+def encode_message(payload: dict) -> bytes:
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return HEADER.pack(len(data)) + data
+
+
+def decode_message(buffer: bytes) -> tuple[dict | None, int]:
+    """
+    Tách 1 message từ đầu buffer.
+    Trả về (payload, số byte đã dùng); (None, 0) nếu chưa đủ dữ liệu.
+    Raise ValueError nếu message không hợp lệ.
+    """
+    if len(buffer) < HEADER.size:
+        return None, 0
+    (length,) = HEADER.unpack_from(buffer)
+    if length > MAX_MESSAGE_BYTES:
+        raise ValueError(f"Message quá lớn: {length} bytes")
+    end = HEADER.size + length
+    if len(buffer) < end:
+        return None, 0
+    payload = json.loads(buffer[HEADER.size : end].decode("utf-8"))
+    if not isinstance(payload, dict):
+        raise ValueError("Message không phải JSON object")
+    return payload, end
+
+
+def _send_via_unix_socket(address: str, message: bytes, timeout: float) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(address)
+        s.sendall(message)
+        return s.recv(1) == ACK_BYTE
+
+
+def _send_via_named_pipe(name: str, message: bytes, timeout: float) -> bool:
+    # Đọc/ghi named pipe không có timeout -> chạy trong thread rồi join có hạn
+    pipe_path = "\\\\.\\pipe\\" + name
+    result = {"ok": False}
+
+    def worker():
+        for _ in range(_PIPE_BUSY_RETRIES):
+            try:
+                pipe = open(pipe_path, "r+b", buffering=0)
+                break
+            except FileNotFoundError:
+                return  # Không có app nào đang chạy
+            except OSError:
+                time.sleep(_PIPE_BUSY_SLEEP_SECONDS)  # ERROR_PIPE_BUSY
+        else:
+            return
+        with pipe:
+            pipe.write(message)
+            result["ok"] = pipe.read(1) == ACK_BYTE
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return result["ok"]
+
+
+def _allow_running_app_to_focus() -> None:
+    """Windows chặn app nền tự đưa cửa sổ lên trước -> launcher cấp quyền cho nó."""
+    if os.name != "nt":
+        return
+    try:
+        import ctypes
+
+        ASFW_ANY = -1
+        ctypes.windll.user32.AllowSetForegroundWindow(ASFW_ANY)
+    except Exception:
+        pass
+
+
+def forward_paths_to_running_instance(
+    paths: list[str], timeout: float = FORWARD_TIMEOUT_SECONDS
+) -> bool:
+    """
+    Gửi paths cho cửa sổ app đang chạy.
+    Trả về True nếu app đã nhận (launcher có thể thoát ngay), False nếu chưa có
+    app nào chạy hoặc app không phản hồi kịp.
+    """
+    message = encode_message({"paths": list(paths)})
+    name = single_instance_server_name()
+    _allow_running_app_to_focus()
+    try:
+        if os.name == "nt":
+            return _send_via_named_pipe(name, message, timeout)
+        if not os.path.exists(name):
+            return False
+        return _send_via_unix_socket(name, message, timeout)
+    except OSError:
+        return False
@@ -0,0 +1,192 @@
+import os
+import subprocess
+import threading
+import time
+from PySide6.QtCore import QObject, QThread, Slot
+
+# Orphan chạy lâu hơn ngưỡng này sau khi bị huỷ -> in cảnh báo (có thể bị treo)
+ORPHAN_SLOW_FINISH_MS = 500
+
+
+def kill_process(process: subprocess.Popen) -> None:
+    """Kill ngay process con nếu còn chạy (không chờ nó tự thoát)."""
+    if process.poll() is not None:
+        return
+    try:
+        process.kill()
+    except OSError:
+        pass  # Process vừa thoát giữa poll() và kill()
+
+
+class CancellationToken:
+    """
+    Token huỷ dùng chung giữa GUI thread và worker thread.
+    Worker gắn process con (rclone) vào token -> cancel() kill process ngay lập tức,
+    lời gọi communicate() đang chặn trong worker sẽ trả về luôn.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._is_cancelled: bool = False
+        self._process: subprocess.Popen | None = None
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._is_cancelled
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._is_cancelled:
+                return
+            self._is_cancelled = True
+            process = self._process
+        if process is not None:
+            kill_process(process)
+
+    def attach_process(self, process: subprocess.Popen) -> bool:
+        """Gắn process vào token. Trả về False (và kill process) nếu đã bị huỷ."""
+        with self._lock:
+            if not self._is_cancelled:
+                self._process = process
+                return True
+        kill_process(process)
+        return False
+
+    def detach_process(self) -> None:
+        with self._lock:
+            self._process = None
+
+
+class CancellableWorker(QThread):
+    """
+    QThread có thể huỷ giữa chừng. Lớp con kiểm tra self.is_cancelled trong run()
+    và gắn process con vào self._token để cancel() kill được process.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._token = CancellationToken()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._token.is_cancelled
+
+    def cancel(self) -> None:
+        self._token.cancel()
+        self.requestInterruption()
+
+    def run_process(
+        self, cmd: list[str], timeout: float
+    ) -> subprocess.CompletedProcess | None:
+        """
+        Chạy process con (ẩn console trên Windows) và chờ kết quả.
+        Trả về None nếu worker bị huỷ; hết timeout thì kill process và raise
+        subprocess.TimeoutExpired.
+        """
+        # [OPTIMIZED] Cấu hình ẩn console window triệt để trên Windows
+        startupinfo = None
+        if os.name == "nt":
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
+        # Dùng Popen (thay vì subprocess.run) để token kill được process giữa chừng
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            creationflags=(subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0),
+            startupinfo=startupinfo,
+        )
+        if not self._token.attach_process(process):
+            return None  # Đã bị huỷ trước khi process kịp chạy
+
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except BaseException:
+            kill_process(process)
+            process.communicate()
+            raise
+        finally:
+            self._token.detach_process()
+
+        if self.is_cancelled:
+            return None
+        return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+
+class _OrphanedWorkers(QObject):
+    """
+    Giữ ref tới các worker đã bị chủ (dialog) bỏ lại cho tới khi thread thật sự
+    kết thúc, để QThread không bị huỷ khi đang chạy và dialog đóng được ngay.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._workers: dict[int, tuple[QThread, float]] = {}
+        self._total_released: int = 0
+        self._peak_count: int = 0
+
+    def adopt(self, worker: QThread) -> None:
+        key = id(worker)
+        if key in self._workers or not worker.isRunning():
+            return
+        self._workers[key] = (worker, time.monotonic())
+        self._total_released += 1
+        self._peak_count = max(self._peak_count, len(self._workers))
+        worker.finished.connect(self._on_worker_finished)
+        # Thread có thể đã xong trước khi kịp connect -> không chờ signal nữa
+        if worker.isFinished():
+            self._discard(worker)
+
+    def info(self) -> dict[str, int]:
+        return {
+            "alive": len(self._workers),
+            "peak": self._peak_count,
+            "total_released": self._total_released,
+        }
+
+    @Slot()
+    def _on_worker_finished(self):
+        worker = self.sender()
+        if isinstance(worker, QThread):
+            self._discard(worker)
+
+    def _discard(self, worker: QThread) -> None:
+        entry = self._workers.pop(id(worker), None)
+        if entry is None:
+            return
+        # finished được phát ngay trước khi thread thoát -> wait() trả về tức thì
+        worker.wait()
+        elapsed_ms = (time.monotonic() - entry[1]) * 1000
+        if elapsed_ms > ORPHAN_SLOW_FINISH_MS:
+            print(
+                f">>> Warning: orphaned worker {type(worker).__name__} "
+                f"took {elapsed_ms:.0f}ms to finish after cancel"
+            )
+
+
+_orphaned_workers: _OrphanedWorkers | None = None
+
+
+def release_worker(worker: QThread) -> None:
+    """
+    Huỷ worker và trả nó cho tracker chung (gọi từ GUI thread).
+    Chủ của worker có thể bỏ ref ngay, không cần wait().
+    """
+    global _orphaned_workers
+    if isinstance(worker, CancellableWorker):
+        worker.cancel()
+    else:
+        worker.requestInterruption()
+    if _orphaned_workers is None:
+        _orphaned_workers = _OrphanedWorkers()
+    _orphaned_workers.adopt(worker)
+
+
+def orphaned_workers_info() -> dict[str, int]:
+    """Thống kê worker mồ côi: đang sống, đỉnh, tổng số đã được release."""
+    if _orphaned_workers is None:
+        return {"alive": 0, "peak": 0, "total_released": 0}
+    return _orphaned_workers.info()
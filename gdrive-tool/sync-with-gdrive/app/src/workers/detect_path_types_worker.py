@@ -0,0 +1,41 @@
+from PySide6.QtCore import Signal
+from concurrent.futures import ThreadPoolExecutor
+from ..configs.configs import PathType
+from ..utils.helpers import detect_path_content_type, detect_path_type
+from .cancellable_worker import CancellableWorker
+
+# Số path xử lý (và gửi về UI) mỗi lần
+DETECT_BATCH_SIZE = 256
+# Số thread stat song song: ổ mạng / ổ chậm mỗi lần stat có thể mất vài chục ms
+DETECT_MAX_THREADS = 8
+
+
+def _detect_path_info(path: str) -> tuple[str, PathType, str]:
+    path_type = detect_path_type(path)
+    return path, path_type, detect_path_content_type(path, path_type)
+
+
+class DetectPathTypesWorker(CancellableWorker):
+    """
+    Worker chạy ngầm để phân loại hàng loạt path (file / folder / không tồn tại)
+    và icon tương ứng, thay vì stat từng path trên GUI thread.
+    Kết quả được gửi về theo từng lô, giữ đúng thứ tự của danh sách paths.
+    """
+
+    # Signal gửi 1 lô kết quả: [(path, PathType, content_type), ...]
+    batch_ready = Signal(list)
+
+    def __init__(self, paths: list[str]):
+        super().__init__()
+        self.paths = list(paths)
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=DETECT_MAX_THREADS) as executor:
+            for start in range(0, len(self.paths), DETECT_BATCH_SIZE):
+                if self.is_cancelled:
+                    return
+                batch = self.paths[start : start + DETECT_BATCH_SIZE]
+                infos = list(executor.map(_detect_path_info, batch))
+                if self.is_cancelled:
+                    return
+                self.batch_ready.emit(infos)
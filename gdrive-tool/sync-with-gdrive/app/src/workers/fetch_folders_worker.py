@@ -1,69 +1,158 @@
-from PySide6.QtCore import QThread, Signal
-import subprocess
-import os
-from ..data.rclone_configs_manager import RCloneConfigManager
-
-
-class FetchFoldersWorker(QThread):
-    """
-    Worker chạy ngầm để lấy danh sách thư mục từ rclone.
-    Sử dụng: rclone lsf remote:path --dirs-only
-    """
-
-    # Signal gửi dữ liệu về UI: (danh sách folder, thông báo lỗi nếu có)
-    data_ready = Signal(list, str)
-
-    def __init__(self, remote_name: str, gdrive_root_path: str = ""):
-        super().__init__()
-        self.remote_name = remote_name
-        self.gdrive_root_path = gdrive_root_path  # Mặc định là root ("")
-
-    def run(self):
-        rclone_exe = RCloneConfigManager.rclone_executable_path()
-
-        # Đường dẫn remote: VD: "gdrive:Photos/"
-        full_remote_path = f"{self.remote_name}:{self.gdrive_root_path}"
-
-        cmd = [
-            rclone_exe,
-            "lsf",
-            full_remote_path,
-            "--dirs-only",  # Chỉ lấy thư mục
-        ]
-
-        # [OPTIMIZED] Cấu hình ẩn console window triệt để trên Windows
-        startupinfo = None
-        if os.name == "nt":
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
-        try:
-            # Dùng subprocess.run để bắt output gọn gàng
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                creationflags=(subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0),
-                startupinfo=startupinfo,  # [OPTIMIZED] Áp dụng startupinfo
-                timeout=30,  # [OPTIMIZED] Timeout tổng 30s để tránh treo app
-            )
-
-            if result.returncode == 0:
-                raw_output = result.stdout.strip()
-                if not raw_output:
-                    folders = []
-                else:
-                    # rclone lsf trả về "folder/", ta bỏ dấu "/" ở cuối
-                    folders = [line.rstrip("/") for line in raw_output.split("\n")]
-
-                self.data_ready.emit(folders, "")
-            else:
-                self.data_ready.emit([], f"Rclone error: {result.stderr}")
-
-        except subprocess.TimeoutExpired:
-            self.data_ready.emit(
-                [], "Quá thời gian chờ phản hồi từ Google Drive (Timeout)."
-            )
-        except Exception as e:
-            self.data_ready.emit([], str(e))
+from PySide6.QtCore import Signal
+import subprocess
+import tempfile
+import json
+import os
+import re
+from ..data.rclone_configs_manager import RCloneConfigManager
+from .cancellable_worker import CancellableWorker
+
+# [OPTIMIZED] Timeout tổng 30s để tránh treo app
+FETCH_TIMEOUT_SECONDS = 30
+# Tính dung lượng phải duyệt đệ quy cả cây con trên Drive -> cho phép lâu hơn
+FOLDER_SIZE_TIMEOUT_SECONDS = 300
+
+# Ký tự đặc biệt trong glob filter của rclone
+_RCLONE_GLOB_SPECIAL_CHARS = re.compile(r"([\\*?\[\]{}])")
+
+
+class FetchFoldersWorker(CancellableWorker):
+    """
+    Worker chạy ngầm để lấy danh sách thư mục từ rclone.
+    Sử dụng: rclone lsf remote:path --dirs-only
+    Gọi cancel() sẽ kill process rclone ngay và worker thoát mà không phát data_ready.
+    """
+
+    # Signal gửi dữ liệu về UI: (danh sách folder, thông báo lỗi nếu có)
+    data_ready = Signal(list, str)
+
+    def __init__(self, remote_name: str, gdrive_root_path: str = ""):
+        super().__init__()
+        self.remote_name = remote_name
+        self.gdrive_root_path = gdrive_root_path  # Mặc định là root ("")
+
+    def run(self):
+        # Đường dẫn remote: VD: "gdrive:Photos/"
+        full_remote_path = f"{self.remote_name}:{self.gdrive_root_path}"
+
+        try:
+            cmd = [
+                RCloneConfigManager.rclone_executable_path(),
+                "lsf",
+                full_remote_path,
+                "--dirs-only",  # Chỉ lấy thư mục
+            ]
+            result = self.run_process(cmd, FETCH_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            self._emit_result(
+                [], "Quá thời gian chờ phản hồi từ Google Drive (Timeout)."
+            )
+            return
+        except Exception as e:
+            self._emit_result([], str(e))
+            return
+
+        if result is None:
+            return  # Đã bị huỷ
+
+        if result.returncode == 0:
+            raw_output = result.stdout.strip()
+            if not raw_output:
+                folders = []
+            else:
+                # rclone lsf trả về "folder/", ta bỏ dấu "/" ở cuối
+                folders = [line.rstrip("/") for line in raw_output.split("\n")]
+
+            self._emit_result(folders, "")
+        else:
+            self._emit_result([], f"Rclone error: {result.stderr}")
+
+    def _emit_result(self, folders: list[str], error_msg: str) -> None:
+        # Worker đã bị huỷ (dialog đóng / refresh) -> không ai chờ kết quả nữa
+        if not self.is_cancelled:
+            self.data_ready.emit(folders, error_msg)
+
+
+class FetchFolderSizeWorker(CancellableWorker):
+    """
+    Worker chạy ngầm để tính tổng dung lượng + số file (đệ quy) của 1 thư mục.
+    Sử dụng: rclone size remote:path --json
+
+    Các folder con đã biết dung lượng (known_children: tên -> (bytes, count)) được
+    loại khỏi lệnh bằng filter "- /<tên>/**" rồi cộng lại sau, nên rclone chỉ phải
+    duyệt file trực tiếp của thư mục và các folder con chưa tính.
+    """
+
+    # Signal gửi dữ liệu về UI: ((bytes, count), thông báo lỗi nếu có)
+    data_ready = Signal(tuple, str)
+
+    def __init__(
+        self,
+        remote_name: str,
+        gdrive_path: str,
+        known_children: dict[str, tuple[int, int]] | None = None,
+    ):
+        super().__init__()
+        self.remote_name = remote_name
+        self.gdrive_path = gdrive_path
+        self.known_children = known_children or {}
+
+    def run(self):
+        full_remote_path = f"{self.remote_name}:{self.gdrive_path}"
+        filter_file_path = None
+
+        try:
+            cmd = [
+                RCloneConfigManager.rclone_executable_path(),
+                "size",
+                full_remote_path,
+                "--json",
+            ]
+            if self.known_children:
+                # Ghi filter ra file để không vượt giới hạn độ dài command line
+                with tempfile.NamedTemporaryFile(
+                    "w", encoding="utf-8", suffix=".txt", delete=False
+                ) as f:
+                    filter_file_path = f.name
+                    for name in self.known_children:
+                        escaped = _RCLONE_GLOB_SPECIAL_CHARS.sub(r"\\\1", name)
+                        f.write(f"/{escaped}/**\n")
+                cmd += ["--exclude-from", filter_file_path]
+
+            result = self.run_process(cmd, FOLDER_SIZE_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            self._emit_result((0, 0), "Quá thời gian tính dung lượng thư mục.")
+            return
+        except Exception as e:
+            self._emit_result((0, 0), str(e))
+            return
+        finally:
+            if filter_file_path:
+                try:
+                    os.remove(filter_file_path)
+                except OSError:
+                    pass
+
+        if result is None:
+            return  # Đã bị huỷ
+
+        if result.returncode != 0:
+            self._emit_result((0, 0), f"Rclone error: {result.stderr}")
+            return
+
+        try:
+            data = json.loads(result.stdout)
+            total_bytes = int(data.get("bytes", 0))
+            total_count = int(data.get("count", 0))
+        except (ValueError, TypeError, AttributeError) as e:
+            self._emit_result((0, 0), f"Rclone size output không hợp lệ: {e}")
+            return
+
+        for child_bytes, child_count in self.known_children.values():
+            total_bytes += child_bytes
+            total_count += child_count
+        self._emit_result((total_bytes, total_count), "")
+
+    def _emit_result(self, size: tuple[int, int], error_msg: str) -> None:
+        if not self.is_cancelled:
+            self.data_ready.emit(size, error_msg)
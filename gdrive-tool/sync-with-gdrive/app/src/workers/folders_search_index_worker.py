@@ -0,0 +1,26 @@
+from PySide6.QtCore import Signal
+from ..data.remote_folders_cache import RemoteFoldersCache, FolderSearchIndex
+from .cancellable_worker import CancellableWorker
+
+
+class BuildFoldersSearchIndexWorker(CancellableWorker):
+    """
+    Worker chạy ngầm để đọc cache listings từ disk và dựng chỉ mục tìm kiếm.
+    Dựng chỉ mục cho ~100k folder mất cỡ 1s nên không làm trên GUI thread.
+    """
+
+    # Signal gửi dữ liệu về UI: (dữ liệu cache đọc từ disk, chỉ mục đã dựng xong)
+    index_ready = Signal(dict, object)
+
+    def __init__(self, folders_cache: RemoteFoldersCache):
+        super().__init__()
+        self.folders_cache = folders_cache
+
+    def run(self):
+        disk_data = self.folders_cache.load_from_disk()
+        search_index = FolderSearchIndex()
+        for parent_path, names in disk_data["listings"].items():
+            if self.is_cancelled:
+                return  # Dialog đã đóng -> bỏ dở, thread thoát ngay
+            search_index.add_listing(parent_path, names)
+        self.index_ready.emit(disk_data, search_index)
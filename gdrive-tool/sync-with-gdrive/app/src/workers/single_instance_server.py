@@ -0,0 +1,93 @@
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+from ..utils.single_instance import (
+    ACK_BYTE,
+    decode_message,
+    single_instance_server_name,
+)
+
+# Thời gian chờ khi thử kết nối để biết server cũ còn sống hay chỉ là socket sót lại
+ALIVE_PROBE_TIMEOUT_MS = 500
+
+
+class SingleInstanceServer(QObject):
+    """
+    Server local (QLocalServer) trong app đang chạy: nhận paths từ các lần mở app
+    sau (context menu, launcher) và phát paths_received để cửa sổ chính thêm vào.
+    """
+
+    # Signal gửi danh sách paths nhận được từ 1 lần gọi
+    paths_received = Signal(list)
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self._server = QLocalServer(self)
+        # Chỉ user hiện tại kết nối được
+        self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers: dict[QLocalSocket, bytes] = {}
+        # start() thất bại vì 1 app khác đang giữ server (không phải socket sót lại)
+        self.is_other_instance_running = False
+
+    def start(self) -> bool:
+        """
+        Nghe trên tên server chung. Trả về False nếu không nghe được; khi đó
+        is_other_instance_running = True nghĩa là app khác đang chạy và vẫn nhận
+        kết nối (VD: 2 lần mở app chạy đua, hoặc app đó bận quá timeout lúc gửi
+        paths) -> nơi gọi nên gửi paths lại cho app đó.
+        """
+        name = single_instance_server_name()
+        # Kiểm tra trước khi listen: trên Unix, listen() (với UserAccessOption) và
+        # removeServer() đều thay/xoá file socket của app đang chạy -> app đó không
+        # nhận được paths từ các lần mở sau nữa
+        if self._is_server_alive(name):
+            self.is_other_instance_running = True
+            return False
+        if self._server.listen(name):
+            return True
+        # Socket cũ còn sót lại khi app trước bị crash (Unix) -> xoá rồi thử lại
+        QLocalServer.removeServer(name)
+        if self._server.listen(name):
+            return True
+        print(
+            f">>> Error starting single instance server: {self._server.errorString()}"
+        )
+        return False
+
+    @staticmethod
+    def _is_server_alive(name: str) -> bool:
+        probe = QLocalSocket()
+        probe.connectToServer(name)
+        is_alive = probe.waitForConnected(ALIVE_PROBE_TIMEOUT_MS)
+        probe.abort()
+        return is_alive
+
+    def _on_new_connection(self):
+        while self._server.hasPendingConnections():
+            conn = self._server.nextPendingConnection()
+            self._buffers[conn] = b""
+            conn.readyRead.connect(lambda c=conn: self._on_ready_read(c))
+            conn.disconnected.connect(lambda c=conn: self._on_disconnected(c))
+
+    def _on_ready_read(self, conn: QLocalSocket):
+        buffer = self._buffers.get(conn, b"") + bytes(conn.readAll().data())
+        try:
+            payload, used = decode_message(buffer)
+        except ValueError as e:
+            print(f">>> Error reading single instance message: {e}")
+            conn.abort()
+            return
+        if payload is None:
+            self._buffers[conn] = buffer  # Chưa nhận đủ message
+            return
+
+        self._buffers[conn] = buffer[used:]
+        conn.write(ACK_BYTE)
+        conn.flush()
+        paths = payload.get("paths")
+        if isinstance(paths, list):
+            self.paths_received.emit([p for p in paths if isinstance(p, str)])
+
+    def _on_disconnected(self, conn: QLocalSocket):
+        self._buffers.pop(conn, None)
+        conn.deleteLater()
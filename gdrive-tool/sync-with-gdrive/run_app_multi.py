@@ -1,11 +1,23 @@
 # File dùng cho Registry (chọn nhiều file -> chạy script nhiều lần)
 
+import errno
+import os
 import sys
 import socket
+import selectors
+import statistics
 import subprocess
+import time
 import traceback
+from collections import deque
 from datetime import datetime
 from pathlib import Path
+from app.src.utils.single_instance import (
+    ACK_BYTE,
+    decode_message,
+    encode_message,
+    forward_paths_to_running_instance,
+)
 
 PYTHON_EXE_FILE_PATH = r"D:\Python-3-12\python.exe"
 APP_PY_FILE_PATH = r"D:\D-Documents\TOOLs\gdrive-tool\sync-with-gdrive\app\src\main.py"
@@ -14,12 +26,26 @@ APP_PY_FILE_PATH = r"D:\D-Documents\TOOLs\gdrive-tool\sync-with-gdrive\app\src\m
 PORT = 65432  # Cổng TCP để Master lắng nghe kết nối từ Slave (nên chọn cổng > 1024)
 HOST = "127.0.0.1"
 
-# Thời gian chờ (giây). Nếu sau khoảng này không có thêm file nào, Master sẽ chốt đơn.
-# Windows gửi các lệnh rất nhanh, nên 0.2 - 0.5 là đủ an toàn và nhanh.
-SLIDING_TIMEOUT = 1.0
-
-# Kích thước message khi socket nhận dữ liệu.
-# 4096 là "tiêu chuẩn vàng" (convention) trong lập trình mạng và hệ thống, đủ lớn để chứa trọn vẹn các gói tin TCP trong ngữ cảnh truyền path string này.
+# Cửa sổ gom file thích ứng (giây): Master chốt đơn khi không có file mới trong
+# BATCH_GAP_MULTIPLIER x (median khoảng cách giữa các lần Slave gửi gần nhất),
+# kẹp trong [MIN_BATCH_WINDOW, MAX_BATCH_WINDOW].
+# Trước khi có khoảng cách nào để đo thì dùng INITIAL_BATCH_WINDOW.
+INITIAL_BATCH_WINDOW = 0.5
+MIN_BATCH_WINDOW = 0.1
+MAX_BATCH_WINDOW = 1.0
+BATCH_GAP_MULTIPLIER = 2.0
+# Số khoảng cách gần nhất dùng để tính median
+BATCH_GAP_SAMPLES = 32
+# Dù Slave vẫn đang gửi dở, Master không gom quá thời gian này
+MAX_COLLECT_SECONDS = 10.0
+
+# Slave: thử kết nối lại trong khoảng này (Master có thể chưa kịp listen),
+# và thời gian tối đa chờ Master xác nhận đã nhận path
+SLAVE_CONNECT_RETRY_SECONDS = 0.5
+SLAVE_ACK_TIMEOUT = 2.0
+
+# Kích thước mỗi lần đọc socket. Message có độ dài ở đầu nên path dài hơn
+# hoặc bị chia thành nhiều gói TCP vẫn được ghép lại đầy đủ.
 BUFFER_SIZE = 4096
 
 
@@ -47,23 +73,135 @@ def log_test(any):
         pass
 
 
+def send_paths_to_master(file_paths: list[str]) -> bool:
+    """Gửi paths cho Master, trả về True khi Master xác nhận đã nhận."""
+    with socket.create_connection((HOST, PORT), timeout=SLAVE_ACK_TIMEOUT) as s:
+        # Mỗi path 1 message trên cùng 1 kết nối; Master ACK từng message
+        for file_path in file_paths:
+            s.sendall(encode_message({"paths": [file_path]}))
+            if s.recv(1) != ACK_BYTE:
+                return False
+    return True
+
+
 def run_slave(file_path: str):
     """Slave: Chỉ có nhiệm vụ gửi file cho Master rồi tự sát"""
+    deadline = time.monotonic() + SLAVE_CONNECT_RETRY_SECONDS
+    while True:
+        try:
+            if send_paths_to_master([file_path]):
+                return
+        except OSError:
+            pass  # Master chưa listen kịp / vừa chốt đơn và đóng socket
+        if time.monotonic() >= deadline:
+            break
+        time.sleep(0.02)
+
+    # Master đã chốt đơn trước khi nhận được path này -> không để mất path:
+    # mở app với path này (start_app sẽ tự chuyển cho app đang chạy nếu có)
+    log_test(f"Slave fallback: {file_path}")
+    run_app([file_path])
+
+
+class AdaptiveBatchWindow:
+    """
+    Cửa sổ gom file của Master: đóng khi không có path mới trong
+    BATCH_GAP_MULTIPLIER x median các khoảng cách đến gần nhất.
+    """
+
+    def __init__(self):
+        self._last_arrival = time.monotonic()
+        self._gaps: deque[float] = deque(maxlen=BATCH_GAP_SAMPLES)
+
+    def on_arrival(self) -> None:
+        now = time.monotonic()
+        self._gaps.append(now - self._last_arrival)
+        self._last_arrival = now
+
+    def window(self) -> float:
+        if not self._gaps:
+            return INITIAL_BATCH_WINDOW
+        adaptive = BATCH_GAP_MULTIPLIER * statistics.median(self._gaps)
+        return min(MAX_BATCH_WINDOW, max(MIN_BATCH_WINDOW, adaptive))
+
+    def remaining(self) -> float:
+        return self.window() - (time.monotonic() - self._last_arrival)
+
+
+def collect_paths(server_socket: socket.socket) -> list[str]:
+    """Nhận paths từ các Slave (nhiều kết nối song song) tới khi cửa sổ gom đóng."""
+    paths: list[str] = []
+    batch_window = AdaptiveBatchWindow()
+    collect_deadline = time.monotonic() + MAX_COLLECT_SECONDS
+
+    selector = selectors.DefaultSelector()
+    server_socket.setblocking(False)
+    selector.register(server_socket, selectors.EVENT_READ)
+    # Dữ liệu đã nhận nhưng chưa đủ 1 message của từng kết nối
+    buffers: dict[socket.socket, bytes] = {}
+
+    def close_conn(conn: socket.socket):
+        selector.unregister(conn)
+        buffers.pop(conn, None)
+        conn.close()
+
     try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.connect((HOST, PORT))
-            s.sendall(file_path.encode("utf-8"))
-    except ConnectionRefusedError:
-        # Trường hợp hiếm: Slave gọi đến cổng 65432 nhưng không có ai nghe máy.
-        # Có thể Master vừa mới bị tắt đột ngột, hoặc Master gặp lỗi và crash ngay trước khi Slave kịp gọi.
-        raise ValueError("??? Lỗi: Không thể kết nối đến Master để gửi file")
-    except Exception as e:
-        # Silent fail để không hiện lỗi lên mặt người dùng
-        raise ValueError(f"??? Lỗi không xác định ở Slave: {e}")
+        while True:
+            timeout = batch_window.remaining()
+            if timeout <= 0:
+                # Còn Slave đang gửi dở -> chờ thêm chút cho trọn message
+                has_partial = any(buffers.values())
+                if not has_partial or time.monotonic() >= collect_deadline:
+                    break
+                timeout = MIN_BATCH_WINDOW
+
+            for key, _ in selector.select(timeout):
+                if key.fileobj is server_socket:
+                    try:
+                        conn, _ = server_socket.accept()
+                    except BlockingIOError:
+                        continue
+                    conn.setblocking(False)
+                    selector.register(conn, selectors.EVENT_READ)
+                    buffers[conn] = b""
+                    continue
+
+                conn = key.fileobj
+                try:
+                    data = conn.recv(BUFFER_SIZE)
+                except OSError:
+                    data = b""
+                if not data:
+                    close_conn(conn)  # Slave đã gửi xong và đóng kết nối
+                    continue
+
+                buffer = buffers[conn] + data
+                try:
+                    while True:
+                        payload, used = decode_message(buffer)
+                        if payload is None:
+                            break
+                        buffer = buffer[used:]
+                        new_paths = payload.get("paths")
+                        if isinstance(new_paths, list):
+                            paths.extend(p for p in new_paths if isinstance(p, str))
+                        batch_window.on_arrival()
+                        conn.sendall(ACK_BYTE)
+                except (ValueError, OSError) as e:
+                    log_test(f"Bad message from Slave: {e}")
+                    close_conn(conn)
+                    continue
+                buffers[conn] = buffer
+    finally:
+        for conn in list(buffers):
+            close_conn(conn)
+        selector.close()
+
+    return paths
 
 
 def run_master(initial_file_path: str):
-    """Master: Gom file với cơ chế Sliding Timeout"""
+    """Master: Gom file với cửa sổ gom thích ứng theo tốc độ Slave gửi tới"""
     files_to_process = [initial_file_path]
 
     # Tạo socket server, AF_INET cho IPv4, SOCK_STREAM cho TCP
@@ -71,36 +209,17 @@ def run_master(initial_file_path: str):
 
     try:
         server_socket.bind((HOST, PORT))
-        server_socket.listen()
-        server_socket.settimeout(
-            SLIDING_TIMEOUT
-        )  # Thiết lập thời gian chờ cho việc lắng nghe kết nối từ Slave
-
-        while True:
-            try:
-                # (Blocking) Chờ kết nối từ Slave. Nếu quá SLIDING_TIMEOUT không có Slave nào gọi, sẽ nhảy vào except
-                conn, _ = server_socket.accept()
-
-                with conn:
-                    # Nếu có kết nối, nhận file path
-                    data = conn.recv(BUFFER_SIZE)
-                    if data:
-                        new_file = data.decode("utf-8")
-                        files_to_process.append(new_file)
-                        # Mỗi khi nhận được 1 file, vòng lặp while quay lại
-                        # và settimeout lại được kích hoạt từ đầu.
-                        # -> Đây chính là cơ chế Sliding Timeout.
-
-            except socket.timeout:
-                # Không còn Slave nào gửi file nữa, dừng gom.
-                # --- LOGIC XỬ LÝ CHÍNH ---
-                run_app(files_to_process)
-                break
-    except Exception as e:
-        raise e
+        # Backlog lớn: chọn hàng trăm file -> hàng trăm Slave kết nối gần như cùng lúc
+        server_socket.listen(socket.SOMAXCONN)
+        files_to_process += collect_paths(server_socket)
     finally:
         server_socket.close()
 
+    # --- LOGIC XỬ LÝ CHÍNH ---
+    # App có thể vừa được mở trong lúc gom -> gửi cả lô cho nó
+    if not forward_paths_to_running_instance(files_to_process):
+        run_app(files_to_process)
+
 
 def run_app(file_paths: list[str]):
     subprocess.Popen([PYTHON_EXE_FILE_PATH, APP_PY_FILE_PATH, *file_paths])
@@ -145,6 +264,13 @@ if __name__ == "__main__":
     current_file_path = sys.argv[1] if len(sys.argv) > 1 else None
 
     try:
+        # App đã mở sẵn -> chuyển path thẳng vào cửa sổ đó (vài ms), không cần gom
+        # và không khởi động thêm Python + Qt mới
+        if current_file_path and forward_paths_to_running_instance(
+            [os.path.abspath(current_file_path)]
+        ):
+            sys.exit(0)
+
         if current_file_path:
             # Cố gắng BIND port.
             # Nếu thành công -> Ta là Master (người đầu tiên).
@@ -163,7 +289,8 @@ if __name__ == "__main__":
             except Exception as e:
                 if isinstance(e, OSError):
                     log_test(e.errno)
-                    if e.errno == 10048:  # Mã lỗi: Address already in use (Windows)
+                    # Mã lỗi: Address already in use (10048 trên Windows)
+                    if e.errno in (10048, errno.EADDRINUSE):
                         run_slave(current_file_path)
                     else:
                         raise ValueError("??? Lỗi nội bộ: Sai mã lỗi OSError")
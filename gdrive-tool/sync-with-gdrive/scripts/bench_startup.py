@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# --- Project root (scripts/ -> root) ---
+ROOT = Path(__file__).resolve().parents[1]
+RUN_APP = ROOT / "run_app.py"
+DEFAULT_BASELINE = ROOT / "scripts" / "startup_baseline.json"
+
+# Khớp với app/src/testing/performance_testing.py
+STARTUP_BENCH_ENV = "SYNRIVE_STARTUP_BENCH"
+TIMELINE_REL_PATH = Path("SynRive") / "logs" / "startup_timeline.jsonl"
+
+# Các chỉ số so với baseline:
+# - first_paint_ms: từ lúc import main.py tới khi cửa sổ vẽ lần đầu
+# - work_ms: tổng thời gian các giai đoạn (không tính lúc app chờ timer)
+METRICS = ("first_paint_ms", "work_ms")
+
+
+def run_once(timeout: float) -> dict:
+    """Chạy app 1 lần (offscreen, app data tạm trống) và đọc timeline đã ghi."""
+    with tempfile.TemporaryDirectory(prefix="synrive-bench-") as app_data:
+        env = dict(os.environ)
+        env["QT_QPA_PLATFORM"] = "offscreen"
+        env["APPDATA"] = app_data
+        env[STARTUP_BENCH_ENV] = "1"
+
+        proc = subprocess.run(
+            [sys.executable, str(RUN_APP)],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            timeout=timeout,
+        )
+        timeline_file = Path(app_data) / TIMELINE_REL_PATH
+        if proc.returncode != 0 or not timeline_file.exists():
+            raise RuntimeError(
+                f"App thoát với code {proc.returncode}, không có timeline.\n"
+                f"{proc.stdout}\n{proc.stderr}"
+            )
+        lines = timeline_file.read_text(encoding="utf-8").splitlines()
+        return json.loads(lines[-1])
+
+
+def summarize(record: dict) -> dict[str, float]:
+    """Rút gọn 1 timeline thành {tên giai đoạn: thời lượng} + các mốc + work_ms."""
+    result: dict[str, float] = {}
+    work_ms = 0.0
+    for phase in record["phases"]:
+        if "at_ms" in phase:
+            # Mốc tức thời (first_show, first_paint) -> lấy thời điểm xảy ra
+            result[f"{phase['name']}_ms"] = phase["at_ms"]
+            continue
+        duration = phase["end_ms"] - phase["start_ms"]
+        result[phase["name"]] = duration
+        work_ms += duration
+    result["work_ms"] = work_ms
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Đo thời gian khởi động SynRive qua N lần cold start (offscreen)."
+    )
+    parser.add_argument("-n", "--runs", type=int, default=7, help="Số lần chạy")
+    parser.add_argument(
+        "--baseline", type=Path, default=DEFAULT_BASELINE, help="File baseline JSON"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.15,
+        help="Cho phép median chậm hơn baseline bao nhiêu (0.15 = 15%%)",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Ghi median lần này làm baseline mới",
+    )
+    parser.add_argument("--timeout", type=float, default=60, help="Timeout mỗi lần")
+    args = parser.parse_args()
+
+    # Lần chạy khởi động (compile .pyc, nạp cache của OS) -> không tính
+    print("[bench] warm-up...")
+    run_once(args.timeout)
+
+    runs: list[dict[str, float]] = []
+    for i in range(args.runs):
+        summary = summarize(run_once(args.timeout))
+        runs.append(summary)
+        print(
+            f"[bench] run {i + 1}/{args.runs}: "
+            f"first_paint={summary.get('first_paint_ms', 0):.0f}ms "
+            f"work={summary['work_ms']:.0f}ms"
+        )
+
+    names = [name for name in runs[0] if all(name in r for r in runs)]
+    medians = {name: statistics.median(r[name] for r in runs) for name in names}
+
+    print("\n[bench] median (ms):")
+    for name, value in medians.items():
+        print(f"  {name:<28} {value:8.1f}")
+
+    if args.save_baseline or not args.baseline.exists():
+        baseline = {name: round(medians[name], 2) for name in METRICS}
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n", "utf-8")
+        print(f"\n[bench] Đã lưu baseline: {args.baseline}")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    has_regression = False
+    print(f"\n[bench] so với baseline (tolerance {args.tolerance:.0%}):")
+    for name in METRICS:
+        if name not in baseline or name not in medians:
+            continue
+        limit = baseline[name] * (1 + args.tolerance)
+        status = "OK" if medians[name] <= limit else "REGRESSION"
+        has_regression |= status != "OK"
+        print(
+            f"  {name:<16} {medians[name]:8.1f} / baseline {baseline[name]:8.1f}"
+            f" (limit {limit:.1f}) {status}"
+        )
+
+    return 1 if has_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
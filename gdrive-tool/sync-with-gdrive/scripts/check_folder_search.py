@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# --- Project root (scripts/ -> root) ---
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.src.data.remote_folders_cache import FolderSearchIndex  # noqa: E402
+
+# Ngân sách thời gian cho 1 lần tìm trên chỉ mục mẫu (~100k folder)
+SEARCH_BUDGET_MS = 20
+
+# (query, full path bắt buộc có trong kết quả)
+CASES = [
+    ("abc", "folder 1000/abc"),
+    ("folder 1/ab", "folder 1000/abc"),
+    ("folder 10/abc", "folder 1000/abc"),
+    ("du an/src", "Dự án/src"),
+    ("Dự án/SRC", "Dự án/src"),
+    ("du an src", "Dự án/src"),
+    ("du an lon/src", "Dự án lớn/src"),
+    ("du an/", "Dự án"),
+    ("tai lieu/du an 12", "Tài liệu/Dự án 12"),
+    ("tai lieu/2024/hop", "Tài liệu/2024/Họp nhóm"),
+]
+
+
+def build_index(folder_count: int) -> FolderSearchIndex:
+    """Chỉ mục mẫu: các folder trong CASES + folder_count folder ngẫu nhiên."""
+    search_index = FolderSearchIndex()
+    search_index.add_listing("", ["Dự án", "Dự án lớn", "Tài liệu"])
+    search_index.add_listing("Dự án", ["src", "docs"])
+    search_index.add_listing("Dự án lớn", ["src"])
+    search_index.add_listing("Tài liệu", ["Dự án 12", "2024"])
+    search_index.add_listing("Tài liệu/2024", ["Họp nhóm", "Báo cáo"])
+
+    per_parent = 100
+    for p in range(folder_count // per_parent + 1):
+        parent = f"folder {p}"
+        search_index.add_listing("", [parent])
+        search_index.add_listing(parent, [f"item {p}-{i}" for i in range(per_parent)])
+    search_index.add_listing("folder 1000", ["abc"])
+    return search_index
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Kiểm tra kết quả + thời gian tìm kiếm của FolderSearchIndex."
+    )
+    parser.add_argument("--folders", type=int, default=100_000)
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+    search_index = build_index(args.folders)
+    build_ms = (time.perf_counter() - started_at) * 1000
+    print(f"[INFO] Index {len(search_index)} folder trong {build_ms:.0f} ms")
+
+    failed = 0
+    for query, expected in CASES:
+        started_at = time.perf_counter()
+        results = search_index.search(query)
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+
+        is_found = expected in results
+        is_fast = elapsed_ms <= SEARCH_BUDGET_MS
+        status = "OK" if is_found and is_fast else "FAIL"
+        if status == "FAIL":
+            failed += 1
+        print(f"[{status}] {query!r:24} -> {expected!r} ({elapsed_ms:.1f} ms)")
+        if not is_found:
+            print(f"       top: {results[:3]}")
+
+    print(f"\n{len(CASES) - failed}/{len(CASES)} case OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,47 +1,35 @@
+import os
+import sys
 from pathlib import Path
 
-
-def print_tree(
-    root_path: Path,
-    file_handle,
-    prefix: str = "",
-    exclude_dirs: set[str] | None = None,
-):
-    if exclude_dirs is None:
-        exclude_dirs = set()
-
-    entries = sorted(root_path.iterdir(), key=lambda p: (p.is_file(), p.name.lower()))
-
-    entries = [e for e in entries if not (e.is_dir() and e.name in exclude_dirs)]
-
-    for index, entry in enumerate(entries):
-        connector = "└── " if index == len(entries) - 1 else "├── "
-        file_handle.write(f"{prefix}{connector}{entry.name}\n")
-
-        if entry.is_dir():
-            extension = "    " if index == len(entries) - 1 else "│   "
-            print_tree(entry, file_handle, prefix + extension, exclude_dirs)
+# 📌 Xác định ROOT PROJECT (scripts/..)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# Code dùng chung với runner/print_project_tree.py (TOOLs/runner/src/useful-codes)
+RUNNER_USEFUL_CODES_FOLDER = os.getenv("USEFUL_CODES_FOLDER_PATH") or str(
+    PROJECT_ROOT.parents[1] / "runner" / "src" / "useful-codes"
+)
+sys.path.append(RUNNER_USEFUL_CODES_FOLDER)
+from _project_tree import main, sort_dirs_first  # noqa: E402
+
+# Các thư mục luôn loại trừ (ngoài các rule trong .gitignore)
+EXCLUDED_DIRS = {
+    ".git",
+    ".github",
+    "__pycache__",
+    "node_modules",
+    ".venv",
+    ".venv-build",
+    "dist",
+    "build",
+}
 
 
 if __name__ == "__main__":
-    # 📌 Xác định ROOT PROJECT (scripts/..)
-    PROJECT_ROOT = Path(__file__).resolve().parent.parent
-
-    excluded_dirs = {
-        ".git",
-        ".github",
-        "__pycache__",
-        "node_modules",
-        ".venv",
-        ".venv-build",
-        "dist",
-        "build",
-    }
-
-    output_file = PROJECT_ROOT / "scripts" / "project_tree.txt"
-
-    with output_file.open("w", encoding="utf-8") as f:
-        f.write(f"Tree view of: {PROJECT_ROOT}\n\n")
-        print_tree(PROJECT_ROOT, f, exclude_dirs=excluded_dirs)
-
-    print(f"✔ Project tree written to: {output_file}")
+    main(
+        default_root=str(PROJECT_ROOT),
+        default_output=str(PROJECT_ROOT / "scripts" / "project_tree.txt"),
+        default_exclude_dirs=sorted(EXCLUDED_DIRS),
+        sort_key=sort_dirs_first,
+        description="Ghi cây thư mục của project ra scripts/project_tree.txt.",
+        epilog="Ví dụ: py scripts/print_project_tree.py --max-depth 3 --sizes",
+    )
@@ -1 +1 @@
-py D:/D-Documents/TOOLs/runner/src/main.py %*
\ No newline at end of file
+py D:/D-Documents/TOOLs/runner/src/runner_client.py %*
\ No newline at end of file
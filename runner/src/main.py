@@ -2,7 +2,9 @@ import argparse
 import os
 import subprocess
 import sys
+from collections.abc import Callable
 from dotenv import load_dotenv
+from runner_actions import ScriptAction, run_action, system_code, useful_code
 
 load_dotenv(dotenv_path="D:/D-Documents/TOOLs/runner/.env")
 
@@ -16,6 +18,7 @@ RUNNER_TYPE_GIT = "git"
 RUNNER_TYPE_GDRIVE = "gdrive"
 RUNNER_TYPE_INIT = "init"
 RUNNER_TYPE_PY = "py"
+RUNNER_TYPE_DAEMON = "daemon"
 
 # --- Actions ---
 # open
@@ -51,6 +54,10 @@ RUNNER_PRINT_DIRECTORY = "dir"
 RUNNER_PRINT_USEFUL_COMMANDS = "cmds"
 # py
 RUNNER_PY_ENV = "env"
+# daemon
+RUNNER_DAEMON_START = "start"
+RUNNER_DAEMON_STOP = "stop"
+RUNNER_DAEMON_STATUS = "status"
 
 RUNNER_FLAG_H = "-h"
 RUNNER_FLAG_M = "-m"
@@ -73,42 +80,44 @@ RUNNER_USEFUL_CODES_FOLDER_PATH = os.getenv("USEFUL_CODES_FOLDER_PATH") or ""
 
 TEMPLATE_REPLACER_FOLDER_PATH = os.getenv("TEMPLATE_REPLACER_FOLDER_PATH") or ""
 
+# --- Scripts ---
+# Chạy ngay trong process của runner (import lazily lúc cần)
+SCRIPT_PRINT_CONTENT = system_code("runner_print_content.py")
+SCRIPT_STATUSES = system_code("runner_statuses.py")
+SCRIPT_GIT = system_code("runner_git.py")
+SCRIPT_CURL = useful_code("print_cURL.py")
+SCRIPT_OS_INFO = useful_code("print_os_info.py")
+SCRIPT_PRINT_FOLDER = useful_code("print_vcnbat_folder.py")
+SCRIPT_MAIN_WS = useful_code("open_main_ws.py")
+SCRIPT_CREATE_FILES = useful_code("create_files_in_folder.py")
+SCRIPT_DOWNLOAD_PATH = useful_code("set_download_path_in_chrome.py")
+SCRIPT_RENAME_FILES = useful_code("rename_files.py")
+SCRIPT_DELETE_FILES = useful_code("delete_files.py")
+SCRIPT_KEEP_FILES = useful_code("keep_files_with_ext.py")
+SCRIPT_FEATURE_DESCRIPTION = useful_code("print_feature_description.py")
+# Cần cô lập: chạy lâu / tương tác nhiều bước / đổi trạng thái console
+SCRIPT_GDRIVE = useful_code("sync-to-gdrive/sync_to_gdrive.py", isolated=True)
+SCRIPT_SETUP_VENV = useful_code("setup_venv_in_project.py", isolated=True)
+SCRIPT_SUBTITLE = useful_code(
+    "sub-youtube-video/format_subtitle_txt_to_srt.py", isolated=True
+)
+SCRIPT_TEST_BAT = ScriptAction(
+    f"{RUNNER_ROOT_FOLDER}/src/runner_test.py", isolated=True
+)
+
 # --- Functions ---
 
 
 def gdrive_execute(gdrive_command, *args):
-    cmd_args = [
-        "python",
-        f"{RUNNER_USEFUL_CODES_FOLDER_PATH}/sync-to-gdrive/sync_to_gdrive.py",
-    ]
-    if gdrive_command is not None:
-        cmd_args.append(gdrive_command)
-    cmd_args.extend([arg for arg in args if arg is not None])
-
-    subprocess.run(
-        cmd_args,
-        check=True,
-        shell=True,
-    )
-    sys.exit(0)
+    return run_action(SCRIPT_GDRIVE, gdrive_command, *args)
 
 
 def print_content(content_filename):
-    subprocess.run(
-        [
-            "python",
-            f"{RUNNER_ROOT_FOLDER}/src/system-codes/runner_print_content.py",
-            content_filename,
-        ],
-        check=True,
-        shell=True,
-    )
-    sys.exit(0)
+    return run_action(SCRIPT_PRINT_CONTENT, content_filename)
 
 
 def open_vscode_extensions_in_vscode(ide_prefix):
     subprocess.run([ide_prefix, "D:/D-Documents/Browser-Extensions"], shell=True)
-    sys.exit(0)
 
 
 def warn_user_error(warning_message: str):
@@ -119,186 +128,107 @@ def warn_user_error(warning_message: str):
 
 def open_testing_folder_in_vscode(ide_prefix):
     subprocess.run([ide_prefix, "D:/D-Documents/Testing"], shell=True)
-    sys.exit(0)
 
 
 def print_runner_files_root_dir():
     print(os.path.dirname(os.path.abspath(__file__)))
-    sys.exit(0)
 
 
 def print_useful_commands():
-    print_content("list_useful_commands.txt")
+    return print_content("list_useful_commands.txt")
 
 
 def run_git_command(git_type, user_message=None):
-    args = [
-        "python",
-        f"{RUNNER_ROOT_FOLDER}/src/system-codes/runner_git.py",
-        git_type,
-    ]
-    if user_message:
-        args.append(user_message)
-    subprocess.run(
-        args,
-        check=True,
-    )
-    sys.exit(0)
+    return run_action(SCRIPT_GIT, git_type, user_message or None)
 
 
 def open_runner_file_in_system_folder():
     subprocess.run(["start", f"{RUNNER_ROOT_FOLDER}"], shell=True)
-    sys.exit(0)
 
 
 def print_statuses_info():
-    subprocess.run(
-        ["python", f"{RUNNER_ROOT_FOLDER}/src/system-codes/runner_statuses.py"],
-        check=True,
-        shell=True,
-    )
-    sys.exit(0)
+    return run_action(SCRIPT_STATUSES)
 
 
 def print_help():
-    print_content("help.txt")
+    return print_content("help.txt")
 
 
 def print_cURL():
-    subprocess.run(
-        ["python", f"{RUNNER_ROOT_FOLDER}/src/useful-codes/runner_cURL.py"],
-        check=True,
-        shell=True,
-    )
-    sys.exit(0)
+    return run_action(SCRIPT_CURL)
 
 
 def open_environment_variables_panel():
     subprocess.run(["rundll32.exe", "sysdm.cpl,EditEnvironmentVariables"], shell=True)
-    sys.exit(0)
 
 
 def open_prompts_folder():
     subprocess.run(["start", f"{TEMPLATE_REPLACER_FOLDER_PATH}/Prompts"], shell=True)
-    sys.exit(0)
 
 
 def open_vscode_workspaces_in_system_folder():
     subprocess.run(["start", "D:/D-Documents/VSCode-Workspaces"], shell=True)
-    sys.exit(0)
 
 
 def open_working_vscode(ide_prefix: str, value: str, powershell_only=False):
     if not ide_prefix:
         raise Exception("IDE prefix is missing.")
-    cmd_args = [
-        "python",
-        f"{RUNNER_ROOT_FOLDER}/src/useful-codes/runner_main_ws.py",
+    return run_action(
+        SCRIPT_MAIN_WS,
         ide_prefix,
-    ]
-    if value:
-        cmd_args.append(value)
-    if powershell_only:
-        cmd_args.append("-p")
-    subprocess.run(
-        cmd_args,
-        check=True,
-        shell=True,
+        value or None,
+        "-p" if powershell_only else None,
     )
-    sys.exit(0)
 
 
 def print_vscode_workspaces(workspace_path):
-    subprocess.run(
-        [
-            "python",
-            os.path.join(RUNNER_USEFUL_CODES_FOLDER_PATH, "print_runner_folder.py"),
-            workspace_path,
-        ],
-        check=True,
-    )
-    sys.exit(0)
+    return run_action(SCRIPT_PRINT_FOLDER, workspace_path)
 
 
 def open_runner_files_in_vscode(ide_prefix):
     subprocess.run([ide_prefix, f"{RUNNER_ROOT_FOLDER}"], shell=True)
-    sys.exit(0)
 
 
 def open_template_nestjs_folder_in_vscode(ide_prefix):
     subprocess.run([ide_prefix, "D:/D-Documents/Code_VCN/nestjs"], shell=True)
-    sys.exit(0)
 
 
 def run_test_bat(*args):
-    subprocess.run(
-        ["python", f"{RUNNER_ROOT_FOLDER}/src/runner_test.py"] + list(args),
-        check=True,
-        shell=True,
-    )
-    sys.exit(0)
+    return run_action(SCRIPT_TEST_BAT, *args)
 
 
 def print_os_info():
-    subprocess.run(
-        ["python", f"{RUNNER_ROOT_FOLDER}/src/useful-codes/runner_os_info.py"],
-        check=True,
-        shell=True,
-    )
-    sys.exit(0)
+    return run_action(SCRIPT_OS_INFO)
 
 
 def run_Unikey_app():
     subprocess.run(["start", "C:/Users/dell/Downloads/UniKeyNT.exe"], shell=True)
-    sys.exit(0)
 
 
 def open_typescript_template_in_cursor(ide_prefix):
     subprocess.run(
         [ide_prefix, "D:/D-Documents/Templates/standard-express-server-ts"], shell=True
     )
-    sys.exit(0)
 
 
 def open_testing_javascript_typescript_folder_in_vscode(ide_prefix):
     subprocess.run([ide_prefix, "D:/D-Documents/Testing/js-ts"], shell=True)
-    sys.exit(0)
 
 
 def open_testing_python_folder_in_vscode(ide_prefix):
     subprocess.run([ide_prefix, "D:/D-Documents/Testing/py"], shell=True)
-    sys.exit(0)
 
 
 def create_files_in_folder():
-    subprocess.run(
-        ["py", f"{RUNNER_USEFUL_CODES_FOLDER_PATH}/create_files_in_folder.py"],
-        shell=True,
-    )
-    sys.exit(0)
+    return run_action(SCRIPT_CREATE_FILES)
 
 
 def set_download_path_in_chrome(folder_name: str | None = None):
-    cmd_args = [
-        "py",
-        f"{RUNNER_USEFUL_CODES_FOLDER_PATH}/set_download_path_in_chrome.py",
-    ]
-    if folder_name:
-        cmd_args.append(folder_name)
-    subprocess.run(cmd_args, shell=True)
-    sys.exit(0)
+    return run_action(SCRIPT_DOWNLOAD_PATH, folder_name or None)
 
 
 def convert_txt_to_srt(value):
-    subprocess.run(
-        [
-            "py",
-            f"{RUNNER_USEFUL_CODES_FOLDER_PATH}/sub-youtube-video/format_subtitle_txt_to_srt.py",
-            value,
-        ],
-        shell=True,
-    )
-    sys.exit(0)
+    return run_action(SCRIPT_SUBTITLE, value)
 
 
 def edit_prompts():
@@ -306,60 +236,58 @@ def edit_prompts():
         [f"{TEMPLATE_REPLACER_FOLDER_PATH}/edit-prompts.cmd"],
         shell=True,
     )
-    sys.exit(0)
 
 
-def rename_files(folder_path: str | None = None, prefix: str | None = None):
-    cmd_args = [
-        "py",
-        f"{RUNNER_USEFUL_CODES_FOLDER_PATH}/rename_files.py",
-    ]
-    if folder_path:
-        cmd_args.append(folder_path)
-    if prefix is not None:
-        cmd_args.append(prefix)
-    subprocess.run(cmd_args, shell=True)
-    sys.exit(0)
+def rename_files(
+    folder_path: str | None = None,
+    prefix: str | None = None,
+    dry_run: bool = False,
+):
+    return run_action(
+        SCRIPT_RENAME_FILES,
+        folder_path or None,
+        prefix,
+        "--dry-run" if dry_run else None,
+    )
 
 
-def delete_files(folder_path: str | None = None, ext_list: str | None = None):
-    cmd_args = [
-        "py",
-        f"{RUNNER_USEFUL_CODES_FOLDER_PATH}/delete_files.py",
-    ]
-    if folder_path:
-        cmd_args.append(folder_path)
-    if ext_list:
-        cmd_args.append(ext_list)
-    subprocess.run(cmd_args, shell=True)
-    sys.exit(0)
+def delete_files(
+    folder_path: str | None = None,
+    ext_list: str | None = None,
+    recursive: bool = False,
+    dry_run: bool = False,
+):
+    return run_action(
+        SCRIPT_DELETE_FILES,
+        folder_path or None,
+        ext_list or None,
+        "--recursive" if recursive else None,
+        "--dry-run" if dry_run else None,
+    )
 
 
-def keep_files(folder_path: str | None = None, ext: str | None = None):
-    cmd_args = [
-        "py",
-        f"{RUNNER_USEFUL_CODES_FOLDER_PATH}/keep_files_with_ext.py",
-    ]
-    if folder_path:
-        cmd_args.append(folder_path)
-    if ext:
-        cmd_args.append(ext)
-    subprocess.run(cmd_args, shell=True)
-    sys.exit(0)
+def keep_files(
+    folder_path: str | None = None,
+    ext_list: str | None = None,
+    recursive: bool = False,
+    dry_run: bool = False,
+):
+    return run_action(
+        SCRIPT_KEEP_FILES,
+        folder_path or None,
+        ext_list or None,
+        "--recursive" if recursive else None,
+        "--dry-run" if dry_run else None,
+    )
 
 
 def print_feature_description(cmd_type: str | None, action: str | None):
-    cmd_args = [
-        "python",
-        f"{RUNNER_USEFUL_CODES_FOLDER_PATH}/print_feature_description.py",
-    ]
+    cmd_args: list[str] = []
     if cmd_type:
         cmd_args.extend(["--type", cmd_type])
     if action:
         cmd_args.extend(["--action", action])
-
-    subprocess.run(cmd_args, shell=True)
-    sys.exit(0)
+    return run_action(SCRIPT_FEATURE_DESCRIPTION, *cmd_args)
 
 
 def cmd_init():
@@ -367,217 +295,312 @@ def cmd_init():
         [f"{RUNNER_ROOT_FOLDER}/src/cmd/init.cmd"],
         shell=True,
     )
-    sys.exit(0)
 
 
 def py_setup_venv():
-    cmd_args = [
-        "python",
-        f"{RUNNER_USEFUL_CODES_FOLDER_PATH}/setup_venv_in_project.py",
-    ]
+    return run_action(SCRIPT_SETUP_VENV)
+
+
+def start_runner_daemon():
+    from runner_daemon import start_daemon_process
+
+    return start_daemon_process()
+
+
+def stop_runner_daemon():
+    from runner_daemon import stop_daemon
+
+    return stop_daemon()
+
+
+def print_runner_daemon_status():
+    from runner_daemon import daemon_status
+
+    status = daemon_status()
+    print(">>> Runner daemon is " + ("running." if status == 0 else "not running."))
+    return status
+
+
+def get_ide_prefix(args: argparse.Namespace) -> str:
+    return "anti" if args.antigravity_IDE else "code"
+
+
+def run_gdrive_action(args: argparse.Namespace):
+    gdrive_args = [args.value, args.extra]
+    if args.deep:
+        gdrive_args.append("-d")
+    if args.file:
+        gdrive_args.append("--file")
+    if args.json:
+        gdrive_args.append("--json")
+    if args.fast_list:
+        gdrive_args.append("--fast-list")
+    if args.cache_ttl is not None:
+        gdrive_args.extend(["--cache-ttl", str(args.cache_ttl)])
+    return gdrive_execute(args.action, *gdrive_args)
+
+
+def run_git_action(args: argparse.Namespace):
+    if not args.action:
+        raise Exception(RUNNER_WARNING_ACTION_MISSING)
+    if args.action == RUNNER_GIT_COMMIT_AND_PUSH and not args.user_message:
+        raise Exception("Missing commit message (use -m or --message)")
+    return run_git_command(args.action, args.user_message)
+
+
+# --- Action registry ---
+
+# Handler nhận args đã parse, trả về exit code (None = 0)
+ActionHandler = Callable[[argparse.Namespace], int | None]
+
+# type -> {action: handler}; key None là lúc chỉ gõ type, không kèm action
+RUNNER_ACTIONS: dict[str, dict[str | None, ActionHandler]] = {
+    RUNNER_TYPE_PY: {
+        RUNNER_PY_ENV: lambda args: py_setup_venv(),
+    },
+    RUNNER_TYPE_CODE: {
+        None: lambda args: open_runner_files_in_vscode(get_ide_prefix(args)),
+        RUNNER_CODE_VSCODE_WORKSPACE: lambda args: open_working_vscode(
+            get_ide_prefix(args), args.value, args.powershell_only
+        ),
+        RUNNER_CODE_TEST: lambda args: open_testing_folder_in_vscode(
+            get_ide_prefix(args)
+        ),
+        RUNNER_CODE_TYPESCRIPT_TEMPLATE: lambda args: (
+            open_typescript_template_in_cursor(get_ide_prefix(args))
+        ),
+        RUNNER_CODE_JS: lambda args: (
+            open_testing_javascript_typescript_folder_in_vscode(get_ide_prefix(args))
+        ),
+        RUNNER_CODE_TS: lambda args: (
+            open_testing_javascript_typescript_folder_in_vscode(get_ide_prefix(args))
+        ),
+        RUNNER_CODE_NESTJS: lambda args: open_template_nestjs_folder_in_vscode(
+            get_ide_prefix(args)
+        ),
+        RUNNER_CODE_PY: lambda args: open_testing_python_folder_in_vscode(
+            get_ide_prefix(args)
+        ),
+        RUNNER_CODE_EXTENSIONS: lambda args: open_vscode_extensions_in_vscode(
+            get_ide_prefix(args)
+        ),
+    },
+    RUNNER_TYPE_RUN: {
+        RUNNER_RUN_TEST_BAT: lambda args: run_test_bat(),
+        RUNNER_RUN_UNIKEY_APP: lambda args: run_Unikey_app(),
+        RUNNER_RUN_CREATE_FILES_IN_FOLDER: lambda args: create_files_in_folder(),
+        RUNNER_RUN_SET_DOWNLOAD_PATH_IN_CHROME: lambda args: (
+            set_download_path_in_chrome(args.value)
+        ),
+        RUNNER_FORMAT_SUBTITLE_TXT_TO_SRT: lambda args: convert_txt_to_srt(args.value),
+        RUNNER_EDIT_PROMPTS: lambda args: edit_prompts(),
+        RUNNER_RENAME_FILES: lambda args: rename_files(
+            args.value, args.extra, args.dry_run
+        ),
+        RUNNER_DELETE_FILES: lambda args: delete_files(
+            args.value, args.extra, args.deep, args.dry_run
+        ),
+        RUNNER_KEEP_FILES: lambda args: keep_files(
+            args.value, args.extra, args.deep, args.dry_run
+        ),
+    },
+    RUNNER_TYPE_OPEN: {
+        None: lambda args: open_runner_files_in_vscode(get_ide_prefix(args)),
+        RUNNER_OPEN_ENV: lambda args: open_environment_variables_panel(),
+        RUNNER_OPEN_PROMPTS_FOLDER: lambda args: open_prompts_folder(),
+        RUNNER_CODE_VSCODE_WORKSPACE: lambda args: (
+            open_vscode_workspaces_in_system_folder()
+        ),
+    },
+    RUNNER_TYPE_PRINT: {
+        RUNNER_PRINT_OS_INFO: lambda args: print_os_info(),
+        RUNNER_PRINT_VSCODE_WORKSPACES: lambda args: print_vscode_workspaces(
+            "D:/D-Documents/VSCode-Workspaces"
+        ),
+        RUNNER_PRINT_DIRECTORY: lambda args: print_runner_files_root_dir(),
+        RUNNER_PRINT_USEFUL_COMMANDS: lambda args: print_useful_commands(),
+        RUNNER_PRINT_CURL: lambda args: print_cURL(),
+        RUNNER_PRINT_STATUSES_INFO: lambda args: print_statuses_info(),
+    },
+    RUNNER_TYPE_DAEMON: {
+        RUNNER_DAEMON_START: lambda args: start_runner_daemon(),
+        RUNNER_DAEMON_STOP: lambda args: stop_runner_daemon(),
+        RUNNER_DAEMON_STATUS: lambda args: print_runner_daemon_status(),
+    },
+}
+
+# Type nhận mọi action: action được chuyển nguyên cho script xử lý
+RUNNER_TYPE_HANDLERS: dict[str, ActionHandler] = {
+    RUNNER_TYPE_INIT: lambda args: cmd_init(),
+    RUNNER_TYPE_GDRIVE: run_gdrive_action,
+    RUNNER_TYPE_GIT: run_git_action,
+}
+
+# Lệnh cần console thật (nhập từ bàn phím, chạy lâu, mở cửa sổ con...):
+# runner daemon không chạy hộ mà để client chạy trực tiếp
+RUNNER_CONSOLE_TYPES = {
+    RUNNER_TYPE_GDRIVE,
+    RUNNER_TYPE_PY,
+    RUNNER_TYPE_INIT,
+    RUNNER_TYPE_DAEMON,
+}
+RUNNER_CONSOLE_ACTIONS = {
+    (RUNNER_TYPE_RUN, RUNNER_RUN_TEST_BAT),
+    (RUNNER_TYPE_RUN, RUNNER_RUN_CREATE_FILES_IN_FOLDER),
+    (RUNNER_TYPE_RUN, RUNNER_FORMAT_SUBTITLE_TXT_TO_SRT),
+    (RUNNER_TYPE_RUN, RUNNER_EDIT_PROMPTS),
+}
+
+
+def dispatch(args: argparse.Namespace) -> int | None:
+    """Tìm handler cho (type, action) trong registry rồi chạy."""
+    if args.type is None:
+        if args.action is None:
+            return print_help()
+        raise Exception(RUNNER_WARNING_TYPE_MISSING)
+
+    type_handler = RUNNER_TYPE_HANDLERS.get(args.type)
+    if type_handler is not None:
+        return type_handler(args)
+
+    actions = RUNNER_ACTIONS.get(args.type)
+    if actions is None:
+        raise Exception(RUNNER_WARNING_TYPE_WRONG)
+    handler = actions.get(args.action)
+    if handler is None:
+        if args.action is None:
+            raise Exception(RUNNER_WARNING_ACTION_MISSING)
+        raise Exception(RUNNER_WARNING_ACTION_WRONG)
+    return handler(args)
+
+
+def create_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="runner",
+        description="runner (Python version) - Command line tool for automating tasks.",
+    )
+    parser.add_argument(
+        "type", nargs="?", default=None, help="Type (open, code, run, print, git)"
+    )
+    parser.add_argument(
+        "action",
+        nargs="?",
+        default=None,
+        help="Action (e.g. env, ws, test, commit, os, stts, curl, dir, test-bat, unikey)",
+    )
+    parser.add_argument(
+        "value",
+        nargs="?",
+        default=None,
+        help="Value (e.g. <remote-name> for gdrive set-remote)",
+    )
+    parser.add_argument(
+        "extra",
+        nargs="?",
+        default=None,
+        help="Extra value (e.g. prefix for rn-files)",
+    )
+    parser.add_argument(
+        "-m",
+        "--message",
+        default=None,
+        dest="user_message",
+        help="User message (for git commit)",
+    )
+    parser.add_argument(
+        "-a",
+        "--antigravity-IDE",
+        default=None,
+        dest="antigravity_IDE",
+        action="store_true",
+        help="Open codes in Antigravity IDE",
+    )
+    parser.add_argument(
+        "-p",
+        "--powershell-only",
+        default=None,
+        dest="powershell_only",
+        action="store_true",
+        help="Only open folders in Windows Terminal (skip IDE)",
+    )
+    parser.add_argument(
+        "--des",
+        action="store_true",
+        help="Show feature description from app_features.yml",
+    )
+    parser.add_argument(
+        "-d",
+        "--deep",
+        default=False,
+        action="store_true",
+        help="Deep recursive action (e.g. for gdrive list)",
+    )
+    parser.add_argument(
+        "-f",
+        "--file",
+        default=False,
+        action="store_true",
+        help="List files instead of folders (for gdrive list)",
+    )
+    parser.add_argument(
+        "-n",
+        "--dry-run",
+        default=False,
+        action="store_true",
+        help="Only show what would be changed (e.g. for del-files)",
+    )
+    parser.add_argument(
+        "--json",
+        default=False,
+        action="store_true",
+        help="Print JSON output (for gdrive list)",
+    )
+    parser.add_argument(
+        "--fast-list",
+        default=False,
+        action="store_true",
+        help="Use rclone --fast-list for deep listing (for gdrive list)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=None,
+        metavar="SECONDS",
+        help="Reuse a cached listing up to SECONDS old, 0 = no cache (gdrive list)",
+    )
+    return parser
 
-    subprocess.run(cmd_args, shell=True)
-    sys.exit(0)
 
+def needs_console(argv: list[str]) -> bool:
+    """Lệnh có cần chạy trực tiếp trong console của người dùng không."""
+    try:
+        args = create_arg_parser().parse_args(argv)
+    except SystemExit:
+        return False  # Sai cú pháp: để run() in lỗi
+    if args.des:
+        return False
+    return (
+        args.type in RUNNER_CONSOLE_TYPES
+        or (args.type, args.action) in RUNNER_CONSOLE_ACTIONS
+    )
 
-# --- Main ---
 
-if __name__ == "__main__":
+def run(argv: list[str] | None = None) -> int | None:
+    """Parse argv rồi chạy lệnh tương ứng, trả về exit code (None = 0)."""
     try:
-        parser = argparse.ArgumentParser(
-            description="runner (Python version) - Command line tool for automating tasks."
-        )
-        parser.add_argument(
-            "type", nargs="?", default=None, help="Type (open, code, run, print, git)"
-        )
-        parser.add_argument(
-            "action",
-            nargs="?",
-            default=None,
-            help="Action (e.g. env, ws, test, commit, os, stts, curl, dir, test-bat, unikey)",
-        )
-        parser.add_argument(
-            "value",
-            nargs="?",
-            default=None,
-            help="Value (e.g. <remote-name> for gdrive set-remote)",
-        )
-        parser.add_argument(
-            "extra",
-            nargs="?",
-            default=None,
-            help="Extra value (e.g. prefix for rn-files)",
-        )
-        parser.add_argument(
-            "-m",
-            "--message",
-            default=None,
-            dest="user_message",
-            help="User message (for git commit)",
-        )
-        parser.add_argument(
-            "-a",
-            "--antigravity-IDE",
-            default=None,
-            dest="antigravity_IDE",
-            action="store_true",
-            help="Open codes in Antigravity IDE",
-        )
-        parser.add_argument(
-            "-p",
-            "--powershell-only",
-            default=None,
-            dest="powershell_only",
-            action="store_true",
-            help="Only open folders in Windows Terminal (skip IDE)",
-        )
-        parser.add_argument(
-            "--des",
-            action="store_true",
-            help="Show feature description from app_features.yml",
-        )
-        parser.add_argument(
-            "-d",
-            "--deep",
-            default=False,
-            action="store_true",
-            help="Deep recursive action (e.g. for gdrive list)",
-        )
-        parser.add_argument(
-            "-f",
-            "--file",
-            default=False,
-            action="store_true",
-            help="List files instead of folders (for gdrive list)",
-        )
-        args = parser.parse_args()
-
-        type_included = args.type
-        action_included = args.action
-        value_included = args.value
-        extra_included = args.extra
-        user_message_included = args.user_message
-        deep_included = args.deep
-        file_included = args.file
-
+        args = create_arg_parser().parse_args(argv)
         if args.des:
-            print_feature_description(type_included, action_included)
-
-        # for coding
-        antigravity_included = args.antigravity_IDE
-        powershell_only_included = args.powershell_only
-        default_ide_prefix: str = "anti" if antigravity_included else "code"
-
-        if type_included == None:
-            if action_included == None:
-                print_help()
-            else:
-                raise Exception(RUNNER_WARNING_TYPE_MISSING)
-        elif type_included == RUNNER_TYPE_PY:
-            if action_included == RUNNER_PY_ENV:
-                py_setup_venv()
-            else:
-                raise Exception(RUNNER_WARNING_ACTION_MISSING)
-        elif type_included == RUNNER_TYPE_INIT:
-            cmd_init()
-        elif type_included == RUNNER_TYPE_GDRIVE:
-            gdrive_args = [value_included, extra_included]
-            if deep_included:
-                gdrive_args.append("-d")
-            if file_included:
-                gdrive_args.append("--file")
-            gdrive_execute(action_included, *gdrive_args)
-        elif type_included == RUNNER_TYPE_CODE:
-            if action_included == None:
-                open_runner_files_in_vscode(default_ide_prefix)
-            elif action_included == RUNNER_CODE_VSCODE_WORKSPACE:
-                open_working_vscode(
-                    default_ide_prefix,
-                    value_included,
-                    powershell_only_included,
-                )
-            elif action_included == RUNNER_CODE_TEST:
-                open_testing_folder_in_vscode(default_ide_prefix)
-            elif action_included == RUNNER_CODE_TYPESCRIPT_TEMPLATE:
-                open_typescript_template_in_cursor(default_ide_prefix)
-            elif action_included == RUNNER_CODE_JS or action_included == RUNNER_CODE_TS:
-                open_testing_javascript_typescript_folder_in_vscode(default_ide_prefix)
-            elif action_included == RUNNER_CODE_NESTJS:
-                open_template_nestjs_folder_in_vscode(default_ide_prefix)
-            elif action_included == RUNNER_CODE_PY:
-                open_testing_python_folder_in_vscode(default_ide_prefix)
-            elif action_included == RUNNER_CODE_EXTENSIONS:
-                open_vscode_extensions_in_vscode(default_ide_prefix)
-            else:
-                raise Exception(RUNNER_WARNING_ACTION_WRONG)
-        elif type_included == RUNNER_TYPE_GIT:
-            if action_included == RUNNER_GIT_COMMIT_AND_PUSH:
-                if not user_message_included:
-                    raise Exception("Missing commit message (use -m or --message)")
-            if not action_included:
-                raise Exception(RUNNER_WARNING_ACTION_MISSING)
-            run_git_command(action_included, user_message_included)
-        elif type_included == RUNNER_TYPE_RUN:
-            if action_included == RUNNER_RUN_TEST_BAT:
-                run_test_bat()
-            elif action_included == RUNNER_RUN_UNIKEY_APP:
-                run_Unikey_app()
-            elif action_included == RUNNER_RUN_CREATE_FILES_IN_FOLDER:
-                create_files_in_folder()
-            elif action_included == RUNNER_RUN_SET_DOWNLOAD_PATH_IN_CHROME:
-                set_download_path_in_chrome(value_included)
-            elif action_included == RUNNER_FORMAT_SUBTITLE_TXT_TO_SRT:
-                convert_txt_to_srt(value_included)
-            elif action_included == RUNNER_EDIT_PROMPTS:
-                edit_prompts()
-            elif action_included == RUNNER_RENAME_FILES:
-                rename_files(value_included, extra_included)
-            elif action_included == RUNNER_DELETE_FILES:
-                delete_files(value_included, extra_included)
-            elif action_included == RUNNER_KEEP_FILES:
-                keep_files(value_included, extra_included)
-            elif action_included == None:
-                raise Exception(RUNNER_WARNING_ACTION_MISSING)
-            else:
-                raise Exception(RUNNER_WARNING_ACTION_WRONG)
-        elif type_included == RUNNER_TYPE_OPEN:
-            if action_included == None:
-                open_runner_files_in_vscode(default_ide_prefix)
-            elif action_included == RUNNER_OPEN_ENV:
-                open_environment_variables_panel()
-            elif action_included == RUNNER_OPEN_PROMPTS_FOLDER:
-                open_prompts_folder()
-            elif action_included == RUNNER_CODE_VSCODE_WORKSPACE:
-                open_vscode_workspaces_in_system_folder()
-            else:
-                raise Exception(RUNNER_WARNING_ACTION_WRONG)
-        elif type_included == RUNNER_TYPE_PRINT:
-            if action_included == RUNNER_PRINT_OS_INFO:
-                print_os_info()
-            elif action_included == RUNNER_PRINT_VSCODE_WORKSPACES:
-                print_vscode_workspaces("D:/D-Documents/VSCode-Workspaces")
-            elif action_included == RUNNER_PRINT_DIRECTORY:
-                print_runner_files_root_dir()
-            elif action_included == RUNNER_PRINT_USEFUL_COMMANDS:
-                print_useful_commands()
-            elif action_included == RUNNER_PRINT_CURL:
-                print_cURL()
-            elif action_included == RUNNER_PRINT_STATUSES_INFO:
-                print_statuses_info()
-            elif action_included == None:
-                raise Exception(RUNNER_WARNING_ACTION_MISSING)
-            else:
-                raise Exception(RUNNER_WARNING_ACTION_WRONG)
-        else:
-            raise Exception(RUNNER_WARNING_TYPE_WRONG)
-
-        # Nếu chạy đến đây (không rẽ nhánh nào) thì báo lỗi.
-        RUNNER_STATUS = "OUT-OF-MAIN-SECTION"
-        print(">>> These commands end up with runner-status: " + RUNNER_STATUS)
-        sys.exit(1)
+            return print_feature_description(args.type, args.action)
+        return dispatch(args)
     except KeyboardInterrupt:
         print("\n\n>>> Tiến trình đã bị hủy bởi người dùng (KeyboardInterrupt).")
-        sys.exit(0)
+        return 0
     except Exception as e:
         warn_user_error(str(e))
-        sys.exit(1)
+        return 1
+
+
+# --- Main ---
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,204 @@
+"""
+Registry các script mà runner gọi tới (useful-codes, system-codes).
+
+Mỗi script expose 1 hàm entry (mặc định `main()`, đọc tham số từ sys.argv như khi
+chạy độc lập). Runner import script lazily rồi gọi hàm đó ngay trong process:
+không tốn thêm 1 lần khởi động Python, load .env và shell cho mỗi lệnh.
+
+Action cần cô lập (chạy lâu, tương tác nhiều bước, đổi trạng thái console...)
+đánh dấu isolated=True -> vẫn chạy bằng subprocess như trước.
+Đặt biến môi trường RUNNER_ISOLATE_ACTIONS=1 để ép mọi action chạy bằng subprocess.
+"""
+
+import contextlib
+import importlib.util
+import os
+import re
+import subprocess
+import sys
+from types import ModuleType
+
+SRC_FOLDER_PATH = os.path.dirname(os.path.abspath(__file__))
+SYSTEM_CODES_FOLDER_PATH = os.path.join(SRC_FOLDER_PATH, "system-codes")
+
+ISOLATE_ALL_ENV_NAME = "RUNNER_ISOLATE_ACTIONS"
+# Tên module của script được import (xem _load_module)
+MODULE_NAME_PREFIX = "runner_action_"
+
+
+class ScriptAction:
+    """1 script runner có thể gọi: đường dẫn + hàm entry + có cần cô lập không."""
+
+    __slots__ = ("script_path", "entry", "isolated")
+
+    def __init__(self, script_path: str, entry: str = "main", isolated: bool = False):
+        self.script_path = script_path
+        self.entry = entry
+        self.isolated = isolated
+
+
+def useful_code(script_name: str, **kwargs) -> ScriptAction:
+    # Đọc env lúc tạo action (sau khi runner đã load .env)
+    folder_path = os.getenv("USEFUL_CODES_FOLDER_PATH") or os.path.join(
+        SRC_FOLDER_PATH, "useful-codes"
+    )
+    return ScriptAction(os.path.join(folder_path, script_name), **kwargs)
+
+
+def system_code(script_name: str, **kwargs) -> ScriptAction:
+    return ScriptAction(os.path.join(SYSTEM_CODES_FOLDER_PATH, script_name), **kwargs)
+
+
+# Script đã import trong process này: đường dẫn -> (module, file của script và các
+# module dùng chung cùng thư mục -> mtime lúc import). Runner daemon sống lâu nên
+# script hoặc module dùng chung bên cạnh bị sửa thì import lại
+_loaded_modules: dict[str, tuple[ModuleType, dict[str, int | None]]] = {}
+# Module dùng chung đang có trong sys.modules: tên module -> mtime lúc import
+_shared_module_mtimes: dict[str, int | None] = {}
+
+
+def _file_mtime(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _folder_module_files(folder: str) -> dict[str, str]:
+    """Module dùng chung đã import từ folder (không tính các script): tên -> file."""
+    files = {}
+    for name, module in list(sys.modules.items()):
+        if name.startswith(MODULE_NAME_PREFIX):
+            continue
+        path = getattr(module, "__file__", None)
+        if path and os.path.dirname(os.path.abspath(path)) == folder:
+            files[name] = path
+    return files
+
+
+def _is_changed(mtimes: dict[str, int | None]) -> bool:
+    return any(_file_mtime(path) != mtime_ns for path, mtime_ns in mtimes.items())
+
+
+def _load_module(script_path: str) -> ModuleType:
+    """
+    Import script theo đường dẫn (thư mục có dấu '-' nên không import thường).
+    Thư mục của script được thêm vào sys.path để script import được module dùng
+    chung bên cạnh nó (VD: `from _file_utils import ...`) như khi chạy độc lập.
+    """
+    cached = _loaded_modules.get(script_path)
+    if cached is not None and not _is_changed(cached[1]):
+        return cached[0]
+
+    folder = os.path.dirname(os.path.abspath(script_path))
+    if folder not in sys.path:
+        sys.path.append(folder)
+    # Module dùng chung đã bị sửa -> bỏ khỏi sys.modules để script import bản mới
+    for name, path in _folder_module_files(folder).items():
+        if name in _shared_module_mtimes and (
+            _file_mtime(path) != _shared_module_mtimes[name]
+        ):
+            sys.modules.pop(name, None)
+            del _shared_module_mtimes[name]
+
+    mtime_ns = os.stat(script_path).st_mtime_ns
+    stem = os.path.splitext(os.path.basename(script_path))[0]
+    module_name = MODULE_NAME_PREFIX + re.sub(r"\W", "_", stem)
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load script: {script_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(module_name, None)
+        raise
+    mtimes: dict[str, int | None] = {script_path: mtime_ns}
+    for name, path in _folder_module_files(folder).items():
+        if name not in _shared_module_mtimes:
+            _shared_module_mtimes[name] = _file_mtime(path)
+        mtimes[path] = _shared_module_mtimes[name]
+    _loaded_modules[script_path] = (module, mtimes)
+    return module
+
+
+def _to_exit_code(code) -> int:
+    """Chuẩn hoá giá trị return / SystemExit.code về exit code như khi chạy process."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+# Process con đang được chuyển tiếp output (xem run_isolated)
+_piped_processes: set[subprocess.Popen] = set()
+
+
+def run_isolated(action: ScriptAction, args: list[str]) -> int:
+    """
+    Chạy script trong 1 process Python riêng (cùng interpreter với runner).
+    stdout/stderr của runner đang bị chuyển hướng (VD: lệnh chạy trong runner
+    daemon) -> đọc output của process con qua pipe rồi ghi vào sys.stdout, thay vì
+    để process con ghi thẳng ra console (DEVNULL) của runner.
+    """
+    command = [sys.executable, action.script_path, *args]
+    if sys.stdout is sys.__stdout__ and sys.stderr is sys.__stderr__:
+        return subprocess.run(command).returncode
+
+    env = dict(os.environ, PYTHONIOENCODING="utf-8", PYTHONUNBUFFERED="1")
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env=env,
+        encoding="utf-8",
+        errors="replace",
+    )
+    _piped_processes.add(process)
+    try:
+        for line in process.stdout:
+            sys.stdout.write(line)
+        return process.wait()
+    finally:
+        _piped_processes.discard(process)
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+
+
+def kill_piped_processes() -> None:
+    """Dừng các process con đang chạy qua pipe (VD: client của daemon đã ngắt)."""
+    for process in list(_piped_processes):
+        with contextlib.suppress(OSError):
+            process.kill()
+
+
+def run_action(action: ScriptAction, *args: str | None) -> int:
+    """
+    Chạy action với các tham số (bỏ qua tham số None), trả về exit code.
+    Không import được script (VD: thiếu thư viện) -> chuyển sang chạy subprocess.
+    """
+    script_args = [arg for arg in args if arg is not None]
+    if action.isolated or os.getenv(ISOLATE_ALL_ENV_NAME) == "1":
+        return run_isolated(action, script_args)
+
+    try:
+        entry = getattr(_load_module(action.script_path), action.entry)
+    except (OSError, ImportError, AttributeError) as e:
+        print(f">>> Warn: Cannot run '{action.script_path}' in-process ({e}).")
+        return run_isolated(action, script_args)
+
+    # Script đọc tham số từ sys.argv như khi chạy độc lập
+    saved_argv = sys.argv
+    sys.argv = [action.script_path, *script_args]
+    try:
+        return _to_exit_code(entry())
+    except SystemExit as e:
+        return _to_exit_code(e.code)
+    finally:
+        sys.argv = saved_argv
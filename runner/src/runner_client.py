@@ -0,0 +1,153 @@
+"""
+Client mỏng cho runner (entry point của runner.cmd).
+
+- Có runner daemon đang chạy (`runner daemon start`) -> gửi argv + cwd qua socket
+  local, nhận lại stdout/stderr/exit code: không phải import argparse, dotenv, parse
+  .env... cho mỗi lệnh
+- Không có daemon, daemon đã cũ hoặc lệnh cần console (nhập từ bàn phím, chạy lâu)
+  -> chạy main.py trực tiếp ngay trong process này
+File này chỉ được import các module nhẹ để giữ thời gian khởi động thấp.
+"""
+
+import json
+import os
+import socket
+import sys
+import time
+
+SRC_FOLDER_PATH = os.path.dirname(os.path.abspath(__file__))
+MAIN_SCRIPT_PATH = os.path.join(SRC_FOLDER_PATH, "main.py")
+
+# Module dùng chung với các script trong useful-codes (thư mục cache của runner)
+sys.path.append(os.path.join(SRC_FOLDER_PATH, "useful-codes"))
+from _cache_utils import cache_path  # noqa: E402
+
+# Thời gian chờ kết nối tới daemon trước khi chuyển sang chạy trực tiếp
+DAEMON_CONNECT_TIMEOUT_SECONDS = 0.3
+# Thời gian chờ daemon xác nhận đã nhận lệnh (port trong daemon.json cũ có thể đã
+# thuộc process khác, process đó sẽ không xác nhận)
+DAEMON_ACCEPT_TIMEOUT_SECONDS = 2
+# Đọc socket theo từng khoảng ngắn để Ctrl+C luôn có hiệu lực (trên Windows,
+# recv() chặn không có timeout sẽ bỏ qua Ctrl+C)
+SOCKET_POLL_SECONDS = 0.5
+
+
+def daemon_info_path() -> str:
+    """File chứa port + token của daemon đang chạy (chỉ user hiện tại đọc được)."""
+    return cache_path("daemon.json")
+
+
+def read_daemon_info() -> dict | None:
+    try:
+        with open(daemon_info_path(), "r", encoding="utf-8") as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(info, dict) or "port" not in info or "token" not in info:
+        return None
+    return info
+
+
+def connect_to_daemon(info: dict) -> socket.socket | None:
+    try:
+        return socket.create_connection(
+            ("127.0.0.1", int(info["port"])), timeout=DAEMON_CONNECT_TIMEOUT_SECONDS
+        )
+    except (OSError, ValueError):
+        return None
+
+
+def send_message(sock_file, message: dict) -> None:
+    """Gửi 1 message JSON trên 1 dòng."""
+    sock_file.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+    sock_file.flush()
+
+
+def iter_messages(sock: socket.socket, first_message_timeout: float):
+    """
+    Đọc các message JSON (mỗi dòng 1 message) tới khi daemon đóng kết nối.
+    Không nhận được message đầu tiên sau first_message_timeout giây -> TimeoutError.
+    """
+    sock.settimeout(SOCKET_POLL_SECONDS)
+    deadline = time.monotonic() + first_message_timeout
+    has_message = False
+    buffer = b""
+    while True:
+        try:
+            chunk = sock.recv(65536)
+        except TimeoutError:
+            if not has_message and time.monotonic() > deadline:
+                raise
+            continue
+        if not chunk:
+            return
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            has_message = True
+            yield json.loads(line)
+
+
+def run_via_daemon(argv: list[str]) -> int | None:
+    """Chạy lệnh qua daemon, trả về exit code; None nếu cần chạy trực tiếp."""
+    info = read_daemon_info()
+    if info is None:
+        return None
+    sock = connect_to_daemon(info)
+    if sock is None:
+        return None
+
+    # Đóng socket (kể cả khi Ctrl+C) -> daemon dừng lệnh đang chạy
+    with sock, sock.makefile("wb") as sock_file:
+        try:
+            send_message(
+                sock_file, {"token": info["token"], "argv": argv, "cwd": os.getcwd()}
+            )
+            messages = iter_messages(sock, DAEMON_ACCEPT_TIMEOUT_SECONDS)
+            reply = next(messages, None)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(reply, dict) or not reply.get("accepted"):
+            return None  # "fallback" hoặc không phải daemon
+
+        try:
+            for message in messages:
+                if "data" in message:
+                    stream = (
+                        sys.stderr if message.get("stream") == "err" else sys.stdout
+                    )
+                    stream.write(message["data"])
+                    stream.flush()
+                elif message.get("fallback"):
+                    return None
+                elif "exit" in message:
+                    return message["exit"]
+        except (OSError, ValueError) as e:
+            print(f">>> Warn: Runner daemon connection lost ({e}).", file=sys.stderr)
+            return 1
+    # Daemon đóng kết nối giữa chừng (bị tắt/crash)
+    return 1
+
+
+def run_directly(argv: list[str]) -> None:
+    """Chạy main.py ngay trong process này, giống như gọi `py main.py ...`."""
+    import runpy
+
+    sys.argv = [MAIN_SCRIPT_PATH, *argv]
+    runpy.run_path(MAIN_SCRIPT_PATH, run_name="__main__")
+
+
+def main():
+    argv = sys.argv[1:]
+    try:
+        exit_code = run_via_daemon(argv)
+    except KeyboardInterrupt:
+        print("\n\n>>> Tiến trình đã bị hủy bởi người dùng (KeyboardInterrupt).")
+        sys.exit(0)
+    if exit_code is None:
+        run_directly(argv)
+        return
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+Runner daemon: process chạy nền giữ sẵn main.py + các script đã import (module
+"ấm"), nhận lệnh từ runner_client.py qua socket local (127.0.0.1).
+
+- Thread accept: xác thực token, trả lời ngay "ping"/"stop"/"fallback", xác nhận
+  "accepted" rồi đưa lệnh vào hàng đợi (kể cả khi đang bận chạy lệnh khác)
+- Main thread chạy lần lượt từng lệnh (stdout/cwd là trạng thái chung của
+  process): đổi cwd theo client, chạy main.run(argv), stdout/stderr được gửi dần
+  về client, cuối cùng gửi exit code
+- Client ngắt kết nối khi lệnh còn chạy (VD: Ctrl+C) -> dừng lệnh như Ctrl+C
+- Lệnh cần console (nhập từ bàn phím, chạy lâu) -> trả "fallback" cho client tự
+  chạy trực tiếp
+- Code runner bị sửa (WATCHED_FILE_PATHS) -> daemon tự tắt, client chạy trực tiếp
+- Chỉ client đọc được file daemon.json (có token) mới gửi lệnh được
+
+Chạy: `runner daemon start` / `runner daemon stop` / `runner daemon status`
+"""
+
+import _thread
+import contextlib
+import io
+import json
+import os
+import queue
+import secrets
+import socket
+import sys
+import threading
+
+import runner_actions
+from runner_client import daemon_info_path, read_daemon_info, send_message
+
+SRC_FOLDER_PATH = os.path.dirname(os.path.abspath(__file__))
+# Sửa các file này thì daemon phải khởi động lại mới thấy thay đổi
+WATCHED_FILE_PATHS = [
+    os.path.join(SRC_FOLDER_PATH, "main.py"),
+    os.path.join(SRC_FOLDER_PATH, "runner_actions.py"),
+    os.path.join(SRC_FOLDER_PATH, "runner_client.py"),
+    os.path.join(SRC_FOLDER_PATH, "runner_daemon.py"),
+]
+
+# Thời gian chờ client gửi request sau khi kết nối
+REQUEST_READ_TIMEOUT_SECONDS = 2
+
+
+class _SocketStream(io.TextIOBase):
+    """stdout/stderr giả: mỗi lần write gửi ngay 1 message về client."""
+
+    def __init__(self, sock_file, stream_name: str):
+        self._sock_file = sock_file
+        self._stream_name = stream_name
+
+    @property
+    def encoding(self):
+        return "utf-8"
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return False
+
+    def write(self, text: str) -> int:
+        if text:
+            send_message(self._sock_file, {"stream": self._stream_name, "data": text})
+        return len(text)
+
+
+def _files_mtime() -> list[int | None]:
+    mtimes: list[int | None] = []
+    for path in WATCHED_FILE_PATHS:
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return mtimes
+
+
+def _write_daemon_info(port: int, token: str) -> None:
+    info_path = daemon_info_path()
+    os.makedirs(os.path.dirname(info_path), exist_ok=True)
+    tmp_path = info_path + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"port": port, "token": token, "pid": os.getpid()}, f)
+    os.replace(tmp_path, info_path)
+
+
+def _remove_daemon_info(token: str) -> None:
+    # Chỉ xoá nếu file vẫn là của daemon này (có thể đã có daemon mới ghi đè)
+    info = read_daemon_info()
+    if info is not None and info.get("token") == token:
+        with contextlib.suppress(OSError):
+            os.remove(daemon_info_path())
+
+
+def _close_connection(conn: socket.socket, sock_file) -> None:
+    with contextlib.suppress(OSError):
+        sock_file.close()
+    with contextlib.suppress(OSError):
+        # shutdown để thread đang chờ recv() trên conn cũng thoát ra
+        conn.shutdown(socket.SHUT_RDWR)
+    conn.close()
+
+
+class RunnerDaemon:
+    def __init__(self):
+        self._token = secrets.token_hex(16)
+        self._started_mtimes = _files_mtime()
+        self._is_running = False
+        # Lệnh chờ chạy trên main thread: (conn, sock_file, request); None = dừng
+        self._requests: queue.Queue = queue.Queue()
+        # Giữ khi đánh dấu lệnh đã xong, để watcher không ngắt nhầm lệnh sau
+        self._command_lock = threading.Lock()
+        import main as runner_main
+
+        self._runner_main = runner_main
+
+    def serve_forever(self) -> None:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen(socket.SOMAXCONN)
+            _write_daemon_info(server.getsockname()[1], self._token)
+            self._is_running = True
+            threading.Thread(
+                target=self._accept_loop, args=(server,), daemon=True
+            ).start()
+            try:
+                while self._is_running:
+                    item = self._requests.get()
+                    if item is None:
+                        break
+                    conn, sock_file, request = item
+                    try:
+                        self._handle_request(conn, sock_file, request)
+                    except OSError as e:
+                        # Client ngắt kết nối giữa chừng (VD: Ctrl+C)
+                        print(f">>> Error serving runner client: {e}")
+                    except KeyboardInterrupt:
+                        print(">>> Warn: Runner client disconnected, command stopped.")
+                    finally:
+                        _close_connection(conn, sock_file)
+            finally:
+                self._is_running = False
+                _remove_daemon_info(self._token)
+                self._reject_pending_requests()
+
+    def _stop(self) -> None:
+        self._is_running = False
+        self._requests.put(None)
+
+    def _reject_pending_requests(self) -> None:
+        """Daemon tắt khi còn lệnh trong hàng đợi -> để các client tự chạy."""
+        while True:
+            try:
+                item = self._requests.get_nowait()
+            except queue.Empty:
+                return
+            if item is None:
+                continue
+            conn, sock_file, _ = item
+            with contextlib.suppress(OSError):
+                send_message(sock_file, {"fallback": True})
+            _close_connection(conn, sock_file)
+
+    def _accept_loop(self, server: socket.socket) -> None:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return  # Socket server đã đóng
+            self._accept_connection(conn)
+
+    def _accept_connection(self, conn: socket.socket) -> None:
+        """Xác thực request, trả lời ngay hoặc đưa lệnh vào hàng đợi."""
+        sock_file = conn.makefile("rwb")
+        try:
+            conn.settimeout(REQUEST_READ_TIMEOUT_SECONDS)
+            request = json.loads(sock_file.readline())
+            if not isinstance(request, dict) or not secrets.compare_digest(
+                str(request.get("token", "")), self._token
+            ):
+                raise ValueError("invalid request")
+
+            command = request.get("command")
+            if command == "ping":
+                send_message(sock_file, {"pong": os.getpid()})
+            elif command == "stop":
+                send_message(sock_file, {"exit": 0})
+                self._stop()
+            elif not self._is_running or self._needs_fallback(request):
+                send_message(sock_file, {"fallback": True})
+            else:
+                # Lệnh có thể chạy lâu: bỏ timeout, main thread đóng kết nối sau
+                conn.settimeout(None)
+                send_message(sock_file, {"accepted": True})
+                self._requests.put((conn, sock_file, request))
+                return
+        except (OSError, ValueError):
+            pass
+        _close_connection(conn, sock_file)
+
+    def _needs_fallback(self, request: dict) -> bool:
+        """Lệnh phải để client tự chạy trực tiếp."""
+        if _files_mtime() != self._started_mtimes:
+            # Code runner đã đổi: để client chạy bản mới, daemon tự tắt
+            self._stop()
+            return True
+        argv = [str(arg) for arg in request.get("argv", [])]
+        return self._runner_main.needs_console(argv)
+
+    def _handle_request(self, conn: socket.socket, sock_file, request: dict) -> None:
+        argv = [str(arg) for arg in request.get("argv", [])]
+        exit_code = self._run_command(argv, request.get("cwd"), conn, sock_file)
+        send_message(sock_file, {"exit": exit_code})
+
+    def _watch_client(self, conn: socket.socket, command_done: threading.Event):
+        """Client đóng kết nối khi lệnh còn chạy -> dừng lệnh như Ctrl+C."""
+        with contextlib.suppress(OSError):
+            while conn.recv(1024):
+                pass  # Client không gửi gì thêm sau request
+        with self._command_lock:
+            if command_done.is_set():
+                return
+            runner_actions.kill_piped_processes()
+            _thread.interrupt_main()
+
+    def _run_command(
+        self, argv: list[str], cwd: str | None, conn: socket.socket, sock_file
+    ) -> int:
+        saved_cwd = os.getcwd()
+        saved_stdin = sys.stdin
+        stdout = _SocketStream(sock_file, "out")
+        stderr = _SocketStream(sock_file, "err")
+        command_done = threading.Event()
+        threading.Thread(
+            target=self._watch_client, args=(conn, command_done), daemon=True
+        ).start()
+        try:
+            if cwd:
+                os.chdir(cwd)
+            # Lệnh lỡ đọc stdin thì nhận EOF ngay, không treo daemon
+            sys.stdin = io.StringIO("")
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    exit_code = self._runner_main.run(argv)
+                except SystemExit as e:
+                    exit_code = e.code
+                except Exception as e:
+                    print(f">>> Error running command in daemon: {e}", file=sys.stderr)
+                    exit_code = 1
+        finally:
+            with self._command_lock:
+                command_done.set()
+            sys.stdin = saved_stdin
+            with contextlib.suppress(OSError):
+                os.chdir(saved_cwd)
+        if exit_code is None:
+            return 0
+        return exit_code if isinstance(exit_code, int) else 1
+
+
+def start_daemon_process() -> int:
+    """Chạy daemon ở process nền tách khỏi console hiện tại."""
+    import subprocess
+
+    if read_daemon_info() is not None and daemon_status() == 0:
+        print(">>> Runner daemon is already running.")
+        return 0
+    kwargs: dict = {}
+    if os.name == "nt":
+        kwargs["creationflags"] = (
+            subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        )
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        **kwargs,
+    )
+    print(">>> Runner daemon started.")
+    return 0
+
+
+def _send_command(command: str) -> dict | None:
+    info = read_daemon_info()
+    if info is None:
+        return None
+    try:
+        with socket.create_connection(
+            ("127.0.0.1", int(info["port"])), timeout=2
+        ) as sock, sock.makefile("rwb") as sock_file:
+            send_message(sock_file, {"token": info["token"], "command": command})
+            line = sock_file.readline()
+        reply = json.loads(line) if line else None
+    except (OSError, ValueError):
+        return None
+    return reply if isinstance(reply, dict) else None
+
+
+def stop_daemon() -> int:
+    if _send_command("stop") is None:
+        print(">>> Runner daemon is not running.")
+        return 0
+    print(">>> Runner daemon stopped.")
+    return 0
+
+
+def daemon_status() -> int:
+    """0 nếu daemon đang chạy (kết nối + xác thực được), 1 nếu không."""
+    info = read_daemon_info()
+    if info is None:
+        return 1
+    # Daemon trả lời "ping" bằng pid của nó (kể cả khi đang chạy lệnh khác);
+    # port trong daemon.json cũ có thể đã thuộc process khác
+    reply = _send_command("ping")
+    if reply is None or reply.get("pong") != info.get("pid"):
+        return 1
+    return 0
+
+
+def main():
+    RunnerDaemon().serve_forever()
+
+
+if __name__ == "__main__":
+    main()
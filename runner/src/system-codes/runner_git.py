@@ -16,21 +16,19 @@ python runner_git.py commit "update readme"
 
 Constants:
 RUNNER_GIT_TYPE: The supported git operation ("commit")
-RUNNER_ROOT_DIR: Root directory path for the runner project
+ROOT_FOLDER_PATH (env): Root directory path for the runner project
 """
 
 import sys
 import subprocess
 import os
-from dotenv import load_dotenv
-
-load_dotenv(dotenv_path="D:/D-Documents/TOOLs/runner/.env")
 
 RUNNER_GIT_TYPE = "commit"
 RUNNER_GIT_REMOTE = "remote"
-RUNNER_ROOT_DIR = os.getenv("ROOT_FOLDER_PATH")
 
-if __name__ == "__main__":
+
+def main():
+    runner_root_dir = os.getenv("ROOT_FOLDER_PATH")
     if len(sys.argv) < 2:
         print(">>> No valid git command found.")
         sys.exit(1)
@@ -41,12 +39,19 @@ if __name__ == "__main__":
             sys.exit(1)
         commit_message = " ".join(sys.argv[2:])  # Lấy toàn bộ phần còn lại
         cmd = (
-            f'wt nt -d "{RUNNER_ROOT_DIR}" '
+            f'wt nt -d "{runner_root_dir}" '
             f'cmd /k "git add . && git commit -m \\"{commit_message}\\" && git push origin main"'
         )
         subprocess.run(cmd, shell=True)
     elif git_type == RUNNER_GIT_REMOTE:
-        cmd = f'wt nt -d "{RUNNER_ROOT_DIR}" ' f'cmd /k "git remote -v"'
+        cmd = f'wt nt -d "{runner_root_dir}" ' f'cmd /k "git remote -v"'
         subprocess.run(cmd, shell=True)
     else:
         print(">>> No valid git command found.")
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path="D:/D-Documents/TOOLs/runner/.env")
+    main()
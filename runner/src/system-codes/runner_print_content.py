@@ -1,19 +1,24 @@
 import os
-from dotenv import load_dotenv
 import sys
 
-content_filename = sys.argv[1]
-if not content_filename:
-    print(">>> Error: No content filename provided.")
-    sys.exit(1)
 
-load_dotenv(dotenv_path="D:/D-Documents/TOOLs/runner/.env")
-CONTENTS_FOLDER_PATH = os.getenv("CONTENTS_FOLDER_PATH")
-help_file = f"{CONTENTS_FOLDER_PATH}/{content_filename}"
+def main():
+    content_filename = sys.argv[1] if len(sys.argv) > 1 else ""
+    if not content_filename:
+        print(">>> Error: No content filename provided.")
+        sys.exit(1)
 
-if __name__ == "__main__":
+    contents_folder_path = os.getenv("CONTENTS_FOLDER_PATH")
+    help_file = f"{contents_folder_path}/{content_filename}"
     try:
         with open(help_file, "r", encoding="utf-8") as f:
             print(f.read())
     except Exception as e:
         print(">>> Error reading help file:", e)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path="D:/D-Documents/TOOLs/runner/.env")
+    main()
@@ -1,14 +1,18 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv(dotenv_path="D:/D-Documents/TOOLs/runner/.env")
 
-CONTENTS_FOLDER_PATH = os.getenv("CONTENTS_FOLDER_PATH")
-statuses_file = rf"{CONTENTS_FOLDER_PATH}/statuses.txt"
-
-if __name__ == "__main__":
+def main():
+    contents_folder_path = os.getenv("CONTENTS_FOLDER_PATH")
+    statuses_file = rf"{contents_folder_path}/statuses.txt"
     try:
         with open(statuses_file, "r", encoding="utf-8") as f:
             print(f.read())
     except Exception as e:
         print(">>> Error reading statuses file:", e)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path="D:/D-Documents/TOOLs/runner/.env")
+    main()
@@ -0,0 +1,55 @@
+"""
+Thư mục cache của runner (%LOCALAPPDATA%/runner, không có thì ~/.cache/runner) và
+đọc/ghi file cache JSON có version. Dùng chung cho runner_client.py và các script
+trong useful-codes; chỉ import thư viện nhẹ để không làm chậm khởi động runner.
+"""
+
+import json
+import os
+
+
+def cache_path(*parts: str) -> str:
+    """cache_path("daemon.json") -> <thư mục cache>/daemon.json"""
+    base_dir = os.getenv("LOCALAPPDATA") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base_dir, "runner", *parts)
+
+
+def read_json_cache(path: str, version: int) -> dict | None:
+    """
+    Nội dung file cache, None nếu chưa có / hỏng / khác version (tăng version khi đổi
+    cấu trúc cache -> cache cũ tự bị bỏ).
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get("version") != version:
+        return None
+    return cache
+
+
+def write_json_cache(
+    path: str, version: int, data: dict, indent: int | None = None
+) -> None:
+    """
+    Ghi {"version": version, **data} ra file tạm rồi đổi tên, để process khác không
+    bao giờ đọc phải file ghi dở. Cache chỉ để tăng tốc: ghi lỗi thì chỉ in cảnh báo,
+    lần sau tính lại.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": version, **data}, f, ensure_ascii=False, indent=indent
+            )
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f">>> Error writing cache '{path}': {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
@@ -0,0 +1,108 @@
+"""
+Hàm dùng chung cho các script xử lý file theo extension (delete_files.py,
+keep_files_with_ext.py). Không phải action của runner.
+"""
+
+import contextlib
+import os
+import sys
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+# Số thread mặc định khi duyệt thư mục / xóa file (chủ yếu là chờ I/O, nhất là ổ mạng)
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+
+def normalize_ext_list(ext_list: list[str]) -> set[str]:
+    """['.TXT', 'jpg', ' tar.gz '] -> {'txt', 'jpg', 'tar.gz'}."""
+    exts = set()
+    for ext in ext_list:
+        # Chuẩn hóa extension: bỏ dấu chấm thừa, lowercase
+        ext = ext.strip().lstrip(".").lower()
+        if ext:
+            exts.add(ext)
+    return exts
+
+
+def is_hidden(filename: str) -> bool:
+    return filename.startswith(".")
+
+
+def is_junction(entry: os.DirEntry) -> bool:
+    """Junction của Windows: is_dir(follow_symlinks=False) vẫn True, không duyệt vào."""
+    is_junction_method = getattr(entry, "is_junction", None)  # Python 3.12+
+    return is_junction_method is not None and is_junction_method()
+
+
+def match_ext(filename: str, exts: set[str]) -> str | None:
+    """
+    Extension (trong exts) mà filename kết thúc bằng, ưu tiên extension dài nhất
+    ('a.tar.gz' khớp 'tar.gz' trước 'gz'). File ẩn (tên bắt đầu bằng '.') không khớp
+    extension nào; các script không bao giờ xóa file ẩn (giống glob('*.ext')).
+    """
+    if is_hidden(filename):
+        return None
+    name = filename.lower()
+    dot = name.find(".")
+    while dot != -1:
+        ext = name[dot + 1 :]
+        if ext in exts:
+            return ext
+        dot = name.find(".", dot + 1)
+    return None
+
+
+def format_size(size: float) -> str:
+    if size < 1024:
+        return f"{size:.0f} B"
+    size /= 1024
+    for unit in ("KB", "MB"):
+        if size < 1024:
+            return f"{size:.2f} {unit}"
+        size /= 1024
+    return f"{size:.2f} GB"
+
+
+def print_lines(lines: list[str]) -> None:
+    """In nhiều dòng bằng 1 lần write (nhanh hơn print từng dòng)."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+@contextlib.contextmanager
+def cancel_pending_on_interrupt(pool: ThreadPoolExecutor):
+    """
+    Bị dừng giữa chừng (Ctrl+C, client của runner daemon ngắt...): hủy các task còn
+    trong hàng đợi của pool thay vì chờ chúng chạy hết.
+    """
+    try:
+        yield
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+
+
+def walk_dirs(
+    folder: str,
+    scan_dir: Callable[[str], Any],
+    on_result: Callable[[Any], None],
+    workers: int = DEFAULT_WORKERS,
+) -> None:
+    """
+    Duyệt folder và mọi thư mục con bằng thread pool: mỗi thư mục là 1 task
+    scan_dir(path), các thư mục con trong kết quả (result.subdirs) được đưa vào
+    pool ngay khi quét thấy. on_result chạy trên thread hiện tại, lần lượt với kết
+    quả của từng thư mục.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending: set[Future] = {pool.submit(scan_dir, folder)}
+        with cancel_pending_on_interrupt(pool):
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    pending.update(
+                        pool.submit(scan_dir, subdir) for subdir in result.subdirs
+                    )
+                    on_result(result)
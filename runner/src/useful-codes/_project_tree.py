@@ -0,0 +1,383 @@
+"""
+Ghi cây thư mục của 1 project ra file (áp dụng .gitignore, duyệt bằng scandir).
+Dùng chung cho runner/print_project_tree.py và
+gdrive-tool/sync-with-gdrive/scripts/print_project_tree.py: mỗi script chỉ gọi
+main() với thư mục gốc, file kết quả, thư mục loại trừ và cách sắp xếp riêng.
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+from collections.abc import Callable, Iterable
+from typing import Any
+
+GITIGNORE_FILE_NAME = ".gitignore"
+
+# Key sắp xếp entry trong 1 thư mục, nhận (entry, is_dir)
+SortKey = Callable[[tuple[os.DirEntry, bool]], Any]
+
+
+def sort_by_name(item: tuple[os.DirEntry, bool]) -> str:
+    return item[0].name
+
+
+def sort_dirs_first(item: tuple[os.DirEntry, bool]) -> tuple[bool, str]:
+    """Thư mục trước, file sau, không phân biệt hoa thường."""
+    return not item[1], item[0].name.lower()
+
+
+def _glob_to_regex(glob: str) -> str:
+    """Pattern kiểu .gitignore -> regex (so với path dạng a/b/c, không có '/' đầu)."""
+    regex = []
+    i = 0
+    while i < len(glob):
+        char = glob[i]
+        if char == "*":
+            if glob.startswith("**", i):
+                if glob.startswith("**/", i):
+                    regex.append("(?:.*/)?")  # "**/" khớp 0 hoặc nhiều cấp thư mục
+                    i += 3
+                    continue
+                regex.append(".*")
+                i += 2
+                continue
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[":
+            end = glob.find("]", i + 2)
+            if end == -1:
+                regex.append(re.escape(char))
+            else:
+                content = glob[i + 1 : end].replace("\\", "\\\\")
+                if content.startswith("!"):
+                    content = "^" + content[1:]
+                regex.append(f"[{content}]")
+                i = end
+        elif char == "\\" and i + 1 < len(glob):
+            i += 1
+            regex.append(re.escape(glob[i]))
+        else:
+            regex.append(re.escape(char))
+        i += 1
+    return "".join(regex)
+
+
+def parse_gitignore(file_path: str, base_rel: str) -> list[tuple[str, bool, bool]]:
+    """
+    Đọc 1 file .gitignore -> [(regex, is_negation, dir_only)].
+    base_rel: path của thư mục chứa file (so với thư mục gốc), rule chỉ áp dụng
+    bên trong thư mục đó.
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+
+    base = re.escape(base_rel + "/") if base_rel else ""
+    rules = []
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        is_negation = line.startswith("!")
+        if is_negation:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]  # "\#file", "\!file"
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        # Có "/" ở đầu hoặc giữa -> chỉ khớp tính từ thư mục chứa .gitignore
+        is_anchored = "/" in line
+        line = line.lstrip("/")
+        if not line:
+            continue
+        any_level = "" if is_anchored else "(?:.*/)?"
+        rules.append((base + any_level + _glob_to_regex(line), is_negation, dir_only))
+    return rules
+
+
+class IgnoreRules:
+    """Tập rule .gitignore đang áp dụng cho 1 thư mục (gồm cả rule của thư mục cha)."""
+
+    __slots__ = ("rules", "_ordered", "_any_regex", "_dir_regex")
+
+    def __init__(self, rules: list[tuple[str, bool, bool]]):
+        self.rules = rules
+        self._ordered = None
+        self._any_regex = None
+        self._dir_regex = None
+        if any(is_negation for _, is_negation, _ in rules):
+            # Có "!pattern" -> phải xét theo thứ tự, rule sau cùng khớp sẽ quyết định
+            self._ordered = [
+                (re.compile(regex), is_negation, dir_only)
+                for regex, is_negation, dir_only in reversed(rules)
+            ]
+            return
+        # Không có "!pattern" -> gộp thành 1 regex, mỗi entry chỉ match 1-2 lần
+        any_patterns = [regex for regex, _, dir_only in rules if not dir_only]
+        dir_patterns = [regex for regex, _, dir_only in rules if dir_only]
+        if any_patterns:
+            self._any_regex = re.compile("|".join(f"(?:{p})" for p in any_patterns))
+        if dir_patterns:
+            self._dir_regex = re.compile("|".join(f"(?:{p})" for p in dir_patterns))
+
+    def extend(self, rules: list[tuple[str, bool, bool]]) -> "IgnoreRules":
+        return IgnoreRules(self.rules + rules) if rules else self
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        if self._ordered is not None:
+            for regex, is_negation, dir_only in self._ordered:
+                if (is_dir or not dir_only) and regex.fullmatch(rel_path):
+                    return not is_negation
+            return False
+        if self._any_regex is not None and self._any_regex.fullmatch(rel_path):
+            return True
+        return (
+            is_dir
+            and self._dir_regex is not None
+            and self._dir_regex.fullmatch(rel_path) is not None
+        )
+
+
+def _join_rel(parent_rel: str, name: str) -> str:
+    return f"{parent_rel}/{name}" if parent_rel else name
+
+
+def list_dir(
+    dir_path: str,
+    dir_rel: str,
+    rules: IgnoreRules | None,
+    exclude_dirs: set[str],
+    sort_key: SortKey | None = sort_by_name,
+) -> tuple[list[tuple[os.DirEntry, bool]], IgnoreRules | None]:
+    """
+    1 lượt os.scandir: [(entry, is_dir)] đã lọc + sắp xếp theo sort_key (None: không
+    sắp xếp), và rule áp dụng cho các entry bên trong (thêm rule của .gitignore
+    trong thư mục này nếu có).
+    """
+    try:
+        with os.scandir(dir_path) as it:
+            entries = list(it)
+    except OSError as e:
+        print(f">>> Error reading {dir_path}: {e}", file=sys.stderr)
+        return [], rules
+
+    if rules is not None and any(e.name == GITIGNORE_FILE_NAME for e in entries):
+        gitignore_path = os.path.join(dir_path, GITIGNORE_FILE_NAME)
+        rules = rules.extend(parse_gitignore(gitignore_path, dir_rel))
+
+    result = []
+    for entry in entries:
+        # Kiểu của entry lấy từ scandir (đã cache), không gọi isdir/isfile
+        is_dir = entry.is_dir()
+        if is_dir:
+            if entry.name in exclude_dirs:
+                continue
+        elif not entry.is_file():
+            continue
+        if rules is not None and rules.is_ignored(
+            _join_rel(dir_rel, entry.name), is_dir
+        ):
+            continue
+        result.append((entry, is_dir))
+    if sort_key is not None:
+        result.sort(key=sort_key)
+    return result, rules
+
+
+def compute_rollups(
+    root: str, rules: IgnoreRules | None, exclude_dirs: set[str]
+) -> dict[str, tuple[int, int]]:
+    """Duyệt toàn bộ cây (không giới hạn độ sâu): path tương đối -> (số file, byte)."""
+    own: dict[str, list[int]] = {}
+    parents: dict[str, str] = {}
+    order: list[str] = []
+    stack = [(root, "", rules)]
+    while stack:
+        dir_path, dir_rel, dir_rules = stack.pop()
+        order.append(dir_rel)
+        totals = own[dir_rel] = [0, 0]
+        # Chỉ cộng dồn, không cần thứ tự
+        entries, child_rules = list_dir(
+            dir_path, dir_rel, dir_rules, exclude_dirs, sort_key=None
+        )
+        for entry, is_dir in entries:
+            if is_dir:
+                if not entry.is_symlink():
+                    child_rel = _join_rel(dir_rel, entry.name)
+                    parents[child_rel] = dir_rel
+                    stack.append((entry.path, child_rel, child_rules))
+                continue
+            totals[0] += 1
+            try:
+                totals[1] += entry.stat().st_size
+            except OSError:
+                pass
+
+    # Thư mục con luôn được duyệt sau thư mục cha -> cộng ngược từ cuối lên
+    for dir_rel in reversed(order):
+        parent_rel = parents.get(dir_rel)
+        if parent_rel is not None:
+            own[parent_rel][0] += own[dir_rel][0]
+            own[parent_rel][1] += own[dir_rel][1]
+    return {dir_rel: (files, size) for dir_rel, (files, size) in own.items()}
+
+
+def format_size(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    value = size / 1024
+    for unit in ("KB", "MB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.2f} GB"
+
+
+def iter_tree_lines(
+    root: str,
+    exclude_dirs: set[str],
+    use_gitignore: bool = True,
+    max_depth: int | None = None,
+    max_entries: int | None = None,
+    rollups: dict[str, tuple[int, int]] | None = None,
+    sort_key: SortKey = sort_by_name,
+):
+    """
+    Sinh từng dòng của cây thư mục (duyệt bằng stack, không đệ quy), mỗi thư mục
+    chỉ scandir 1 lần nên có thể ghi ra file ngay khi duyệt.
+    """
+    rules = IgnoreRules([]) if use_gitignore else None
+    entries, rules = list_dir(root, "", rules, exclude_dirs, sort_key)
+    # Mỗi frame: [entries, vị trí tiếp theo, prefix, độ sâu, path tương đối, rules]
+    stack = [[entries, 0, "", 1, "", rules]]
+
+    while stack:
+        frame = stack[-1]
+        entries, index, prefix, depth, dir_rel, dir_rules = frame
+        limit = len(entries) if max_entries is None else min(len(entries), max_entries)
+        hidden_count = len(entries) - limit
+
+        if index >= limit:
+            stack.pop()
+            if hidden_count:
+                yield f"{prefix}└── … ({hidden_count} more entries)"
+            continue
+        frame[1] = index + 1
+
+        entry, is_dir = entries[index]
+        is_last = index == limit - 1 and not hidden_count
+        connector = "└── " if is_last else "├── "
+        rel = _join_rel(dir_rel, entry.name)
+
+        suffix = ""
+        if rollups is not None:
+            if is_dir:
+                files, size = rollups.get(rel, (0, 0))
+                suffix = f"  [{files} files, {format_size(size)}]"
+            else:
+                try:
+                    suffix = f"  [{format_size(entry.stat().st_size)}]"
+                except OSError:
+                    pass
+        yield f"{prefix}{connector}{entry.name}{suffix}"
+
+        if is_dir and not entry.is_symlink():
+            if max_depth is not None and depth >= max_depth:
+                continue
+            children, child_rules = list_dir(
+                entry.path, rel, dir_rules, exclude_dirs, sort_key
+            )
+            if children:
+                extension = "    " if is_last else "│   "
+                stack.append(
+                    [children, 0, prefix + extension, depth + 1, rel, child_rules]
+                )
+
+
+def main(
+    default_root: str,
+    default_output: str,
+    default_exclude_dirs: Iterable[str],
+    sort_key: SortKey = sort_by_name,
+    description: str = "Ghi cây thư mục của project ra file.",
+    epilog: str | None = None,
+):
+    default_exclude_dirs = list(default_exclude_dirs)
+    parser = argparse.ArgumentParser(description=description, epilog=epilog)
+    parser.add_argument(
+        "root", nargs="?", default=default_root, help="Thư mục gốc cần duyệt"
+    )
+    parser.add_argument("-o", "--output", default=default_output, help="File kết quả")
+    parser.add_argument(
+        "-x",
+        "--exclude",
+        action="append",
+        default=[],
+        help="Tên thư mục cần loại trừ thêm (dùng nhiều lần)",
+    )
+    parser.add_argument(
+        "--no-default-excludes",
+        action="store_true",
+        help=f"Bỏ danh sách loại trừ mặc định ({', '.join(default_exclude_dirs)})",
+    )
+    parser.add_argument(
+        "--no-gitignore", action="store_true", help="Không áp dụng các file .gitignore"
+    )
+    parser.add_argument("--max-depth", type=int, default=None, help="Độ sâu tối đa")
+    parser.add_argument(
+        "--max-entries",
+        type=int,
+        default=None,
+        help="Số entry tối đa in ra trong mỗi thư mục",
+    )
+    parser.add_argument(
+        "-s",
+        "--sizes",
+        action="store_true",
+        help="In số file + tổng dung lượng của mỗi thư mục, dung lượng của mỗi file",
+    )
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.root):
+        print(f">>> Lỗi: Thư mục không tồn tại: {args.root}")
+        sys.exit(1)
+
+    exclude_dirs = set(args.exclude)
+    if not args.no_default_excludes:
+        exclude_dirs.update(default_exclude_dirs)
+
+    started_at = time.perf_counter()
+    rollups = None
+    if args.sizes:
+        rules = None if args.no_gitignore else IgnoreRules([])
+        rollups = compute_rollups(args.root, rules, exclude_dirs)
+
+    line_count = 0
+    with open(args.output, "w", encoding="utf-8") as f:
+        header = f"Tree view of: {os.path.abspath(args.root)}"
+        if rollups is not None:
+            files, size = rollups[""]
+            header += f"  [{files} files, {format_size(size)}]"
+        f.write(header + "\n\n")
+        for line in iter_tree_lines(
+            args.root,
+            exclude_dirs,
+            use_gitignore=not args.no_gitignore,
+            max_depth=args.max_depth,
+            max_entries=args.max_entries,
+            rollups=rollups,
+            sort_key=sort_key,
+        ):
+            f.write(line + "\n")
+            line_count += 1
+
+    elapsed = time.perf_counter() - started_at
+    print(
+        f"Cây thư mục đã được ghi vào file: {args.output}"
+        f" ({line_count} dòng, {elapsed:.2f}s)"
+    )
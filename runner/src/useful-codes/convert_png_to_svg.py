@@ -1,32 +1,299 @@
-import vtracer
 import os
+import sys
+import glob
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
+from _cache_utils import cache_path, read_json_cache, write_json_cache
 
-def convert_png_to_svg(input_path, output_path):
-    # Sử dụng đúng tên hàm convert_image_to_svg_py
-    # Các tham số dưới đây là cấu hình chuẩn xác được hỗ trợ trong Python
-    vtracer.convert_image_to_svg_py(
-        input_path,
-        output_path,
-        colormode="color",  # Chế độ màu: "color" (nhiều màu) hoặc "binary" (đen trắng)
-        hierarchical="stacked",  # Cách xếp lớp: "stacked" (chồng lên nhau) hoặc "cutout" (cắt xén)
-        mode="spline",  # Tạo đường cong mềm mại: "spline", "polygon", hoặc "none"
-        filter_speckle=4,  # Lọc các điểm nhiễu nhỏ (mặc định: 4)
-        color_precision=6,  # Độ chính xác của màu sắc (mặc định: 6)
-        layer_difference=16,  # Độ sai lệch màu giữa các lớp (mặc định: 16)
-        corner_threshold=60,  # Ngưỡng tạo góc nhọn (mặc định: 60)
-        length_threshold=4.0,  # Chiều dài tối thiểu của một đoạn (mặc định: 4.0)
-        max_iterations=10,  # Số vòng lặp tối đa để làm mịn (mặc định: 10)
-        splice_threshold=45,  # Ngưỡng nối các đoạn (mặc định: 45)
-        path_precision=8,  # Số chữ số thập phân cho các tọa độ path (mặc định: 8)
-    )
-w
-
-# Kiểm tra tập tin đầu vào có tồn tại hay không trước khi tiến hành chuyển đổi
-input_file = "input.png"
-output_file = "output.svg"
-
-if os.path.exists(input_file):
-    convert_png_to_svg(input_file, output_file)
-else:
-    print(f"Lỗi: Không tìm thấy tập tin {input_file}")
+MANIFEST_VERSION = 1
+# Thư mục SVG (so với project sync-with-gdrive) được gen_resources.py đưa vào QRC
+SVG_ASSETS_SUBFOLDER = ("app", "src", "assets", "images", "svg")
+
+# Các tham số dưới đây là cấu hình chuẩn xác được hỗ trợ trong Python
+# (đổi tham số -> hash đổi -> file sẽ được convert lại)
+VTRACER_PARAMS = {
+    "colormode": "color",  # Chế độ màu: "color" (nhiều màu) hoặc "binary" (đen trắng)
+    "hierarchical": "stacked",  # Cách xếp lớp: "stacked" (chồng lên nhau) hoặc "cutout" (cắt xén)
+    "mode": "spline",  # Tạo đường cong mềm mại: "spline", "polygon", hoặc "none"
+    "filter_speckle": 4,  # Lọc các điểm nhiễu nhỏ (mặc định: 4)
+    "color_precision": 6,  # Độ chính xác của màu sắc (mặc định: 6)
+    "layer_difference": 16,  # Độ sai lệch màu giữa các lớp (mặc định: 16)
+    "corner_threshold": 60,  # Ngưỡng tạo góc nhọn (mặc định: 60)
+    "length_threshold": 4.0,  # Chiều dài tối thiểu của một đoạn (mặc định: 4.0)
+    "max_iterations": 10,  # Số vòng lặp tối đa để làm mịn (mặc định: 10)
+    "splice_threshold": 45,  # Ngưỡng nối các đoạn (mặc định: 45)
+    "path_precision": 8,  # Số chữ số thập phân cho các tọa độ path (mặc định: 8)
+}
+
+
+def get_svg_assets_folder_path() -> str:
+    """Thư mục SVG mà gdrive-tool/sync-with-gdrive/scripts/gen_resources.py đọc."""
+    folder_path = os.getenv("SVG_ASSETS_FOLDER_PATH")
+    if folder_path:
+        return folder_path
+    # runner/src/useful-codes -> TOOLs/gdrive-tool/...
+    tools_folder = os.path.abspath(
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..")
+    )
+    return os.path.join(
+        tools_folder, "gdrive-tool", "sync-with-gdrive", *SVG_ASSETS_SUBFOLDER
+    )
+
+
+def collect_inputs(patterns: list[str], recursive: bool) -> list[str]:
+    """Folder -> các file .png bên trong; glob/file -> các file khớp (bỏ trùng)."""
+    inputs: dict[str, None] = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            sub_pattern = os.path.join("**", "*.png") if recursive else "*.png"
+            matches = glob.glob(os.path.join(pattern, sub_pattern), recursive=True)
+        elif glob.has_magic(pattern):
+            matches = glob.glob(pattern, recursive=True)
+        else:
+            matches = [pattern] if os.path.isfile(pattern) else []
+        if not matches:
+            print(f">>> Warn: Không tìm thấy file PNG nào khớp: {pattern}")
+        for path in sorted(matches):
+            if path.lower().endswith(".png") and os.path.isfile(path):
+                inputs[os.path.abspath(path)] = None
+    return list(inputs)
+
+
+def parse_param_overrides(overrides: list[str]) -> dict:
+    """['filter_speckle=8', 'mode=polygon'] -> VTRACER_PARAMS đã ghi đè."""
+    params = dict(VTRACER_PARAMS)
+    for override in overrides:
+        key, sep, value = override.partition("=")
+        key = key.strip().replace("-", "_")
+        if not sep or key not in params:
+            print(f">>> Error: Tham số không hợp lệ: {override}")
+            print(f">>> Các tham số hỗ trợ: {', '.join(VTRACER_PARAMS)}")
+            sys.exit(1)
+        try:
+            params[key] = type(VTRACER_PARAMS[key])(value.strip())
+        except ValueError:
+            print(f">>> Error: Giá trị không hợp lệ cho {key}: {value}")
+            sys.exit(1)
+    return params
+
+
+def params_hash(params: dict) -> str:
+    try:
+        from importlib.metadata import version
+
+        vtracer_version = version("vtracer")
+    except Exception:
+        vtracer_version = "unknown"
+    # Nâng cấp vtracer cũng có thể đổi kết quả -> tính vào hash
+    payload = json.dumps({"vtracer": vtracer_version, "params": params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_path: str) -> dict[str, dict]:
+    """output path -> {"source_sha256", "params_sha256"} của lần convert trước."""
+    manifest = read_json_cache(manifest_path, MANIFEST_VERSION)
+    return manifest.get("outputs", {}) if manifest is not None else {}
+
+
+def save_manifest(manifest_path: str, outputs: dict[str, dict]) -> None:
+    write_json_cache(manifest_path, MANIFEST_VERSION, {"outputs": outputs}, indent=2)
+
+
+def convert_png_to_svg(input_path: str, output_path: str, params: dict) -> float:
+    """Convert 1 file (chạy trong process con), trả về thời gian convert (giây)."""
+    import vtracer
+
+    started_at = time.perf_counter()
+    # Ghi ra file tạm rồi mới đổi tên: bị dừng giữa chừng không để lại SVG hỏng
+    tmp_path = output_path + ".tmp"
+    try:
+        # Sử dụng đúng tên hàm convert_image_to_svg_py
+        vtracer.convert_image_to_svg_py(input_path, tmp_path, **params)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return time.perf_counter() - started_at
+
+
+def convert_all(
+    inputs: list[str],
+    output_dir: str,
+    params: dict,
+    jobs: int,
+    force: bool = False,
+) -> int:
+    """Convert các file PNG sang output_dir, trả về số file thất bại."""
+    manifest_path = cache_path("png_to_svg_manifest.json")
+    manifest = load_manifest(manifest_path)
+    current_params_hash = params_hash(params)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # --- Lập danh sách cần convert (bỏ qua file không đổi nội dung + tham số) ---
+    tasks: list[tuple[str, str, str]] = []
+    outputs_seen: dict[str, str] = {}
+    skipped = 0
+    for input_path in inputs:
+        name = os.path.splitext(os.path.basename(input_path))[0] + ".svg"
+        output_path = os.path.abspath(os.path.join(output_dir, name))
+        if output_path in outputs_seen:
+            print(
+                f"[SKIP]    {input_path} — trùng tên output với"
+                f" {outputs_seen[output_path]}"
+            )
+            continue
+        outputs_seen[output_path] = input_path
+
+        source_hash = hash_file(input_path)
+        entry = manifest.get(output_path)
+        if (
+            not force
+            and entry is not None
+            and entry.get("source_sha256") == source_hash
+            and entry.get("params_sha256") == current_params_hash
+            and os.path.exists(output_path)
+        ):
+            skipped += 1
+            print(f"[CACHED]  {os.path.basename(input_path)} -> {name}")
+            continue
+        tasks.append((input_path, output_path, source_hash))
+
+    # --- Convert song song (vtracer dùng CPU, mỗi file 1 process) ---
+    converted = 0
+    failed = 0
+    started_at = time.perf_counter()
+
+    def on_done(input_path: str, output_path: str, source_hash: str, elapsed: float):
+        nonlocal converted
+        converted += 1
+        manifest[output_path] = {
+            "source": input_path,
+            "source_sha256": source_hash,
+            "params_sha256": current_params_hash,
+        }
+        print(
+            f"[DONE]    {os.path.basename(input_path)} -> "
+            f"{os.path.basename(output_path)} ({elapsed * 1000:.0f} ms)"
+        )
+
+    def on_failed(input_path: str, error: Exception):
+        nonlocal failed
+        failed += 1
+        print(f"[FAILED]  {input_path} — {error}")
+
+    try:
+        if jobs <= 1 or len(tasks) <= 1:
+            for input_path, output_path, source_hash in tasks:
+                try:
+                    elapsed = convert_png_to_svg(input_path, output_path, params)
+                except Exception as e:
+                    on_failed(input_path, e)
+                    continue
+                on_done(input_path, output_path, source_hash, elapsed)
+        else:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+                futures = {
+                    pool.submit(convert_png_to_svg, input_path, output_path, params): (
+                        input_path,
+                        output_path,
+                        source_hash,
+                    )
+                    for input_path, output_path, source_hash in tasks
+                }
+                for future in as_completed(futures):
+                    input_path, output_path, source_hash = futures[future]
+                    try:
+                        elapsed = future.result()
+                    except Exception as e:
+                        on_failed(input_path, e)
+                        continue
+                    on_done(input_path, output_path, source_hash, elapsed)
+    finally:
+        # Lưu cả khi bị dừng giữa chừng (Ctrl+C) để lần sau bỏ qua file đã xong
+        save_manifest(manifest_path, manifest)
+
+    elapsed = time.perf_counter() - started_at
+    print(
+        f"\nHoàn tất: {converted} file đã convert, {skipped} file không đổi (cache),"
+        f" {failed} file thất bại — {elapsed:.2f}s"
+    )
+    print(f"Output: {output_dir}")
+    return failed
+
+
+def main():
+    default_jobs = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(
+        description="Convert PNG sang SVG bằng vtracer (nhiều file, chạy song song).",
+        epilog='Ví dụ: py convert_png_to_svg.py "D:/icons" "D:/more/*_icon.png"'
+        " -p filter_speckle=8",
+    )
+    parser.add_argument(
+        "inputs", nargs="+", help="File PNG, folder chứa PNG, hoặc glob (VD: *.png)"
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        default=None,
+        help="Folder output (mặc định: thư mục SVG assets của sync-with-gdrive)",
+    )
+    parser.add_argument(
+        "-r", "--recursive", action="store_true", help="Lấy cả PNG trong thư mục con"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=default_jobs,
+        help=f"Số process convert song song (mặc định {default_jobs})",
+    )
+    parser.add_argument(
+        "-p",
+        "--param",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Ghi đè tham số vtracer (VD: mode=polygon), dùng nhiều lần",
+    )
+    parser.add_argument(
+        "-f", "--force", action="store_true", help="Convert lại kể cả khi có cache"
+    )
+    args = parser.parse_args()
+
+    try:
+        import vtracer  # noqa: F401
+    except ImportError:
+        print(
+            ">>> Error: Chưa cài đặt thư viện 'vtracer'. Vui lòng chạy `pip install vtracer`"
+        )
+        sys.exit(1)
+
+    params = parse_param_overrides(args.param)
+    inputs = collect_inputs(args.inputs, args.recursive)
+    if not inputs:
+        print(">>> Không có file PNG nào để convert.")
+        sys.exit(0)
+
+    output_dir = args.output_dir or get_svg_assets_folder_path()
+    print(f">>> Convert {len(inputs)} file PNG -> {output_dir}")
+    failed = convert_all(inputs, output_dir, params, max(1, args.jobs), args.force)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path="D:/D-Documents/TOOLs/runner/.env")
+    main()
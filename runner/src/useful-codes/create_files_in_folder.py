@@ -1,9 +1,154 @@
 import os
-import re
 import sys
-from dotenv import load_dotenv
 
-load_dotenv(dotenv_path="D:/D-Documents/TOOLs/runner/.env")
+from _cache_utils import cache_path, read_json_cache, write_json_cache
+
+# Cú pháp 1 template trong files_source.txt:
+#   @@file-name[[<tên hiển thị>]]{{<đường dẫn file>}}
+#   @@file-content{{<nội dung>}}
+FILE_NAME_MARKER = b"@@file-name"
+FILE_CONTENT_MARKER = b"@@file-content{{"
+WHITESPACE_BYTES = b" \t\r\n\f\v"
+
+TEMPLATE_INDEX_VERSION = 1
+
+# Index đã load trong process: (mtime_ns, size, entries)
+_loaded_index: tuple[int, int, list[dict]] | None = None
+
+
+def _parse_header(data: bytes, start: int) -> tuple[str, str, int] | None:
+    """
+    Đọc `@@file-name[[name]]{{file}}` tại start (trên 1 dòng), bỏ khoảng trắng rồi
+    `@@file-content{{`. Trả về (name, file, vị trí bắt đầu nội dung) hoặc None.
+    """
+    pos = start + len(FILE_NAME_MARKER)
+    if not data.startswith(b"[[", pos):
+        return None
+    line_end = data.find(b"\n", pos)
+    if line_end == -1:
+        line_end = len(data)
+
+    name_end = data.find(b"]]{{", pos + 2, line_end)
+    if name_end == -1:
+        return None
+    file_end = data.find(b"}}", name_end + 4, line_end)
+    if file_end == -1:
+        return None
+
+    content_marker = file_end + 2
+    while content_marker < len(data) and data[content_marker] in WHITESPACE_BYTES:
+        content_marker += 1
+    if not data.startswith(FILE_CONTENT_MARKER, content_marker):
+        return None
+
+    name = data[pos + 2 : name_end].decode("utf-8", errors="replace")
+    file_name = data[name_end + 4 : file_end].decode("utf-8", errors="replace")
+    return name, file_name, content_marker + len(FILE_CONTENT_MARKER)
+
+
+def _closing_braces_before(data: bytes, end: int) -> int:
+    """Vị trí của `}}` đứng ngay trước end (bỏ qua khoảng trắng), -1 nếu không có."""
+    pos = end - 1
+    while pos >= 0 and data[pos] in WHITESPACE_BYTES:
+        pos -= 1
+    return pos - 1 if pos >= 1 and data[pos - 1 : pos + 1] == b"}}" else -1
+
+
+def tokenize_templates(data: bytes) -> list[dict]:
+    """
+    Tách files_source.txt thành các template: [{name, file_name, offset, length}],
+    offset/length là vị trí byte của nội dung trong file.
+
+    Duyệt tuyến tính: nội dung của 1 template kết thúc ở `}}` đứng ngay trước (chỉ
+    cách bởi khoảng trắng) `@@file-name` tiếp theo hoặc cuối file.
+    """
+    markers = []
+    pos = data.find(FILE_NAME_MARKER)
+    while pos != -1:
+        markers.append(pos)
+        pos = data.find(FILE_NAME_MARKER, pos + len(FILE_NAME_MARKER))
+
+    entries = []
+    index = 0
+    while index < len(markers):
+        header = _parse_header(data, markers[index])
+        index += 1
+        if header is None:
+            continue
+        name, file_name, content_start = header
+
+        # `@@file-name` nằm trong nội dung (không có `}}` đứng trước) thì bỏ qua
+        while index < len(markers) and markers[index] < content_start:
+            index += 1
+        content_end = -1
+        while index < len(markers):
+            content_end = _closing_braces_before(data, markers[index])
+            if content_end >= content_start:
+                break
+            content_end = -1
+            index += 1
+        if content_end == -1:
+            content_end = _closing_braces_before(data, len(data))
+            if content_end < content_start:
+                continue
+
+        entries.append(
+            {
+                "name": name,
+                "file_name": file_name,
+                "offset": content_start,
+                "length": content_end - content_start,
+            }
+        )
+    return entries
+
+
+def load_template_index(source_file: str) -> list[dict]:
+    """
+    Lấy danh sách template của source_file:
+    - mtime + size khớp cache -> dùng luôn (không đọc files_source.txt)
+    - Ngược lại -> đọc file, tách lại bằng tokenize_templates và ghi cache
+    """
+    global _loaded_index
+    stat = os.stat(source_file)
+    if _loaded_index is not None and _loaded_index[:2] == (
+        stat.st_mtime_ns,
+        stat.st_size,
+    ):
+        return _loaded_index[2]
+
+    index_cache_path = cache_path("files_source_index.json")
+    cache = read_json_cache(index_cache_path, TEMPLATE_INDEX_VERSION)
+    if (
+        cache is not None
+        and cache.get("source_path") == source_file
+        and cache.get("mtime_ns") == stat.st_mtime_ns
+        and cache.get("size") == stat.st_size
+    ):
+        entries = cache["entries"]
+    else:
+        with open(source_file, "rb") as f:
+            entries = tokenize_templates(f.read())
+        write_json_cache(
+            index_cache_path,
+            TEMPLATE_INDEX_VERSION,
+            {
+                "source_path": source_file,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "entries": entries,
+            },
+        )
+    _loaded_index = (stat.st_mtime_ns, stat.st_size, entries)
+    return entries
+
+
+def read_template_content(source_file, entry: dict) -> str:
+    """Chỉ đọc phần nội dung của 1 template (seek tới offset rồi read)."""
+    source_file.seek(entry["offset"])
+    content = source_file.read(entry["length"]).decode("utf-8")
+    # Giống khi đọc ở text mode: CRLF / CR -> LF
+    return content.replace("\r\n", "\n").replace("\r", "\n")
 
 
 def main():
@@ -17,15 +162,10 @@ def main():
         )
         return
 
-    # Đọc toàn bộ nội dung của tệp nguồn
-    with open(source_file, "r", encoding="utf-8") as f:
-        content = f.read()
+    # Danh sách template (tên + vị trí nội dung), chỉ tách lại khi tệp nguồn thay đổi
+    templates = load_template_index(source_file)
 
-    # Sử dụng biểu thức chính quy (Regex) để trích xuất thông tin
-    pattern = r"@@file-name\[\[(.*?)\]\]\{\{(.*?)\}\}\s*@@file-content\{\{([\s\S]*?)\}\}(?=\s*@@file-name|$)"
-    matches = re.findall(pattern, content)
-
-    if not matches:
+    if not templates:
         print(
             "Không tìm thấy dữ liệu hợp lệ trong tệp nguồn. Vui lòng kiểm tra lại cấu trúc văn bản của bạn."
         )
@@ -35,8 +175,8 @@ def main():
     print("Danh sách các tùy chọn:")
     print("0. quit")  # Thêm tùy chọn thoát chương trình ở đầu danh sách
 
-    for i, match in enumerate(matches, 1):
-        display_name = match[0].strip()
+    for i, template in enumerate(templates, 1):
+        display_name = template["name"].strip()
         print(f"{i}. {display_name}")
 
     # Chờ người dùng nhập vào các con số
@@ -60,11 +200,19 @@ def main():
     print("\nĐang tiến hành tạo tệp và thư mục...")
     current_dir = os.getcwd()  # Lấy thư mục hiện tại nơi terminal đang đứng
 
+    # Chỉ đọc nội dung của các template được chọn
+    with open(source_file, "rb") as source:
+        contents = {
+            choice: read_template_content(source, templates[choice - 1])
+            for choice in choices
+            if 1 <= choice <= len(templates)
+        }
+
     for choice in choices:
         # Kiểm tra xem con số người dùng nhập có nằm trong phạm vi menu hay không
-        if 1 <= choice <= len(matches):
-            file_name = matches[choice - 1][1].strip()
-            file_content = matches[choice - 1][2]
+        if 1 <= choice <= len(templates):
+            file_name = templates[choice - 1]["file_name"].strip()
+            file_content = contents[choice]
 
             # Tạo đường dẫn tuyệt đối cho tệp mới
             file_path = os.path.join(current_dir, file_name)
@@ -92,4 +240,7 @@ def main():
 
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path="D:/D-Documents/TOOLs/runner/.env")
     main()
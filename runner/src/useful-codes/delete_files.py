@@ -1,58 +1,196 @@
 import os
 import sys
-import glob
+import time
+import argparse
+from functools import partial
 
+from _file_utils import (
+    DEFAULT_WORKERS,
+    format_size,
+    is_junction,
+    match_ext,
+    normalize_ext_list,
+    print_lines,
+    walk_dirs,
+)
 
-def delete_files_by_ext_list(folder: str, ext_list: list[str]) -> None:
+
+class DeleteResult:
+    """Kết quả xử lý 1 thư mục (hoặc tổng hợp nhiều thư mục)."""
+
+    __slots__ = ("counts", "sizes", "failed", "lines", "subdirs")
+
+    def __init__(self):
+        self.counts: dict[str, int] = {}  # ext -> số file đã xóa
+        self.sizes: dict[str, int] = {}  # ext -> tổng số byte đã xóa
+        self.failed = 0
+        self.lines: list[str] = []  # Dòng log, được in theo lô
+        self.subdirs: list[str] = []
+
+    def add(self, ext: str, size: int) -> None:
+        self.counts[ext] = self.counts.get(ext, 0) + 1
+        self.sizes[ext] = self.sizes.get(ext, 0) + size
+
+    def merge(self, other: "DeleteResult") -> None:
+        for ext, count in other.counts.items():
+            self.counts[ext] = self.counts.get(ext, 0) + count
+            self.sizes[ext] = self.sizes.get(ext, 0) + other.sizes[ext]
+        self.failed += other.failed
+
+
+def process_dir(
+    folder: str,
+    exts: set[str],
+    recursive: bool,
+    dry_run: bool,
+    verbose: bool,
+) -> DeleteResult:
+    """
+    1 lượt os.scandir: xóa (hoặc liệt kê nếu dry_run) file khớp extension. Chỉ xét
+    entry là file (giống glob trước đây): symlink tới thư mục dù tên khớp extension
+    cũng không bị xóa.
+    """
+    result = DeleteResult()
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and not is_junction(entry):
+                        result.subdirs.append(entry.path)
+                    continue
+                if not entry.is_file():
+                    continue
+                ext = match_ext(entry.name, exts)
+                if ext is None:
+                    continue
+                try:
+                    size = entry.stat(follow_symlinks=False).st_size
+                    if not dry_run:
+                        os.remove(entry.path)
+                except OSError as e:
+                    result.failed += 1
+                    result.lines.append(f"[FAILED]  {entry.path} — {e}")
+                    continue
+                result.add(ext, size)
+                if verbose:
+                    tag = "[DRY-RUN]" if dry_run else "[DELETED]"
+                    result.lines.append(f"{tag} {entry.path}")
+    except OSError as e:
+        result.failed += 1
+        result.lines.append(f"[FAILED]  {folder} — {e}")
+    return result
+
+
+def delete_files_by_ext_list(
+    folder: str,
+    ext_list: list[str],
+    recursive: bool = False,
+    dry_run: bool = False,
+    workers: int = DEFAULT_WORKERS,
+    verbose: bool = True,
+) -> None:
     """
     Xóa tất cả file có extension trong ext_list thuộc folder.
 
     Args:
-        folder:   Đường dẫn đến folder cần xóa file.
-        ext_list: Danh sách extension cần xóa (ví dụ: ['txt', 'jpg', 'png']).
+        folder:    Đường dẫn đến folder cần xóa file.
+        ext_list:  Danh sách extension cần xóa (ví dụ: ['txt', 'jpg', 'png']).
+        recursive: Xóa cả trong các thư mục con (duyệt song song bằng thread pool).
+        dry_run:   Chỉ liệt kê file sẽ bị xóa, không xóa.
+        workers:   Số thread khi duyệt đệ quy.
+        verbose:   In từng file (tắt đi khi xóa rất nhiều file).
     """
     if not os.path.isdir(folder):
         print(f"[ERROR] Folder không tồn tại: {folder}")
         sys.exit(1)
 
-    total_deleted = 0
-    total_failed = 0
+    exts = normalize_ext_list(ext_list)
+    if not exts:
+        print("[ERROR] Không có extension hợp lệ nào.")
+        sys.exit(1)
 
-    for ext in ext_list:
-        # Chuẩn hóa extension: bỏ dấu chấm thừa rồi thêm lại 1 dấu chấm
-        ext = ext.strip().lstrip(".").lower()
-        if not ext:
-            continue
+    started_at = time.perf_counter()
+    total = DeleteResult()
 
-        pattern = os.path.join(folder, f"*.{ext}")
-        files = glob.glob(pattern)
+    def collect(result: DeleteResult) -> None:
+        print_lines(result.lines)
+        total.merge(result)
 
-        if not files:
-            print(f"[INFO] Không tìm thấy file nào có extension '.{ext}' trong: {folder}")
-            continue
+    if not recursive:
+        collect(process_dir(folder, exts, False, dry_run, verbose))
+    else:
+        scan = partial(
+            process_dir, exts=exts, recursive=True, dry_run=dry_run, verbose=verbose
+        )
+        walk_dirs(folder, scan, collect, workers)
 
-        for file_path in files:
-            try:
-                os.remove(file_path)
-                print(f"[DELETED] {file_path}")
-                total_deleted += 1
-            except Exception as e:
-                print(f"[FAILED]  {file_path} — {e}")
-                total_failed += 1
+    elapsed = time.perf_counter() - started_at
+    print_summary(folder, exts, total, dry_run, elapsed)
 
-    print(f"\nHoàn tất: {total_deleted} file đã xóa, {total_failed} file thất bại.")
 
+def print_summary(
+    folder: str,
+    exts: set[str],
+    total: DeleteResult,
+    dry_run: bool,
+    elapsed: float,
+) -> None:
+    total_files = sum(total.counts.values())
+    total_bytes = sum(total.sizes.values())
+    action = "sẽ xóa" if dry_run else "đã xóa"
 
-def main():
-    if len(sys.argv) != 3:
-        print("Cách dùng: py delete_files.py <folder> <ext1,ext2,...>")
-        print('Ví dụ:     py delete_files.py "C:/Downloads" "txt,jpg,png"')
-        sys.exit(1)
+    print()
+    for ext in sorted(exts):
+        count = total.counts.get(ext, 0)
+        if count == 0:
+            print(
+                f"[INFO] Không tìm thấy file nào có extension '.{ext}' trong: {folder}"
+            )
+            continue
+        size = format_size(total.sizes[ext])
+        print(f"  .{ext:<10} {count:>8} file  {size:>12}")
+
+    speed = f"{total_files / elapsed:,.0f} file/s" if elapsed > 0 else ""
+    print(
+        f"\nHoàn tất{' (dry run)' if dry_run else ''}: {total_files} file {action}"
+        f" ({format_size(total_bytes)}), {total.failed} file thất bại"
+        f" — {elapsed:.2f}s {speed}"
+    )
 
-    folder = sys.argv[1]
-    ext_list = sys.argv[2].split(",")
 
-    delete_files_by_ext_list(folder, ext_list)
+def main():
+    parser = argparse.ArgumentParser(
+        description="Xóa file theo danh sách extension.",
+        epilog='Ví dụ: py delete_files.py "C:/Downloads" "txt,jpg,png" -r -n',
+    )
+    parser.add_argument("folder", help="Folder cần xóa file")
+    parser.add_argument("ext_list", help="Danh sách extension, cách nhau bởi dấu phẩy")
+    parser.add_argument(
+        "-r", "--recursive", action="store_true", help="Xóa cả trong thư mục con"
+    )
+    parser.add_argument(
+        "-n", "--dry-run", action="store_true", help="Chỉ liệt kê, không xóa"
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Không in từng file, chỉ in tổng kết"
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Số thread khi duyệt đệ quy (mặc định {DEFAULT_WORKERS})",
+    )
+    args = parser.parse_args()
+
+    delete_files_by_ext_list(
+        args.folder,
+        args.ext_list.split(","),
+        recursive=args.recursive,
+        dry_run=args.dry_run,
+        workers=args.workers,
+        verbose=not args.quiet,
+    )
 
 
 if __name__ == "__main__":
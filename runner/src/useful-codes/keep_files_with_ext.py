@@ -1,64 +1,269 @@
 import os
 import sys
+import time
+import argparse
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
 
+from _file_utils import (
+    DEFAULT_WORKERS,
+    cancel_pending_on_interrupt,
+    format_size,
+    is_hidden,
+    is_junction,
+    match_ext,
+    normalize_ext_list,
+    print_lines,
+    walk_dirs,
+)
 
-def keep_files_with_ext(folder: str, ext: str) -> None:
+# Số file mỗi task xóa, và số task được chờ cùng lúc trên mỗi thread
+DELETE_BATCH_SIZE = 256
+MAX_PENDING_BATCHES_PER_WORKER = 2
+# Thư mục luôn bỏ qua khi duyệt đệ quy (xóa nhầm sẽ hỏng repo)
+DEFAULT_EXCLUDE_DIRS = {".git", ".svn", ".hg"}
+
+
+class ScanResult:
+    """Kế hoạch xóa của 1 thư mục (hoặc tổng hợp nhiều thư mục)."""
+
+    __slots__ = ("to_delete", "delete_bytes", "kept", "subdirs", "errors")
+
+    def __init__(self):
+        self.to_delete: list[str] = []
+        self.delete_bytes = 0
+        self.kept = 0
+        self.subdirs: list[str] = []
+        self.errors: list[str] = []
+
+    def merge(self, other: "ScanResult") -> None:
+        self.to_delete.extend(other.to_delete)
+        self.delete_bytes += other.delete_bytes
+        self.kept += other.kept
+        self.errors.extend(other.errors)
+
+
+def scan_dir(
+    folder: str, keep_exts: set[str], recursive: bool, exclude_dirs: set[str]
+) -> ScanResult:
+    """
+    1 lượt os.scandir: chia file thành giữ lại / cần xóa. Chỉ xét entry là file
+    (giống os.path.isfile: kể cả symlink tới file); symlink tới thư mục, FIFO,
+    socket... bị bỏ qua và không được tính là đã quét.
+    """
+    result = ScanResult()
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if (
+                        recursive
+                        and entry.name.lower() not in exclude_dirs
+                        and not is_junction(entry)
+                    ):
+                        result.subdirs.append(entry.path)
+                    continue
+                if not entry.is_file():
+                    continue
+                # File ẩn luôn được giữ (del-files cũng không bao giờ xóa file ẩn)
+                if is_hidden(entry.name) or match_ext(entry.name, keep_exts):
+                    result.kept += 1
+                    continue
+                result.to_delete.append(entry.path)
+                try:
+                    result.delete_bytes += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    pass
+    except OSError as e:
+        result.errors.append(f"[FAILED]  {folder} — {e}")
+    return result
+
+
+def build_plan(
+    folder: str,
+    keep_exts: set[str],
+    recursive: bool,
+    exclude_dirs: set[str],
+    workers: int,
+) -> ScanResult:
+    if not recursive:
+        return scan_dir(folder, keep_exts, False, exclude_dirs)
+
+    plan = ScanResult()
+    scan = partial(
+        scan_dir, keep_exts=keep_exts, recursive=True, exclude_dirs=exclude_dirs
+    )
+    walk_dirs(folder, scan, plan.merge, workers)
+    return plan
+
+
+def delete_batch(paths: list[str], verbose: bool) -> tuple[int, list[str]]:
+    """Xóa 1 lô file, trả về (số file thất bại, các dòng log)."""
+    failed = 0
+    lines = []
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError as e:
+            failed += 1
+            lines.append(f"[FAILED]  {path} — {e}")
+            continue
+        if verbose:
+            lines.append(f"[DELETED] {path}")
+    return failed, lines
+
+
+def delete_paths(paths: list[str], workers: int, verbose: bool) -> int:
+    """
+    Xóa paths bằng thread pool. Số lô đang chờ bị giới hạn nên bộ nhớ không tăng
+    theo số file. Trả về số file xóa thất bại.
     """
-    Xóa tất cả file KHÔNG có extension chỉ định trong folder.
+    failed = 0
+    max_pending = workers * MAX_PENDING_BATCHES_PER_WORKER
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: set[Future] = set()
+
+        def collect(done: set[Future]) -> None:
+            nonlocal failed
+            for future in done:
+                batch_failed, lines = future.result()
+                failed += batch_failed
+                print_lines(lines)
+
+        # Bị dừng giữa chừng: không xóa tiếp các lô còn trong hàng đợi
+        with cancel_pending_on_interrupt(pool):
+            for start in range(0, len(paths), DELETE_BATCH_SIZE):
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                batch = paths[start : start + DELETE_BATCH_SIZE]
+                pending.add(pool.submit(delete_batch, batch, verbose))
+            collect(wait(pending).done)
+    return failed
+
+
+def keep_files_with_ext(
+    folder: str,
+    keep_exts: list[str],
+    recursive: bool = False,
+    exclude_dirs: list[str] | None = None,
+    dry_run: bool = False,
+    workers: int = DEFAULT_WORKERS,
+    verbose: bool = True,
+) -> None:
+    """
+    Xóa tất cả file KHÔNG có extension nằm trong keep_exts trong folder (file ẩn
+    luôn được giữ).
 
     Args:
-        folder: Đường dẫn đến folder cần xử lý.
-        ext:    Extension cần giữ lại (ví dụ: 'png', '.png', 'jpg').
+        folder:       Đường dẫn đến folder cần xử lý.
+        keep_exts:    Các extension cần giữ lại (ví dụ: ['png', '.jpg']).
+        recursive:    Xử lý cả thư mục con (duyệt song song bằng thread pool).
+        exclude_dirs: Tên các thư mục con bỏ qua khi duyệt đệ quy.
+        dry_run:      Chỉ in kế hoạch (file sẽ bị xóa), không xóa.
+        workers:      Số thread để duyệt và xóa.
+        verbose:      In từng file.
     """
-    # Chuẩn hóa extension: bỏ dấu chấm thừa rồi thêm lại 1 dấu chấm
-    ext = "." + ext.lstrip(".").lower()
+    exts = normalize_ext_list(keep_exts)
+    ext_label = ", ".join(f".{ext}" for ext in sorted(exts))
 
     if not os.path.isdir(folder):
         print(f"[ERROR] Folder không tồn tại: {folder}")
         sys.exit(1)
+    if not exts:
+        print("[ERROR] Không có extension hợp lệ nào.")
+        sys.exit(1)
 
-    all_files = [
-        os.path.join(folder, f)
-        for f in os.listdir(folder)
-        if os.path.isfile(os.path.join(folder, f))
-    ]
+    workers = max(1, workers)
+    excluded = DEFAULT_EXCLUDE_DIRS | {d.strip().lower() for d in exclude_dirs or []}
+    excluded.discard("")
 
-    if not all_files:
+    scan_started_at = time.perf_counter()
+    plan = build_plan(folder, exts, recursive, excluded, workers)
+    scan_elapsed = time.perf_counter() - scan_started_at
+    for line in plan.errors:
+        print(line)
+
+    scanned = len(plan.to_delete) + plan.kept
+    print(
+        f"[INFO] Đã quét {scanned} file trong {scan_elapsed:.2f}s"
+        f" ({scanned / max(scan_elapsed, 1e-9):,.0f} file/s)."
+    )
+    if scanned == 0:
         print(f"[INFO] Folder trống, không có file nào: {folder}")
         return
+    if not plan.to_delete:
+        print(f"[INFO] Tất cả file đều có extension '{ext_label}', không cần xóa.")
+        return
 
-    to_delete = [f for f in all_files if not f.lower().endswith(ext)]
-
-    if not to_delete:
-        print(f"[INFO] Tất cả file đều có extension '{ext}', không cần xóa.")
+    if dry_run:
+        if verbose:
+            print_lines([f"[DRY-RUN] {path}" for path in plan.to_delete])
+        print(
+            f"\nDry run: {len(plan.to_delete)} file sẽ bị xóa"
+            f" ({format_size(plan.delete_bytes)}),"
+            f" {plan.kept} file được giữ lại ('{ext_label}')."
+        )
         return
 
-    deleted = 0
-    failed = 0
+    delete_started_at = time.perf_counter()
+    failed = delete_paths(plan.to_delete, workers, verbose)
+    delete_elapsed = max(time.perf_counter() - delete_started_at, 1e-9)
 
-    for file_path in to_delete:
-        try:
-            os.remove(file_path)
-            print(f"[DELETED] {file_path}")
-            deleted += 1
-        except Exception as e:
-            print(f"[FAILED]  {file_path} — {e}")
-            failed += 1
-
-    kept = len(all_files) - deleted - failed
-    print(f"\nHoàn tất: {deleted} file đã xóa, {failed} file thất bại, {kept} file được giữ lại ('{ext}').")
+    deleted = len(plan.to_delete) - failed
+    print(
+        f"\nHoàn tất: {deleted} file đã xóa, {failed} file thất bại,"
+        f" {plan.kept} file được giữ lại ('{ext_label}')."
+    )
+    print(
+        f"Tốc độ xóa: {deleted / delete_elapsed:,.0f} file/s,"
+        f" {format_size(plan.delete_bytes / delete_elapsed)}/s"
+        f" ({delete_elapsed:.2f}s)."
+    )
 
 
 def main():
-    if len(sys.argv) != 3:
-        print("Cách dùng: py keep_files_with_ext.py <folder> <ext>")
-        print('Ví dụ:     py keep_files_with_ext.py "C:/Downloads" "png"')
-        sys.exit(1)
-
-    folder = sys.argv[1]
-    ext = sys.argv[2]
+    parser = argparse.ArgumentParser(
+        description="Chỉ giữ lại file có extension chỉ định, xóa các file khác.",
+        epilog='Ví dụ: py keep_files_with_ext.py "C:/Downloads" "png,jpg" -r -n',
+    )
+    parser.add_argument("folder", help="Folder cần xử lý")
+    parser.add_argument(
+        "ext", help="Các extension cần giữ lại, cách nhau bởi dấu phẩy (VD: png,jpg)"
+    )
+    parser.add_argument(
+        "-r", "--recursive", action="store_true", help="Xử lý cả thư mục con"
+    )
+    parser.add_argument(
+        "-x",
+        "--exclude-dirs",
+        default="",
+        help="Tên các thư mục con bỏ qua, cách nhau bởi dấu phẩy (luôn bỏ qua .git)",
+    )
+    parser.add_argument(
+        "-n", "--dry-run", action="store_true", help="Chỉ in kế hoạch, không xóa"
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Không in từng file, chỉ in tổng kết"
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Số thread để duyệt và xóa (mặc định {DEFAULT_WORKERS})",
+    )
+    args = parser.parse_args()
 
-    keep_files_with_ext(folder, ext)
+    keep_files_with_ext(
+        args.folder,
+        args.ext.split(","),
+        recursive=args.recursive,
+        exclude_dirs=args.exclude_dirs.split(","),
+        dry_run=args.dry_run,
+        workers=args.workers,
+        verbose=not args.quiet,
+    )
 
 
 if __name__ == "__main__":
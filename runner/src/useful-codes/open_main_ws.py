@@ -106,7 +106,7 @@ def open_working_workspace_rclone_tool(ide_prefix, powershell_only=False) -> Non
             time.sleep(1)  # Đợi 1 giây giữa các lần mở
 
 
-if __name__ == "__main__":
+def main():
     parser = argparse.ArgumentParser(
         description="Open PTM project & recover-image server"
     )
@@ -134,3 +134,7 @@ if __name__ == "__main__":
         open_working_workspace_rclone_tool(
             args.ide_prefix, powershell_only=args.powershell_only
         )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,18 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv(dotenv_path="D:/D-Documents/TOOLs/runner/.env")
 
-CONTENTS_FOLDER_PATH = os.getenv("CONTENTS_FOLDER_PATH")
-curl_file = f"{CONTENTS_FOLDER_PATH}/cURL.txt"
-
-if __name__ == "__main__":
+def main():
+    contents_folder_path = os.getenv("CONTENTS_FOLDER_PATH")
+    curl_file = f"{contents_folder_path}/cURL.txt"
     try:
         with open(curl_file, "r", encoding="utf-8") as f:
             print(f.read())
     except Exception as e:
         print(">>> Error reading cURL file:", e)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path="D:/D-Documents/TOOLs/runner/.env")
+    main()
@@ -1,10 +1,16 @@
 import sys
 import os
+import hashlib
 import argparse
-from dotenv import load_dotenv
 
-load_dotenv(dotenv_path="D:/D-Documents/TOOLs/runner/.env")
-RUNNER_ROOT_FOLDER = os.getenv("ROOT_FOLDER_PATH")
+from _cache_utils import cache_path, read_json_cache, write_json_cache
+
+FEATURE_INDEX_VERSION = 1
+# Phân cách type/action trong key của index (JSON chỉ cho key là string)
+INDEX_KEY_SEPARATOR = " "
+
+# Index đã load trong process (runner daemon gọi lại nhiều lần): (mtime_ns, index)
+_loaded_index: tuple[int, dict] | None = None
 
 
 def warn_user_error(warning_message: str):
@@ -12,67 +18,134 @@ def warn_user_error(warning_message: str):
     sys.exit(0)
 
 
-def print_feature_description(cmd_type: str | None, action: str | None):
-    yaml_path = os.path.join(
-        RUNNER_ROOT_FOLDER or "", "src", "contents", "app_features.yml"
+def get_features_yaml_path() -> str:
+    return os.path.join(
+        os.getenv("ROOT_FOLDER_PATH") or "", "src", "contents", "app_features.yml"
     )
-    if not os.path.exists(yaml_path):
-        warn_user_error(f"Cannot find feature definitions: {yaml_path}")
 
-    try:
+
+def index_key(cmd_type: str | None, action: str | None) -> str:
+    return f"{cmd_type or ''}{INDEX_KEY_SEPARATOR}{action or ''}"
+
+
+def parse_command(cmd: str) -> tuple[str | None, str | None]:
+    """'runner run del-files <folder>' -> ('run', 'del-files')."""
+    cmd_parts = cmd.split()
+
+    if cmd_parts and cmd_parts[0] == "runner":
+        cmd_parts = cmd_parts[1:]
+
+    yaml_type = cmd_parts[0] if len(cmd_parts) > 0 else None
+    yaml_action = (
+        cmd_parts[1]
+        if len(cmd_parts) > 1
+        and not cmd_parts[1].startswith("<")
+        and not cmd_parts[1].startswith("[")
+        and not cmd_parts[1].startswith("-")
+        else None
+    )
+    return yaml_type, yaml_action
+
+
+def build_feature_index(data: dict) -> dict:
+    """
+    Biên dịch app_features.yml thành index:
+    - features: "<type> <action>" -> mô tả tính năng (key " ": `runner`, `runner -h`)
+    - actions:  type -> danh sách action (dùng cho tab-completion)
+    - flags:    danh sách flag
+    Trùng key thì giữ tính năng xuất hiện trước (giống thứ tự duyệt YAML trước đây).
+    """
+    runner_tool = data.get("runner_tool", {}) or {}
+    features: dict[str, dict] = {}
+    actions: dict[str, list[str]] = {}
+
+    for t in runner_tool.get("types", []) or []:
+        type_name = t.get("name")
+        type_actions = actions.setdefault(type_name, [])
+        for a in t.get("actions", []) or []:
+            feature = {
+                "title": a.get("title"),
+                "command": a.get("command"),
+                "summary": a.get("summary"),
+                "details": a.get("details"),
+                "conditions": a.get("conditions"),
+            }
+            for cmd in (a.get("command", "") or "").split("|"):
+                yaml_type, yaml_action = parse_command(cmd.strip())
+                if yaml_type is None or yaml_type.startswith("-"):
+                    # `runner`, `runner -h`: chỉ khớp khi không gõ type/action
+                    features.setdefault(index_key(None, None), feature)
+                elif yaml_type == type_name:
+                    features.setdefault(index_key(yaml_type, yaml_action), feature)
+                    if yaml_action and yaml_action not in type_actions:
+                        type_actions.append(yaml_action)
+
+    flags: list[str] = []
+    for f in runner_tool.get("flags", []) or []:
+        flags.extend(part.strip() for part in str(f.get("flag", "")).split("/"))
+
+    return {"features": features, "actions": actions, "flags": flags}
+
+
+def _hash_file(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def load_feature_index(yaml_path: str) -> dict:
+    """
+    Lấy index của app_features.yml:
+    - mtime + size khớp cache -> dùng luôn (không đọc YAML)
+    - mtime đổi nhưng nội dung (sha256) không đổi -> dùng cache, cập nhật mtime
+    - Nội dung đổi -> parse YAML, biên dịch lại và ghi cache
+    """
+    global _loaded_index
+    stat = os.stat(yaml_path)
+    if _loaded_index is not None and _loaded_index[0] == stat.st_mtime_ns:
+        return _loaded_index[1]
+
+    index_cache_path = cache_path("feature_index.json")
+    cache = read_json_cache(index_cache_path, FEATURE_INDEX_VERSION)
+    is_same_source = cache is not None and cache.get("source_path") == yaml_path
+    if (
+        is_same_source
+        and cache.get("mtime_ns") == stat.st_mtime_ns
+        and cache.get("size") == stat.st_size
+    ):
+        _loaded_index = (stat.st_mtime_ns, cache["index"])
+        return cache["index"]
+
+    with open(yaml_path, "rb") as f:
+        content = f.read()
+    content_hash = _hash_file(content)
+    if is_same_source and cache.get("sha256") == content_hash:
+        index = cache["index"]
+    else:
         import yaml
 
-        with open(yaml_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-
-        types = data.get("runner_tool", {}).get("types", [])
-
-        for t in types:
-            if cmd_type and t.get("name") != cmd_type:
-                continue
-
-            for a in t.get("actions", []):
-                cmd_raw = a.get("command", "")
-                cmds = [c.strip() for c in cmd_raw.split("|")]
-
-                for cmd in cmds:
-                    cmd_parts = cmd.split()
-
-                    if cmd_parts and cmd_parts[0] == "runner":
-                        cmd_parts = cmd_parts[1:]
-
-                    yaml_type = cmd_parts[0] if len(cmd_parts) > 0 else None
-                    yaml_action = (
-                        cmd_parts[1]
-                        if len(cmd_parts) > 1
-                        and not cmd_parts[1].startswith("<")
-                        and not cmd_parts[1].startswith("[")
-                        and not cmd_parts[1].startswith("-")
-                        else None
-                    )
-
-                    target_found = False
-                    if cmd_type is None and action is None:
-                        if yaml_type is None or yaml_type.startswith("-"):
-                            target_found = True
-                    elif cmd_type is not None and action is None:
-                        if yaml_type == cmd_type and yaml_action is None:
-                            target_found = True
-                    elif cmd_type is not None and action is not None:
-                        if yaml_type == cmd_type and yaml_action == action:
-                            target_found = True
-
-                    if target_found:
-                        print(f"\n--- Tính năng: {a.get('title')} ---")
-                        print(f"+) Lệnh:\t{a.get('command')}")
-                        print(f"+) Tóm tắt:\t{a.get('summary')}")
-                        print(f"+) Chi tiết:\t{a.get('details')}")
-                        print(f"+) Điều kiện:\t{a.get('conditions')}\n")
-                        sys.exit(0)
-
-        cmd_str = f"runner {cmd_type or ''} {action or ''}".strip()
-        warn_user_error(f"Không tìm thấy mô tả cho lệnh: `{cmd_str}`")
+        index = build_feature_index(yaml.safe_load(content.decode("utf-8")) or {})
+
+    write_json_cache(
+        index_cache_path,
+        FEATURE_INDEX_VERSION,
+        {
+            "source_path": yaml_path,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": content_hash,
+            "index": index,
+        },
+    )
+    _loaded_index = (stat.st_mtime_ns, index)
+    return index
 
+
+def print_feature_description(cmd_type: str | None, action: str | None):
+    yaml_path = get_features_yaml_path()
+    if not os.path.exists(yaml_path):
+        warn_user_error(f"Cannot find feature definitions: {yaml_path}")
+
+    try:
+        index = load_feature_index(yaml_path)
     except ImportError:
         warn_user_error(
             "Chưa cài đặt thư viện 'pyyaml'. Vui lòng chạy `pip install pyyaml` hoặc `pip install -r requirements.txt`"
@@ -80,11 +153,64 @@ def print_feature_description(cmd_type: str | None, action: str | None):
     except Exception as e:
         warn_user_error(f"Lỗi khi đọc file mô tả YAML: {str(e)}")
 
+    # Chỉ gõ action mà không có type -> không có mô tả (giống trước đây)
+    feature = None
+    if cmd_type is not None or action is None:
+        feature = index["features"].get(index_key(cmd_type, action))
+
+    if feature is not None:
+        print(f"\n--- Tính năng: {feature.get('title')} ---")
+        print(f"+) Lệnh:\t{feature.get('command')}")
+        print(f"+) Tóm tắt:\t{feature.get('summary')}")
+        print(f"+) Chi tiết:\t{feature.get('details')}")
+        print(f"+) Điều kiện:\t{feature.get('conditions')}\n")
+        sys.exit(0)
+
+    cmd_str = f"runner {cmd_type or ''} {action or ''}".strip()
+    warn_user_error(f"Không tìm thấy mô tả cho lệnh: `{cmd_str}`")
+
+
+def print_completions(words: list[str]):
+    """
+    In các gợi ý cho từ cuối cùng (mỗi dòng 1 gợi ý), dùng cho tab-completion:
+    `print_feature_description.py --complete run d` -> del-files, dld-path
+    """
+    yaml_path = get_features_yaml_path()
+    try:
+        index = load_feature_index(yaml_path)
+    except Exception:
+        return  # Completion không được in lỗi ra terminal
+
+    prefix = words[-1] if words else ""
+    if prefix.startswith("-"):
+        candidates = index["flags"]
+    elif len(words) <= 1:
+        candidates = list(index["actions"])
+    elif len(words) == 2:
+        candidates = index["actions"].get(words[0], [])
+    else:
+        candidates = []
+    for candidate in candidates:
+        if candidate.startswith(prefix):
+            print(candidate)
+
+
+def main():
+    # Các từ sau --complete có thể bắt đầu bằng "-" nên không đưa qua argparse
+    if len(sys.argv) > 1 and sys.argv[1] == "--complete":
+        print_completions(sys.argv[2:])
+        return
 
-if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Print feature description.")
     parser.add_argument("--type", type=str, default=None, help="Command type")
     parser.add_argument("--action", type=str, default=None, help="Command action")
     args = parser.parse_args()
 
     print_feature_description(args.type, args.action)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path="D:/D-Documents/TOOLs/runner/.env")
+    main()
@@ -24,7 +24,8 @@ def get_ipconfig_output():
         print(">>> Error running ipconfig:", e)
         return ""
 
-if __name__ == "__main__":
+
+def main():
     print(">>> Please wait... Gathering system information.")
     print("============================")
     print("  OPERATING SYSTEM")
@@ -54,4 +55,8 @@ if __name__ == "__main__":
     for line in ipconfig.splitlines():
         if "IPv4" in line or "IPv6" in line:
             print(line)
-    print("============================") 
\ No newline at end of file
+    print("============================") 
+
+
+if __name__ == "__main__":
+    main()
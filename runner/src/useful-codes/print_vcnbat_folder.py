@@ -1,7 +1,8 @@
 import os
 import sys
 
-if __name__ == "__main__":
+
+def main():
     if len(sys.argv) < 2:
         print(">>> Missing folder path.")
         sys.exit(1)
@@ -21,3 +22,7 @@ if __name__ == "__main__":
             if os.path.isfile(full_path):
                 print("    |---\\" + f)
     print("============================")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,14 @@
 import os
 import sys
 import re
+import json
+import argparse
 
-
-def validate_inputs():
-    if len(sys.argv) < 2:
-        print(">>> Lỗi: Cần truyền ít nhất 1 tham số (folder_path).")
-        print('>>> Cách dùng: python rename_files.py "<folder_path>" ["<prefix>"]')
-        return False
-    return True
+# Journal ghi lại kế hoạch + các bước đã làm, nằm ngay trong folder được đổi tên
+JOURNAL_FILE_NAME = ".rename_files.journal"
+JOURNAL_VERSION = 1
+# Tên tạm dùng để phá vòng (a -> b -> a), mỗi vòng tối đa 1 tên tạm
+TMP_NAME_PATTERN = "__tmp_{}__"
 
 
 def detect_prefix(files: list[str]) -> str | None:
@@ -40,30 +40,222 @@ def detect_prefix(files: list[str]) -> str | None:
     return best_prefix
 
 
-def main():
-    if not validate_inputs():
+def natural_sort_key(filename: str) -> tuple:
+    """'img-2.png' < 'img-10.png' (so sánh phần số theo giá trị, không theo chữ)."""
+    parts = re.split(r"(\d+)", filename.lower())
+    # Phần tử chẵn là chữ, phần tử lẻ là số -> các key luôn so sánh được với nhau
+    return tuple(int(p) if i % 2 else p for i, p in enumerate(parts)), filename
+
+
+def name_key(filename: str) -> str:
+    # Windows không phân biệt hoa thường: "A-1.png" và "a-1.png" là cùng 1 file
+    return os.path.normcase(filename)
+
+
+def list_files(folder_path: str) -> list[str]:
+    # Chỉ lấy các file con cấp 1 (không đệ quy vào thư mục con), bỏ qua journal
+    with os.scandir(folder_path) as entries:
+        return [
+            entry.name
+            for entry in entries
+            if entry.is_file() and entry.name != JOURNAL_FILE_NAME
+        ]
+
+
+def build_targets(files: list[str], prefix: str) -> list[tuple[str, str]]:
+    """[(tên cũ, tên mới)] theo thứ tự natural sort."""
+    targets = []
+    for index, filename in enumerate(sorted(files, key=natural_sort_key), start=1):
+        _, ext = os.path.splitext(filename)
+        targets.append((filename, f"{prefix}-{index}{ext}"))
+    return targets
+
+
+def plan_renames(
+    targets: list[tuple[str, str]], reserved_names: list[str] | None = None
+) -> list[tuple[str, str]]:
+    """
+    Biến danh sách (tên cũ, tên mới) thành chuỗi lệnh rename tối thiểu:
+    - File đã đúng tên -> bỏ qua
+    - Chuỗi a -> b -> c (c trống): đổi từ cuối chuỗi lên, không cần tên tạm
+    - Vòng a -> b -> a: đổi 1 file sang tên tạm, đổi phần còn lại, rồi tên tạm -> đích
+    reserved_names: các tên khác đang có trong folder (thư mục con...), tránh khi
+    chọn tên tạm.
+    """
+    moves = {name_key(src): (src, dst) for src, dst in targets if src != dst}
+    occupied = {name_key(src) for src, _ in targets}
+    occupied.update(name_key(name) for name in reserved_names or [])
+
+    def next_of(key: str) -> str | None:
+        # File đang chiếm tên đích của `key` (phải được đổi đi trước)
+        dst_key = name_key(moves[key][1])
+        return dst_key if dst_key != key and dst_key in moves else None
+
+    has_predecessor = {next_key for key in moves if (next_key := next_of(key))}
+    ops: list[tuple[str, str]] = []
+    visited: set[str] = set()
+
+    for key in moves:
+        if key in has_predecessor:
+            continue
+        chain = [key]
+        while (next_key := next_of(chain[-1])) is not None:
+            chain.append(next_key)
+        ops.extend(moves[k] for k in reversed(chain))
+        visited.update(chain)
+
+    tmp_index = 0
+    for key in moves:
+        if key in visited:
+            continue
+        cycle = [key]
+        while (next_key := next_of(cycle[-1])) != key:
+            cycle.append(next_key)
+        visited.update(cycle)
+
+        while name_key(TMP_NAME_PATTERN.format(tmp_index)) in occupied:
+            tmp_index += 1
+        tmp_name = TMP_NAME_PATTERN.format(tmp_index)
+        tmp_index += 1
+
+        src, dst = moves[key]
+        ops.append((src, tmp_name))
+        ops.extend(moves[k] for k in reversed(cycle[1:]))
+        ops.append((tmp_name, dst))
+
+    return ops
+
+
+def journal_path(folder_path: str) -> str:
+    return os.path.join(folder_path, JOURNAL_FILE_NAME)
+
+
+def read_journal(folder_path: str) -> dict | None:
+    """
+    Journal là file JSON lines: dòng đầu là kế hoạch {"ops": [[src, dst], ...]},
+    mỗi dòng sau là {"done": i} sau khi rename thứ i xong, cuối cùng {"complete": true}.
+    """
+    try:
+        with open(journal_path(folder_path), "r", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f">>> Lỗi: Không đọc được journal: {e}")
         sys.exit(1)
 
-    folder_path = sys.argv[1].strip()
-    prefix = sys.argv[2].strip() if len(sys.argv) >= 3 else ""
+    if not lines or lines[0].get("version") != JOURNAL_VERSION:
+        print(f">>> Lỗi: Journal không hợp lệ: {journal_path(folder_path)}")
+        sys.exit(1)
 
-    if not os.path.isdir(folder_path):
-        print(f">>> Lỗi: Thư mục không tồn tại: {folder_path}")
+    ops = [tuple(op) for op in lines[0]["ops"]]
+    done = 0
+    complete = False
+    for line in lines[1:]:
+        if "done" in line:
+            done = max(done, line["done"] + 1)
+        complete = complete or bool(line.get("complete"))
+
+    # Có thể đã rename xong nhưng chưa kịp ghi "done" thì bị dừng
+    if not complete and done < len(ops):
+        src, dst = ops[done]
+        src_path = os.path.join(folder_path, src)
+        dst_path = os.path.join(folder_path, dst)
+        if not os.path.lexists(src_path) and os.path.lexists(dst_path):
+            done += 1
+
+    return {"ops": ops, "done": done, "complete": complete or done == len(ops)}
+
+
+def write_journal(folder_path: str, ops: list[tuple[str, str]]):
+    path = journal_path(folder_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"version": JOURNAL_VERSION, "ops": ops}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def run_ops(folder_path: str, ops: list[tuple[str, str]], start: int = 0):
+    """Thực hiện ops[start:], ghi "done" vào journal sau mỗi lần rename."""
+    with open(journal_path(folder_path), "a", encoding="utf-8") as journal:
+        for index in range(start, len(ops)):
+            src, dst = ops[index]
+            src_path = os.path.join(folder_path, src)
+            dst_path = os.path.join(folder_path, dst)
+            # os.rename trên Linux/macOS sẽ ghi đè file đích -> kiểm tra trước
+            if name_key(src) != name_key(dst) and os.path.lexists(dst_path):
+                raise FileExistsError(f"File đích đã tồn tại: {dst_path}")
+            os.rename(src_path, dst_path)
+            journal.write(json.dumps({"done": index}) + "\n")
+            journal.flush()
+        journal.write(json.dumps({"complete": True}) + "\n")
+
+
+def print_recovery_hint(folder_path: str):
+    script_path = os.path.abspath(__file__)
+    print(f'>>>   Làm tiếp:  py "{script_path}" "{folder_path}" --resume')
+    print(f'>>>   Hoàn tác:  py "{script_path}" "{folder_path}" --undo')
+
+
+def run_journaled(folder_path: str, ops: list[tuple[str, str]], start: int = 0):
+    try:
+        run_ops(folder_path, ops, start)
+    except OSError as e:
+        print(f">>> Lỗi khi đổi tên: {e}")
+        print(">>> Đã dừng giữa chừng, các bước đã làm được ghi trong journal:")
+        print_recovery_hint(folder_path)
         sys.exit(1)
 
-    # Chỉ lấy các file con cấp 1 (không đệ quy vào thư mục con)
-    files = [
-        f
-        for f in os.listdir(folder_path)
-        if os.path.isfile(os.path.join(folder_path, f))
-    ]
 
+def resume(folder_path: str):
+    journal = read_journal(folder_path)
+    if journal is None:
+        print(f">>> Không có journal trong: {folder_path}")
+        sys.exit(0)
+    if journal["complete"]:
+        print(">>> Lần đổi tên trước đã hoàn thành, không cần làm tiếp.")
+        return
+
+    ops, done = journal["ops"], journal["done"]
+    print(f">>> Làm tiếp {len(ops) - done}/{len(ops)} lượt rename...")
+    run_journaled(folder_path, ops, done)
+    print(">>> Hoàn thành!")
+
+
+def undo(folder_path: str):
+    journal = read_journal(folder_path)
+    if journal is None:
+        print(f">>> Không có journal trong: {folder_path}")
+        sys.exit(0)
+
+    # Hoàn tác = 1 kế hoạch mới (đảo ngược các bước đã làm), cũng được ghi journal
+    done_ops = journal["ops"][: journal["done"]]
+    undo_ops = [(dst, src) for src, dst in reversed(done_ops)]
+    if not undo_ops:
+        os.remove(journal_path(folder_path))
+        print(">>> Chưa có file nào bị đổi tên, đã xóa journal.")
+        return
+
+    write_journal(folder_path, undo_ops)
+    print(f">>> Hoàn tác {len(undo_ops)} lượt rename...")
+    run_journaled(folder_path, undo_ops)
+    print(">>> Đã khôi phục tên cũ.")
+
+
+def rename_files(folder_path: str, prefix: str, dry_run: bool = False):
+    journal = read_journal(folder_path)
+    if journal is not None and not journal["complete"]:
+        print(">>> Lỗi: Lần đổi tên trước bị dừng giữa chừng. Hãy chạy 1 trong 2:")
+        print_recovery_hint(folder_path)
+        sys.exit(1)
+
+    files = list_files(folder_path)
     if not files:
         print(f">>> Không tìm thấy file nào trong: {folder_path}")
         sys.exit(0)
 
-    files.sort()  # Sắp xếp để đảm bảo thứ tự đặt tên nhất quán
-
     # --- Pre-processing: xác định prefix ---
     if prefix:
         # Prefix được cung cấp trực tiếp -> dùng luôn
@@ -73,32 +265,82 @@ def main():
         prefix = detect_prefix(files)
         if not prefix:
             prefix = os.path.basename(os.path.abspath(folder_path))
-            print(f'>>> Không tìm thấy prefix, sử dụng tên folder làm prefix: "{prefix}"')
+            print(
+                f'>>> Không tìm thấy prefix, sử dụng tên folder làm prefix: "{prefix}"'
+            )
         else:
             print(f'>>> Tự động phát hiện prefix: "{prefix}"')
 
-    print(f">>> Tìm thấy {len(files)} file. Bắt đầu đổi tên...")
-
-    # Bước 1: Đổi tất cả sang tên tạm thời để tránh conflict với file đang tồn tại
-    tmp_paths = []
-    for index, filename in enumerate(files):
-        old_path = os.path.join(folder_path, filename)
-        tmp_name = f"__tmp_{index}__"
-        tmp_path = os.path.join(folder_path, tmp_name)
-        os.rename(old_path, tmp_path)
-        tmp_paths.append((tmp_path, filename))
-
-    # Bước 2: Đổi từ tên tạm sang tên đích cuối cùng
-    renamed = 0
-    for index, (tmp_path, original_name) in enumerate(tmp_paths, start=1):
-        _, ext = os.path.splitext(original_name)
-        new_name = f"{prefix}-{index}{ext}"
-        new_path = os.path.join(folder_path, new_name)
-        os.rename(tmp_path, new_path)
-        print(f"  {original_name} -> {new_name}")
-        renamed += 1
-
-    print(f">>> Hoàn thành! Đã đổi tên {renamed} file.")
+    targets = build_targets(files, prefix)
+    changed = [(src, dst) for src, dst in targets if src != dst]
+    # Tên đích bị thư mục con (hoặc journal) chiếm -> báo lỗi trước khi đổi tên
+    file_keys = {name_key(filename) for filename in files}
+    other_names = [
+        name for name in os.listdir(folder_path) if name_key(name) not in file_keys
+    ]
+    other_keys = {name_key(name) for name in other_names}
+    blocked = [dst for _, dst in changed if name_key(dst) in other_keys]
+    if blocked:
+        print(f">>> Lỗi: Tên đích đã bị thư mục/file khác chiếm: {', '.join(blocked)}")
+        sys.exit(1)
+
+    ops = plan_renames(targets, other_names)
+    print(
+        f">>> Tìm thấy {len(files)} file: {len(changed)} file cần đổi tên"
+        f" ({len(ops)} lượt rename), {len(files) - len(changed)} file đã đúng tên."
+    )
+    if not ops:
+        return
+
+    if not dry_run:
+        write_journal(folder_path, ops)
+        run_journaled(folder_path, ops)
+
+    for src, dst in changed:
+        print(f"  {src} -> {dst}")
+    if dry_run:
+        print(">>> Dry run: chưa đổi tên file nào.")
+    else:
+        print(f">>> Hoàn thành! Đã đổi tên {len(changed)} file.")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Đổi tên file trong folder thành <prefix>-1.ext, <prefix>-2.ext, ...",
+        epilog='Ví dụ: py rename_files.py "D:/Photos" "tiktok" -n',
+    )
+    parser.add_argument("folder_path", help="Folder chứa file cần đổi tên")
+    parser.add_argument(
+        "prefix",
+        nargs="?",
+        default="",
+        help="Prefix cho tên mới (mặc định: tự phát hiện hoặc dùng tên folder)",
+    )
+    parser.add_argument(
+        "-n", "--dry-run", action="store_true", help="Chỉ in kế hoạch, không đổi tên"
+    )
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--resume", action="store_true", help="Làm tiếp lần đổi tên bị dừng giữa chừng"
+    )
+    group.add_argument(
+        "--undo",
+        action="store_true",
+        help="Hoàn tác lần đổi tên gần nhất (theo journal)",
+    )
+    args = parser.parse_args()
+
+    folder_path = args.folder_path.strip()
+    if not os.path.isdir(folder_path):
+        print(f">>> Lỗi: Thư mục không tồn tại: {folder_path}")
+        sys.exit(1)
+
+    if args.resume:
+        resume(folder_path)
+    elif args.undo:
+        undo(folder_path)
+    else:
+        rename_files(folder_path, args.prefix.strip(), args.dry_run)
 
 
 if __name__ == "__main__":
@@ -2,8 +2,14 @@ import sys
 import subprocess
 import os
 import json
+import time
+import hashlib
 from dotenv import load_dotenv
 
+# Module dùng chung của useful-codes (thư mục cha của thư mục này)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from _cache_utils import cache_path  # noqa: E402
+
 load_dotenv(dotenv_path="D:/D-Documents/TOOLs/runner/.env")
 
 RUNNER_USEFUL_CODES_FOLDER_PATH = os.getenv("USEFUL_CODES_FOLDER_PATH")
@@ -209,8 +215,81 @@ def sync_to_gdrive(source_path, dest_path, remote_name):
         print(f"Lỗi khi thực thi rclone: {e}")
 
 
-def list_directories(target_path, remote_name, is_deep=False, is_file=False):
-    """Lấy danh sách các thư mục hoặc tệp từ Google Drive."""
+def get_list_cache_path(command: list[str]) -> str:
+    """File cache của 1 lệnh rclone (khác remote/path/cờ -> khác file)."""
+    # --fast-list chỉ đổi cách rclone gọi API, không đổi kết quả -> không tính vào key
+    key_parts = [part for part in command if part != "--fast-list"]
+    key = hashlib.sha1("\0".join(key_parts).encode("utf-8")).hexdigest()
+    return cache_path("gdrive_list_cache", f"{key}.txt")
+
+
+def read_list_cache(
+    cache_path: str, ttl_seconds: int
+) -> tuple[list[str], float] | None:
+    """(các dòng output đã cache, tuổi cache tính bằng giây) nếu cache còn hạn."""
+    try:
+        age = time.time() - os.path.getmtime(cache_path)
+        if age > ttl_seconds:
+            return None
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return f.readlines(), age
+    except OSError:
+        return None
+
+
+def stream_rclone_lines(command: list[str], cache_path: str | None):
+    """
+    Chạy rclone và trả về từng dòng stdout ngay khi nhận được (không đợi lệnh chạy
+    xong). Nếu có cache_path thì ghi đồng thời ra file cache, chỉ giữ lại khi rclone
+    chạy thành công. Raise CalledProcessError nếu rclone lỗi.
+    """
+    cache_file = None
+    tmp_cache_path = None
+    if cache_path:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_cache_path = f"{cache_path}.{os.getpid()}.tmp"
+            cache_file = open(tmp_cache_path, "w", encoding="utf-8")
+        except OSError as e:
+            print(f">>> Error creating gdrive list cache: {e}", file=sys.stderr)
+
+    try:
+        with subprocess.Popen(
+            command, stdout=subprocess.PIPE, text=True, encoding="utf-8"
+        ) as proc:
+            for line in proc.stdout:
+                if cache_file is not None:
+                    cache_file.write(line)
+                yield line
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, command)
+        if cache_file is not None:
+            cache_file.close()
+            os.replace(tmp_cache_path, cache_path)
+            cache_file = None
+    finally:
+        if cache_file is not None:
+            cache_file.close()
+            if os.path.exists(tmp_cache_path):
+                os.remove(tmp_cache_path)
+
+
+def list_directories(
+    target_path,
+    remote_name,
+    is_deep=False,
+    is_file=False,
+    is_json=False,
+    use_fast_list=False,
+    cache_ttl=0,
+):
+    """
+    Lấy danh sách các thư mục hoặc tệp từ Google Drive, in ra từng dòng ngay khi
+    rclone trả về.
+    - is_json: dùng `rclone lsjson` (stdout chỉ chứa JSON, thông báo in ra stderr)
+    - use_fast_list: thêm --fast-list khi liệt kê đệ quy (ít request API hơn)
+    - cache_ttl > 0: dùng lại kết quả của lần gọi trước nếu chưa quá cache_ttl giây
+    """
     # Loại bỏ dấu ngoặc kép bọc quanh nếu chạy qua shell làm tham số chuỗi trống bị bọc
     if target_path in ['""', "''"]:
         target_path = ""
@@ -224,42 +303,69 @@ def list_directories(target_path, remote_name, is_deep=False, is_file=False):
 
     item_type = "tệp tin" if is_file else "thư mục"
     mode_flag = "--files-only" if is_file else "--dirs-only"
+    # JSON mode: stdout chỉ chứa JSON để có thể pipe sang công cụ khác
+    info_stream = sys.stderr if is_json else sys.stdout
 
+    command = ["rclone", "lsjson" if is_json else "lsf", remote_dest, mode_flag]
     if is_deep:
-        print(f'Đang lấy danh sách {item_type} đệ quy (deep) từ "{remote_dest}"')
-        command = ["rclone", "lsf", remote_dest, mode_flag, "-R"]
+        print(
+            f'Đang lấy danh sách {item_type} đệ quy (deep) từ "{remote_dest}"',
+            file=info_stream,
+        )
+        command.append("-R")
+        if use_fast_list:
+            command.append("--fast-list")
     else:
-        print(f'Đang lấy danh sách {item_type} trực tiếp từ "{remote_dest}"')
-        command = ["rclone", "lsf", remote_dest, mode_flag]
+        print(
+            f'Đang lấy danh sách {item_type} trực tiếp từ "{remote_dest}"',
+            file=info_stream,
+        )
+        if use_fast_list:
+            print(">>> Warn: --fast-list chỉ dùng cùng -d (deep).", file=info_stream)
+
+    cache_path = get_list_cache_path(command) if cache_ttl > 0 else None
+    cached = read_list_cache(cache_path, cache_ttl) if cache_path else None
 
+    print("-" * 50, file=info_stream)
     try:
-        result = subprocess.run(
-            command, stdout=subprocess.PIPE, text=True, encoding="utf-8", check=True
-        )
-        print("-" * 50)
-        output = result.stdout.strip()
-        if output:
+        if cached is not None:
+            lines, age = cached
+            print(
+                f"(Dùng kết quả đã cache {age:.0f}s trước, thêm --cache-ttl 0 để lấy mới)",
+                file=info_stream,
+            )
+        else:
+            lines = stream_rclone_lines(command, cache_path)
+
+        count = 0
+        for line in lines:
+            if is_json:
+                sys.stdout.write(line)
+                count += 1
+                continue
             if is_deep:
-                for line in output.split("\n"):
-                    if not is_file:
-                        line = line.strip().rstrip("/")
-                    else:
-                        line = line.strip()
-
-                    if not line:
-                        continue
-
-                    if clean_target_path:
-                        print(f"{clean_target_path}/{line}")
-                    else:
-                        print(line)
+                if not is_file:
+                    line = line.strip().rstrip("/")
+                else:
+                    line = line.strip()
+
+                if not line:
+                    continue
+
+                if clean_target_path:
+                    line = f"{clean_target_path}/{line}"
             else:
-                print(output)
-        else:
-            print(f"(Không có {item_type} nào)")
-        print("-" * 50)
+                line = line.rstrip("\n")
+            print(line)
+            count += 1
+
+        if count == 0:
+            print(f"(Không có {item_type} nào)", file=info_stream)
+        print("-" * 50, file=info_stream)
     except subprocess.CalledProcessError as e:
-        print(f"Lỗi khi thực thi rclone lấy danh sách: {e}")
+        print(f"Lỗi khi thực thi rclone lấy danh sách: {e}", file=info_stream)
+    except OSError as e:
+        print(f"Lỗi khi chạy rclone: {e}", file=info_stream)
 
 
 def display_auth_guide():
@@ -519,6 +625,26 @@ def switch_actions():
         if "--file" in args_list:
             is_file = True
             args_list.remove("--file")
+        is_json = "--json" in args_list
+        if is_json:
+            args_list.remove("--json")
+        use_fast_list = "--fast-list" in args_list
+        if use_fast_list:
+            args_list.remove("--fast-list")
+        # Mặc định lấy từ .env (GDRIVE_LIST_CACHE_TTL), 0 = không dùng cache
+        cache_ttl = os.getenv("GDRIVE_LIST_CACHE_TTL") or "0"
+        if "--cache-ttl" in args_list:
+            flag_index = args_list.index("--cache-ttl")
+            if flag_index + 1 >= len(args_list):
+                print("Cú pháp: runner gdrive list [<path>] --cache-ttl <số giây>")
+                sys.exit(1)
+            cache_ttl = args_list[flag_index + 1]
+            del args_list[flag_index : flag_index + 2]
+        try:
+            cache_ttl = int(cache_ttl)
+        except ValueError:
+            print(f"Lỗi: --cache-ttl phải là số giây, nhận được '{cache_ttl}'.")
+            sys.exit(1)
 
         target_path = args_list[0] if len(args_list) > 0 else ""
 
@@ -526,7 +652,15 @@ def switch_actions():
         if not rclone_remote or not check_remote_exists(rclone_remote):
             rclone_remote = run_setup_flow()
 
-        list_directories(target_path, rclone_remote, is_deep, is_file)
+        list_directories(
+            target_path,
+            rclone_remote,
+            is_deep,
+            is_file,
+            is_json,
+            use_fast_list,
+            cache_ttl,
+        )
     elif action == GDRIVE_ACTION_SYNC:
         if len(sys.argv) < 4:
             print(
@@ -552,7 +686,8 @@ def switch_actions():
 
 
 if __name__ == "__main__":
-    print("Kiểm tra các tham số đầu vào...")
+    # In ra stderr: `runner gdrive list --json` cần stdout chỉ chứa JSON
+    print("Kiểm tra các tham số đầu vào...", file=sys.stderr)
 
     if len(sys.argv) < 2:
         print("Cú pháp: py sync_to_gdrive.py <action> ...")